@@ -0,0 +1,261 @@
+## api.py - LOCAL HTTP JSON API FOR THE helper.py ANALYTICS
+#
+# Usage:
+#   python api.py                                   # http://127.0.0.1:8502
+#   python api.py --port 9000 --workers 8 --backend duckdb
+#
+# Endpoints (GET, JSON):
+#   /api/health                                     dataset version and row count
+#   /api/filters                                    years, regions and sports
+#   /api/tally?year=2016&country=USA                fetch_medal_tally (both default to Overall)
+#   /api/tally/yearwise?country=USA                 yearwise_medal_tally
+#   /api/over-time?metrics=region,Event&by_season=1 edition_metrics
+#   /api/heatmap/events                             events_per_sport_over_time
+#   /api/heatmap/country?country=USA                country_sport_heatmap
+#   /api/leaders/sport?sport=Swimming&k=10          most_successful
+#   /api/leaders/country?country=India&k=10         most_successful2
+#   /api/athletes?q=phelps&limit=10                 search_athletes
+#
+# The dataset is loaded once and requests run on a fixed worker pool.  Every
+# 200 carries a strong ETag of (dataset version, path, parameters), so a client
+# that sends it back in If-None-Match gets a 304 without the helper running.
+
+import argparse
+import concurrent.futures
+import contextlib
+import hashlib
+import http.server
+import io
+import json
+import time
+import urllib.parse
+
+import pandas as pd
+
+import helper
+import preprocessor
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+DEFAULT_WORKERS = 8
+MAX_K = 100
+
+
+def _int(params, name, default, low=1, high=None):
+    """Integer query parameter, clamped to [low, high]"""
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    return max(low, min(value, high)) if high else max(low, value)
+
+
+def _flag(params, name):
+    """Boolean query parameter (1/true/yes/on)"""
+    return str(params.get(name, '')).lower() in ('1', 'true', 'yes', 'on')
+
+
+def _year(params):
+    """Year filter: 'Overall' or an integer year"""
+    year = params.get('year', 'Overall') or 'Overall'
+    if year == 'Overall':
+        return year
+    try:
+        return int(year)
+    except ValueError:
+        raise ValueError("year must be an integer or Overall")
+
+
+def _jsonable(value):
+    """Helper result -> JSON-ready value: tables as records, pivots as split index/columns/data"""
+    if isinstance(value, pd.DataFrame):
+        if isinstance(value.index, pd.RangeIndex):
+            return json.loads(value.to_json(orient='records'))
+        x = json.loads(value.to_json(orient='split'))
+        return {'index_name': value.index.name, 'columns_name': value.columns.name, **x}
+    if isinstance(value, tuple):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+class AnalyticsAPI:
+    """Routes API paths to helper calls on one loaded dataset"""
+
+    def __init__(self, df, backend=None):
+        self.df = df
+        self.source = helper.analytics_source(df, backend)
+        self.version = helper.dataset_version(df)
+        self.routes = {
+            '/api/health': self.health,
+            '/api/filters': self.filters,
+            '/api/tally': lambda p: helper.fetch_medal_tally(self.source, _year(p), p.get('country') or 'Overall'),
+            '/api/tally/yearwise': lambda p: helper.yearwise_medal_tally(self.source, self._required(p, 'country')),
+            '/api/over-time': self.over_time,
+            '/api/heatmap/events': lambda p: helper.events_per_sport_over_time(self.source),
+            '/api/heatmap/country': lambda p: helper.country_sport_heatmap(self.source, self._required(p, 'country')),
+            '/api/leaders/sport': lambda p: helper.most_successful(
+                self.source, p.get('sport') or 'Overall', _int(p, 'k', helper.LEADERBOARD_K, high=MAX_K)),
+            '/api/leaders/country': lambda p: helper.most_successful2(
+                self.source, p.get('country') or 'Overall', _int(p, 'k', helper.LEADERBOARD_K, high=MAX_K)),
+            '/api/athletes': lambda p: helper.search_athletes(
+                self.df, p.get('q', ''), _int(p, 'limit', 10, high=MAX_K)),
+        }
+
+    @staticmethod
+    def _required(params, name):
+        if not params.get(name):
+            raise ValueError(f"{name} is required")
+        return params[name]
+
+    def warm(self):
+        """Build the shared derived tables before the first request instead of inside one"""
+        helper.medal_events(self.df)
+        helper.medal_cube(self.df)
+        helper.leaderboards(self.df)
+        helper.athlete_index(self.df)
+
+    def health(self, params):
+        return {'status': 'ok', 'dataset_version': self.version, 'rows': len(self.df)}
+
+    def filters(self, params):
+        years, regions = helper.country_year_list(self.source)
+        sports = sorted(self.df['Sport'].dropna().astype(str).unique()) if 'Sport' in self.df.columns else []
+        return {'years': years, 'regions': regions, 'sports': sports}
+
+    def over_time(self, params):
+        metrics = [m for m in params.get('metrics', '').split(',') if m] or None
+        return helper.edition_metrics(self.source, metrics, by_season=_flag(params, 'by_season'))
+
+    def etag(self, path, params):
+        """Strong validator: the answer only depends on the dataset version, path and parameters"""
+        token = json.dumps([self.version, path, sorted(params.items())])
+        return '"' + hashlib.sha1(token.encode()).hexdigest() + '"'
+
+    def handle(self, path, params):
+        """Return (status, payload) for a GET of path with the given query parameters"""
+        route = self.routes.get(path.rstrip('/') or '/')
+        if route is None:
+            return 404, {'error': f"unknown endpoint {path}", 'endpoints': sorted(self.routes)}
+        try:
+            return 200, _jsonable(route(params))
+        except (ValueError, KeyError) as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            print(f"❌ {path} failed: {e}")
+            return 500, {'error': 'internal error'}
+
+
+class APIRequestHandler(http.server.BaseHTTPRequestHandler):
+    """GET-only JSON handler with ETag / If-None-Match revalidation"""
+
+    server_version = 'OlympicAPI/1.0'
+
+    def do_GET(self):
+        api = self.server.api
+        url = urllib.parse.urlsplit(self.path)
+        params = {name: values[-1] for name, values in urllib.parse.parse_qs(url.query).items()}
+        path = url.path.rstrip('/') or '/'
+        etag = api.etag(path, params)
+
+        # Answered from the validator alone: no helper call, no body
+        if path in api.routes and self._matches(etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            return
+
+        status, payload = api.handle(path, params)
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 200:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _matches(self, etag):
+        """If-None-Match check: a comma-separated list or *, compared weakly (W/ prefixes ignored)"""
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        tags = [tag.strip() for tag in header.split(',')]
+        return '*' in tags or etag in {tag.removeprefix('W/') for tag in tags}
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """HTTPServer that handles connections on a fixed-size worker pool"""
+
+    # Default listen backlog (5) drops bursts of connections into 1 s SYN retries
+    request_queue_size = 128
+
+    def __init__(self, address, api, workers=DEFAULT_WORKERS, verbose=False):
+        super().__init__(address, APIRequestHandler)
+        self.api = api
+        self.verbose = verbose
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS, backend=None, df=None,
+                  verbose=False):
+    """Load the dataset (once), warm its derived tables and return a server ready to serve_forever()"""
+    start = time.perf_counter()
+    if df is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = preprocessor.preprocess()
+    api = AnalyticsAPI(df, backend)
+    api.warm()
+    server = PooledHTTPServer((host, port), api, workers, verbose)
+    print(f"✅ Loaded {len(df):,} rows (version {api.version}) in {time.perf_counter() - start:.2f}s")
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Olympic analytics as a local JSON API")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"bind address (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"request worker threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--backend', choices=['pandas', 'sqlite', 'duckdb', 'polars'],
+                        help="analytics backend (default: OLYMPIC_BACKEND or pandas)")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, args.workers, args.backend, verbose=args.verbose)
+    host, port = server.server_address[:2]
+    print(f"🌐 Serving on http://{host}:{port}/api/health with {args.workers} workers (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
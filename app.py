@@ -2,16 +2,22 @@ import streamlit as st
 import pandas as pd
 import preprocessor
 import helper
-import plotly.express as px
+import instrument
 import io
 import sys
+import threading
+
+# plotly.express is only needed by the Overall Analysis charts; import it there on first use
+px = instrument.lazy_module('plotly.express')
 
 # ----------------- PAGE CONFIG ----------------- #
 st.set_page_config(page_title="Olympics Data Analysis", layout="wide")
 
 
 # ----------------- LOAD DATA WITH ERROR HANDLING ----------------- #
-@st.cache_data
+# One frame shared by every session and rerun (cache_data would unpickle a private copy each
+# time); preprocess() returns it on read-only buffers, so nothing can alter it in place
+@st.cache_resource
 def load_data():
     # Capture print statements
     old_stdout = sys.stdout
@@ -37,6 +43,12 @@ def load_data():
             for col in missing_cols:
                 df[col] = None
 
+        # Build the shared medal-event fact table and medal cube once at load
+        helper.medal_events(df)
+        helper.medal_cube(df)
+        # A reload with a new dataset version supersedes the previous dataset's warm-up
+        helper.stop_warm_ups(keep=helper.dataset_version(df))
+
         return df, preprocessor_logs
     except Exception as e:
         st.error(f"❌ Error loading data: {str(e)}")
@@ -45,7 +57,10 @@ def load_data():
         sys.stdout = old_stdout
 
 
-df, preprocessor_logs = load_data()
+# Only records from this script run (and session thread) go in the timing table
+trace_mark, trace_thread = instrument.mark(), threading.get_ident()
+with instrument.section('Load Data'):
+    df, preprocessor_logs = load_data()
 
 # ----------------- DEBUG INFORMATION (NOW WITH PREPROCESSOR LOGS) ----------------- #
 with st.expander("🔧 Debug Information - Click to Expand"):
@@ -58,10 +73,48 @@ with st.expander("🔧 Debug Information - Click to Expand"):
 
     if not df.empty:
         st.write("**First 5 rows:**")
-        st.dataframe(df.head())
+        st.dataframe(df.head().drop(columns=list(preprocessor.SURROGATE_KEYS), errors='ignore'))
         st.write("**Year range:**", df['Year'].min(), "to", df['Year'].max())
         st.write("**Unique regions:**", df['region'].nunique() if 'region' in df.columns else "No region column")
         st.write("**Unique sports:**", df['Sport'].nunique() if 'Sport' in df.columns else "No sport column")
+
+        st.write("### 🗜️ Memory Usage (bytes per column):")
+        st.dataframe(preprocessor.memory_report(df), use_container_width=True)
+        usage = instrument.process_memory()
+        if usage:
+            st.write(f"**Process memory:** {usage['rss'] / 1e6:.1f} MB resident, "
+                     f"{usage['private'] / 1e6:.1f} MB private, {usage['shared'] / 1e6:.1f} MB shared "
+                     f"(cached frame {'memory-mapped' if preprocessor.SHARED_MMAP else 'private'}, OLYMPIC_MMAP)")
+
+        st.write("### ♻️ Helper Result Cache:")
+        memo = helper.memo_stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Entries", f"{memo['entries']} / {memo['max_entries']}")
+        col2.metric("Hits", memo['hits'])
+        col3.metric("Misses", memo['misses'])
+        col4.metric("Evictions", memo['evictions'])
+        st.write(f"**Cached bytes:** {memo['bytes']:,} / {memo['max_bytes']:,} "
+                 f"(hit rate {memo['hit_rate']:.0%})")
+
+        st.write("### ⏱️ Hot-Path Timings:")
+        trace_enabled = st.checkbox("Record helper and section timings", value=instrument.is_enabled(),
+                                    key="trace_enabled")
+        if trace_enabled != instrument.is_enabled():
+            instrument.configure(enabled=trace_enabled)
+            st.rerun()
+        # Filled in at the end of the script run, once every section has been timed
+        timing_slot = st.container()
+
+        st.write("### 🔥 Background Warm-Up:")
+        # Filled in at the end of the script run, once the analytics source is known
+        warmup_slot = st.container()
+
+        st.write("### 🚀 Startup Imports:")
+        deferred = instrument.deferred_status(['plotly.express', 'scipy', 'zstandard'])
+        st.write("**Loaded so far:** " + ", ".join(f"{name} {'✅' if loaded else '⏳ deferred'}"
+                                                   for name, loaded in deferred.items()))
+        if st.button("Measure import times (fresh interpreter)", key="import_report"):
+            st.dataframe(instrument.import_report('import streamlit, helper'), use_container_width=True)
         st.success("✅ DataFrame loaded successfully!")
     else:
         st.error("❌ DataFrame is EMPTY!")
@@ -71,6 +124,19 @@ if df.empty:
     st.warning("No data available. Please check the debug information above.")
     st.stop()  # Stop execution if no data
 
+# Tallies, time series, heatmaps and leaderboards run on the configured backend
+# (OLYMPIC_BACKEND=pandas|sqlite|duckdb|polars); everything else uses the frame directly
+try:
+    source = helper.analytics_source(df)
+except Exception as e:
+    st.warning(f"⚠️ Analytics backend unavailable, using pandas: {str(e)}")
+    source = df
+
+# Optional (OLYMPIC_WARMUP=1): precompute per-country and per-sport results on background
+# threads; returns at once, so the first page render is not held up
+if helper.WARMUP_ON_START:
+    helper.start_warm_up(df, source)
+
 # ----------------- MAIN TITLE ----------------- #
 st.markdown("<h1 style='text-align: center;'>Olympics Data Analysis</h1>", unsafe_allow_html=True)
 
@@ -97,356 +163,368 @@ def safe_dataframe_display(data, use_container_width=True):
         st.error(f"Error displaying data: {str(e)}")
 
 
-# ----------------- MEDAL TALLY ----------------- #
-if user_menu == 'Medal Tally':
-    st.sidebar.title('Olympics Analysis')
-    st.markdown("<h2 style='text-align: center;'>🏅 Medal Tally Analysis</h2>", unsafe_allow_html=True)
-
-    with st.expander("🔎 Show Raw Data"):
-        safe_dataframe_display(df)
+# ----------------- OVERALL ANALYSIS SECTIONS (FRAGMENTS) ----------------- #
+OVER_TIME_CHARTS = [
+    ("region", "Participating Nations Over the Years", '#89CFF0', "nations over time"),
+    ("Event", "Events Over the Years", '#A3C1AD', "events over time"),
+    ("Name", "Athletes Over the Years", '#FFD580', "athletes over time"),
+]
+
+
+@st.fragment
+def overall_trends_section(source):
+    """Nations, events and athletes per edition, from one shared edition_metrics pass"""
+    with instrument.section('Overall Analysis / Trends'):
+        by_season = st.toggle("Split Summer / Winter", key="trends_by_season")
+        try:
+            metrics = helper.edition_metrics(source, [col for col, _, _, _ in OVER_TIME_CHARTS], by_season=by_season)
+        except Exception as e:
+            st.error(f"Error computing trends: {str(e)}")
+            return
+        for col, title, color, label in OVER_TIME_CHARTS:
+            try:
+                if col in metrics.columns and not metrics.empty:
+                    fig = px.line(metrics, x='Edition', y=col, color='Season' if by_season else None,
+                                  markers=True, line_shape='spline', color_discrete_sequence=[color, '#C3B1E1'])
+                    fig.update_layout(template="plotly_dark", margin=dict(l=20, r=20, t=40, b=20), height=450)
+                    fig.update_traces(line=dict(width=3))
+                    st.title(title)
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.info(f"No data available for {label}")
+            except Exception as e:
+                st.error(f"Error displaying {label}: {str(e)}")
+
+
+@st.fragment
+def events_heatmap_section(source):
+    """Heatmap of events per sport per year"""
+    with instrument.section('Overall Analysis / Events per Sport'):
+        try:
+            heatmap_data = helper.events_per_sport_over_time(source)
+            if not heatmap_data.empty:
+                fig = px.imshow(
+                    heatmap_data,
+                    labels=dict(x="Year", y="Sport", color="Number of Events"),
+                    text_auto=True,
+                    aspect="auto",
+                    color_continuous_scale="Viridis"
+                )
+                fig.update_layout(title="Number of Events per Sport Over the Years", xaxis_title="Year",
+                                  yaxis_title="Sport", height=800)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No data available for events per sport heatmap")
+        except Exception as e:
+            st.error(f"Error displaying heatmap: {str(e)}")
+
+
+@st.fragment
+def top_athletes_section(df, source):
+    """Most successful athletes leaderboard; the sport selectbox reruns only this fragment"""
+    with instrument.section('Overall Analysis / Most Successful Athletes'):
+        try:
+            st.markdown("<h3 style='text-align: center;'>🏅 Most Successful Athletes</h3>", unsafe_allow_html=True)
+            sport_list = df['Sport'].dropna().unique().tolist() if 'Sport' in df.columns else []
+            sport_list.sort()
+            sport_list.insert(0, 'Overall')
+            selected_sport = st.selectbox("Select Sport", sport_list, key="overall_athletes")
+
+            top_athletes = helper.most_successful(source, selected_sport)
+            if not top_athletes.empty:
+                st.dataframe(top_athletes[['Name', 'Total Wins', 'Gold', 'Sport', 'region']].reset_index(drop=True))
+
+                fig = helper.top_athletes_figure(top_athletes)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No athlete data available")
+        except Exception as e:
+            st.error(f"Error displaying most successful athletes: {str(e)}")
+
+
+# ----------------- ATHLETE SEARCH (FRAGMENT) ----------------- #
+@st.fragment
+def athlete_search_section(df):
+    """Athlete lookup backed by the prebuilt search index; typing reruns only this fragment"""
+    with instrument.section('Athlete-wise Analysis / Athlete Search'):
+        try:
+            st.markdown("### 🔎 Find an Athlete")
+            query = st.text_input("Athlete name", key="athlete_search",
+                                  placeholder="e.g. Phelps, usain bolt, Latynina (typos are fine)")
+            if query.strip():
+                matches = helper.search_athletes(df, query, limit=20)
+                if matches.empty:
+                    st.info(f"No athletes found for '{query}'.")
+                else:
+                    st.dataframe(matches.drop(columns=['match']).reset_index(drop=True))
+        except Exception as e:
+            st.error(f"Error searching athletes: {str(e)}")
 
-    st.sidebar.header("Filter Options")
 
-    # Safe year and country list generation
-    try:
-        years, country = helper.country_year_list(df)
-        # Ensure we have at least 'Overall' option
-        if not years or len(years) == 0:
+# ----------------- MEDAL TALLY ----------------- #
+if user_menu == 'Medal Tally':
+    with instrument.section('Medal Tally'):
+        st.sidebar.title('Olympics Analysis')
+        st.markdown("<h2 style='text-align: center;'>🏅 Medal Tally Analysis</h2>", unsafe_allow_html=True)
+
+        with st.expander("🔎 Show Raw Data"):
+            # Surrogate key columns are internal dedup keys, not data
+            safe_dataframe_display(df.drop(columns=list(preprocessor.SURROGATE_KEYS), errors='ignore'))
+
+        st.sidebar.header("Filter Options")
+
+        # Safe year and country list generation
+        try:
+            years, country = helper.country_year_list(source)
+            # Ensure we have at least 'Overall' option
+            if not years or len(years) == 0:
+                years = ['Overall']
+            if not country or len(country) == 0:
+                country = ['Overall']
+        except Exception as e:
+            st.error(f"Error loading filters: {str(e)}")
             years = ['Overall']
-        if not country or len(country) == 0:
             country = ['Overall']
-    except Exception as e:
-        st.error(f"Error loading filters: {str(e)}")
-        years = ['Overall']
-        country = ['Overall']
 
-    selected_year = st.sidebar.selectbox("Select Year", years)
-    selected_country = st.sidebar.selectbox("Select Country", country)
+        selected_year = st.sidebar.selectbox("Select Year", years)
+        selected_country = st.sidebar.selectbox("Select Country", country)
 
-    # Safe medal tally fetch
-    try:
-        medal_tally = helper.fetch_medal_tally(df, selected_year, selected_country)
-
-        # Dynamic subtitle
-        if selected_year == 'Overall' and selected_country == 'Overall':
-            st.subheader("🏅 Overall Medal Tally")
-        elif selected_year != 'Overall' and selected_country == 'Overall':
-            st.subheader(f"🏅 Medal Tally in {selected_year}")
-        elif selected_year == 'Overall' and selected_country != 'Overall':
-            st.subheader(f"🏅 Overall Performance of {selected_country}")
-        else:
-            st.subheader(f"🏅 {selected_country} Performance in {selected_year} Olympics")
+        # Safe medal tally fetch
+        try:
+            medal_tally = helper.fetch_medal_tally(source, selected_year, selected_country)
 
-        safe_dataframe_display(medal_tally)
-    except Exception as e:
-        st.error(f"Error displaying medal tally: {str(e)}")
+            # Dynamic subtitle
+            if selected_year == 'Overall' and selected_country == 'Overall':
+                st.subheader("🏅 Overall Medal Tally")
+            elif selected_year != 'Overall' and selected_country == 'Overall':
+                st.subheader(f"🏅 Medal Tally in {selected_year}")
+            elif selected_year == 'Overall' and selected_country != 'Overall':
+                st.subheader(f"🏅 Overall Performance of {selected_country}")
+            else:
+                st.subheader(f"🏅 {selected_country} Performance in {selected_year} Olympics")
+
+            safe_dataframe_display(medal_tally)
+        except Exception as e:
+            st.error(f"Error displaying medal tally: {str(e)}")
 
 # ----------------- OVERALL ANALYSIS ----------------- #
 elif user_menu == 'Overall Analysis':
-    st.markdown("<h2 style='text-align: center;'>📊 Overall Analysis</h2>", unsafe_allow_html=True)
-
-    # Safe metrics calculation
-    try:
-        editions = df['Year'].nunique() - 1 if 'Year' in df.columns else 0
-        cities = df['City'].nunique() if 'City' in df.columns else 0
-        sports = df['Sport'].nunique() if 'Sport' in df.columns else 0
-        events = df['Event'].nunique() if 'Event' in df.columns else 0
-        athletes = df['Name'].nunique() if 'Name' in df.columns else 0
-        nations = df['region'].nunique() if 'region' in df.columns else 0
-
-        col1, col2, col3 = st.columns(3)
-        col1.metric("Editions", editions)
-        col2.metric("Hosts", cities)
-        col3.metric("Sports", sports)
-
-        col1, col2, col3 = st.columns(3)
-        col1.metric("Events", events)
-        col2.metric("Nations", nations)
-        col3.metric("Athletes", athletes)
-    except Exception as e:
-        st.error(f"Error calculating metrics: {str(e)}")
+    with instrument.section('Overall Analysis'):
+        st.markdown("<h2 style='text-align: center;'>📊 Overall Analysis</h2>", unsafe_allow_html=True)
+
+        # Safe metrics calculation
+        try:
+            editions = df['Year'].nunique() - 1 if 'Year' in df.columns else 0
+            cities = df['City'].nunique() if 'City' in df.columns else 0
+            sports = df['Sport'].nunique() if 'Sport' in df.columns else 0
+            events = df['Event'].nunique() if 'Event' in df.columns else 0
+            athletes = df['Name'].nunique() if 'Name' in df.columns else 0
+            nations = df['region'].nunique() if 'region' in df.columns else 0
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Editions", editions)
+            col2.metric("Hosts", cities)
+            col3.metric("Sports", sports)
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Events", events)
+            col2.metric("Nations", nations)
+            col3.metric("Athletes", athletes)
+        except Exception as e:
+            st.error(f"Error calculating metrics: {str(e)}")
+
+        # Each tab computes only while it is open; each section reruns alone on its own widgets
+        trends_tab, heatmap_tab, athletes_tab = st.tabs(
+            ["📈 Participation Trends", "🗺️ Events per Sport", "🏅 Most Successful Athletes"],
+            key="overall_tab", on_change="rerun")
+        with trends_tab:
+            if trends_tab.open:
+                overall_trends_section(source)
+        with heatmap_tab:
+            if heatmap_tab.open:
+                events_heatmap_section(source)
+        with athletes_tab:
+            if athletes_tab.open:
+                top_athletes_section(df, source)
 
-    # Nations over time
-    try:
-        nations_over_time = helper.data_over_time(df, "region")
-        if not nations_over_time.empty:
-            fig = px.line(nations_over_time, x='Edition', y='region', markers=True, line_shape='spline',
-                          color_discrete_sequence=['#89CFF0'])
-            fig.update_layout(template="plotly_dark", margin=dict(l=20, r=20, t=40, b=20), height=450)
-            fig.update_traces(line=dict(width=3))
-            st.title("Participating Nations Over the Years")
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No data available for nations over time")
-    except Exception as e:
-        st.error(f"Error displaying nations over time: {str(e)}")
+# ----------------- COUNTRY-WISE ANALYSIS ----------------- #
+elif user_menu == 'Country-wise Analysis':
+    with instrument.section('Country-wise Analysis'):
+        st.markdown("<h2 style='text-align: center;'>🏅 Country-wise Yearwise Medal Tally</h2>",
+                    unsafe_allow_html=True)
 
-    # Events over time
-    try:
-        events_over_time = helper.data_over_time(df, "Event")
-        if not events_over_time.empty:
-            fig = px.line(events_over_time, x='Edition', y='Event', markers=True, line_shape='spline',
-                          color_discrete_sequence=['#A3C1AD'])
-            fig.update_layout(template="plotly_dark", margin=dict(l=20, r=20, t=40, b=20), height=450)
-            fig.update_traces(line=dict(width=3))
-            st.title("Events Over the Years")
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No data available for events over time")
-    except Exception as e:
-        st.error(f"Error displaying events over time: {str(e)}")
+        # ----------------- Sidebar country selection ----------------- #
+        try:
+            country_list = df['region'].dropna().unique().tolist() if 'region' in df.columns else []
+            country_list.sort()
 
-    # Athletes over time
-    try:
-        athletes_over_time = helper.data_over_time(df, "Name")
-        if not athletes_over_time.empty:
-            fig = px.line(athletes_over_time, x='Edition', y='Name', markers=True, line_shape='spline',
-                          color_discrete_sequence=['#FFD580'])
-            fig.update_layout(template="plotly_dark", margin=dict(l=20, r=20, t=40, b=20), height=450)
-            fig.update_traces(line=dict(width=3))
-            st.title("Athletes Over the Years")
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No data available for athletes over time")
-    except Exception as e:
-        st.error(f"Error displaying athletes over time: {str(e)}")
+            if not country_list:
+                st.warning("No country data available")
+                st.stop()
 
-    # Heatmap: Events per sport
-    try:
-        heatmap_data = helper.events_per_sport_over_time(df)
-        if not heatmap_data.empty:
-            fig = px.imshow(
-                heatmap_data,
-                labels=dict(x="Year", y="Sport", color="Number of Events"),
-                text_auto=True,
-                aspect="auto",
-                color_continuous_scale="Viridis"
-            )
-            fig.update_layout(title="Number of Events per Sport Over the Years", xaxis_title="Year",
-                              yaxis_title="Sport", height=800)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No data available for events per sport heatmap")
-    except Exception as e:
-        st.error(f"Error displaying heatmap: {str(e)}")
-
-    # Most successful athletes
-    try:
-        st.markdown("<h3 style='text-align: center;'>🏅 Most Successful Athletes</h3>", unsafe_allow_html=True)
-        sport_list = df['Sport'].dropna().unique().tolist() if 'Sport' in df.columns else []
-        sport_list.sort()
-        sport_list.insert(0, 'Overall')
-        selected_sport = st.selectbox("Select Sport", sport_list, key="overall_athletes")
-
-        top_athletes = helper.most_successful(df, selected_sport)
-        if not top_athletes.empty:
-            st.dataframe(top_athletes[['Name', 'Total Wins', 'Sport', 'region']].reset_index(drop=True))
-
-            fig = px.bar(
-                top_athletes.head(10),
-                x='Total Wins',
-                y='Name',
-                color='Sport',
-                orientation='h',
-                text='Total Wins',
-                color_discrete_sequence=[
-                    '#FFB3BA', '#FFDFBA', '#FFFFBA', '#BAFFC9', '#BAE1FF',
-                    '#D7BAFF', '#FFC2E2', '#BFFCC6', '#FFE0AC', '#A0E7E5'
-                ]
+            default_index = country_list.index('United States') if 'United States' in country_list else 0
+            selected_country = st.sidebar.selectbox(
+                "Select a Country",
+                country_list,
+                index=default_index
             )
-            fig.update_layout(template="plotly_dark", margin=dict(l=20, r=20, t=40, b=20), height=600,
-                              yaxis=dict(autorange="reversed"))
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No athlete data available")
-    except Exception as e:
-        st.error(f"Error displaying most successful athletes: {str(e)}")
-
-# ----------------- COUNTRY-WISE ANALYSIS ----------------- #
-elif user_menu == 'Country-wise Analysis':
-    st.markdown("<h2 style='text-align: center;'>🏅 Country-wise Yearwise Medal Tally</h2>", unsafe_allow_html=True)
+        except Exception as e:
+            st.error(f"Error loading country list: {str(e)}")
+            st.stop()
 
-    # ----------------- Sidebar country selection ----------------- #
-    try:
-        country_list = df['region'].dropna().unique().tolist() if 'region' in df.columns else []
-        country_list.sort()
+        # ----------------- Yearwise medal tally table & line ----------------- #
+        try:
+            country_medal_df = helper.yearwise_medal_tally(source, selected_country)
 
-        if not country_list:
-            st.warning("No country data available")
-            st.stop()
+            if country_medal_df.empty:
+                st.warning(f"No medals found for {selected_country}.")
+            else:
+                # Rename column for consistent usage
+                country_medal_df = country_medal_df.rename(columns={'Medal': 'Total Medals'})
 
-        default_index = country_list.index('United States') if 'United States' in country_list else 0
-        selected_country = st.sidebar.selectbox(
-            "Select a Country",
-            country_list,
-            index=default_index
-        )
-    except Exception as e:
-        st.error(f"Error loading country list: {str(e)}")
-        st.stop()
+                # Display table
+                st.dataframe(country_medal_df)
 
-    # ----------------- Yearwise medal tally table & line ----------------- #
-    try:
-        country_medal_df = helper.yearwise_medal_tally(df, selected_country)
+                # Create line chart using the renamed column
+                fig = helper.medal_trend_figure(country_medal_df)
+                st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.error(f"Error displaying country medal tally: {str(e)}")
 
-        if country_medal_df.empty:
-            st.warning(f"No medals found for {selected_country}.")
-        else:
-            # Rename column for consistent usage
-            country_medal_df = country_medal_df.rename(columns={'Medal': 'Total Medals'})
-
-            # Display table
-            st.dataframe(country_medal_df)
-
-            # Create line chart using the renamed column
-            fig = px.line(
-                country_medal_df,
-                x='Year',
-                y='Total Medals',
-                markers=True,
-                line_shape='spline',
-                color_discrete_sequence=['#FFB347']
-            )
-            fig.update_layout(
-                template="plotly_dark",
-                margin=dict(l=20, r=20, t=40, b=20),
-                height=450,
-                xaxis_title="Year",
-                yaxis_title="Total Medals"
-            )
-            fig.update_traces(line=dict(width=3))
-            st.plotly_chart(fig, use_container_width=True)
-    except Exception as e:
-        st.error(f"Error displaying country medal tally: {str(e)}")
+        # ----------------- Country-specific sport heatmap ----------------- #
+        try:
+            st.markdown(f"<h3 style='text-align: center;'>🏆 Medals per Sport Heatmap for {selected_country}</h3>",
+                        unsafe_allow_html=True)
 
-    # ----------------- Country-specific sport heatmap ----------------- #
-    try:
-        st.markdown(f"<h3 style='text-align: center;'>🏆 Medals per Sport Heatmap for {selected_country}</h3>",
-                    unsafe_allow_html=True)
+            heatmap_data = helper.country_sport_heatmap(source, selected_country)
+            if heatmap_data.empty:
+                st.warning(f"No medals found for {selected_country} to display heatmap.")
+            else:
+                fig = helper.country_heatmap_figure(heatmap_data, selected_country)
+                st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.error(f"Error displaying heatmap: {str(e)}")
 
-        heatmap_data = helper.country_sport_heatmap(df, selected_country)
-        if heatmap_data.empty:
-            st.warning(f"No medals found for {selected_country} to display heatmap.")
-        else:
-            fig = px.imshow(
-                heatmap_data,
-                labels=dict(x="Year", y="Sport", color="Number of Medals"),
-                text_auto=True,
-                aspect="auto",
-                color_continuous_scale="Viridis"
-            )
-            fig.update_layout(
-                title=f"Medals per Sport Over the Years - {selected_country}",
-                xaxis_title="Year",
-                yaxis_title="Sport",
-                template="plotly_dark",
-                height=700,
-                margin=dict(l=20, r=20, t=50, b=20)
-            )
-            st.plotly_chart(fig, use_container_width=True)
-    except Exception as e:
-        st.error(f"Error displaying heatmap: {str(e)}")
+        # ----------------- Most Successful Athletes ----------------- #
+        try:
+            st.markdown(f"<h3 style='text-align: center;'>🏅 Most Successful Athletes - {selected_country}</h3>",
+                        unsafe_allow_html=True)
+            top_athletes = helper.most_successful2(source, selected_country)
 
-    # ----------------- Most Successful Athletes ----------------- #
-    try:
-        st.markdown(f"<h3 style='text-align: center;'>🏅 Most Successful Athletes - {selected_country}</h3>",
-                    unsafe_allow_html=True)
-        top_athletes = helper.most_successful2(df, selected_country)
+            if top_athletes.empty:
+                st.warning(f"No athlete data found for {selected_country}.")
+            else:
+                # Show as table
+                st.dataframe(top_athletes[['Name', 'Total Wins', 'Gold', 'Sport']].reset_index(drop=True))
 
-        if top_athletes.empty:
-            st.warning(f"No athlete data found for {selected_country}.")
-        else:
-            # Show as table
-            st.dataframe(top_athletes[['Name', 'Total Wins', 'Sport']].reset_index(drop=True))
-
-            # Horizontal bar chart
-            fig = px.bar(
-                top_athletes.head(10),
-                x='Total Wins',
-                y='Name',
-                color='Sport',
-                orientation='h',
-                text='Total Wins',
-                color_discrete_sequence=[
-                    '#FFB3BA', '#FFDFBA', '#FFFFBA', '#BAFFC9', '#BAE1FF',
-                    '#D7BAFF', '#FFC2E2', '#BFFCC6', '#FFE0AC', '#A0E7E5'
-                ]
-            )
-            fig.update_layout(
-                template="plotly_dark",
-                margin=dict(l=20, r=20, t=40, b=20),
-                height=600,
-                yaxis=dict(autorange="reversed")
-            )
-            st.plotly_chart(fig, use_container_width=True)
-    except Exception as e:
-        st.error(f"Error displaying most successful athletes: {str(e)}")
+                # Horizontal bar chart
+                fig = helper.top_athletes_figure(top_athletes)
+                st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.error(f"Error displaying most successful athletes: {str(e)}")
 
 # ----------------- ATHLETE-WISE ANALYSIS ----------------- #
 elif user_menu == 'Athlete-wise Analysis':
-    st.markdown("<h2 style='text-align: center;'>🏃 Athlete Analysis</h2>", unsafe_allow_html=True)
+    with instrument.section('Athlete-wise Analysis'):
+        st.markdown("<h2 style='text-align: center;'>🏃 Athlete Analysis</h2>", unsafe_allow_html=True)
 
-    st.markdown("### Age Distribution of Athletes and Medalists")
+        athlete_search_section(df)
 
-    # Get the figure from helper
-    try:
-        fig = helper.age_distribution(df)
-        if fig:
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.warning("No age distribution data available")
-    except Exception as e:
-        st.error(f"Error displaying age distribution: {str(e)}")
+        st.markdown("### Age Distribution of Athletes and Medalists")
 
-    try:
-        sport_options = df['Sport'].unique().tolist() if 'Sport' in df.columns else []
-        famous_sports = st.sidebar.multiselect(
-            "Select Sports for Gold Medalist Age Distribution",
-            options=sport_options,
-            default=['Athletics', 'Swimming', 'Gymnastics', 'Rowing'] if sport_options else []
-        )
-
-        if famous_sports:
-            fig = helper.gold_age_distribution_by_sport(df, famous_sports)
+        # Get the figure from helper
+        try:
+            fig = helper.age_distribution(df)
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
             else:
-                st.warning("No Gold medalist age data available for the selected sports.")
-        else:
-            st.info("Please select at least one sport from the sidebar.")
-    except Exception as e:
-        st.error(f"Error displaying gold medalist age distribution: {str(e)}")
-
-    try:
-        sport_list = df['Sport'].dropna().unique().tolist() if 'Sport' in df.columns else []
-        sport_list.sort()
-
-        if sport_list:
-            selected_sport = st.selectbox("Select Sport for Height vs Weight Scatter", sport_list)
-
-            # Get scatter figure from helper
-            fig = helper.height_weight_scatter(df, selected_sport)
+                st.warning("No age distribution data available")
+        except Exception as e:
+            st.error(f"Error displaying age distribution: {str(e)}")
+
+        try:
+            sport_options = df['Sport'].unique().tolist() if 'Sport' in df.columns else []
+            famous_sports = st.sidebar.multiselect(
+                "Select Sports for Gold Medalist Age Distribution",
+                options=sport_options,
+                default=['Athletics', 'Swimming', 'Gymnastics', 'Rowing'] if sport_options else []
+            )
 
+            if famous_sports:
+                fig = helper.gold_age_distribution_by_sport(df, famous_sports)
+                if fig:
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.warning("No Gold medalist age data available for the selected sports.")
+            else:
+                st.info("Please select at least one sport from the sidebar.")
+        except Exception as e:
+            st.error(f"Error displaying gold medalist age distribution: {str(e)}")
+
+        try:
+            sport_list = df['Sport'].dropna().unique().tolist() if 'Sport' in df.columns else []
+            sport_list.sort()
+
+            if sport_list:
+                selected_sport = st.selectbox("Select Sport for Height vs Weight Scatter", sport_list)
+
+                # Get scatter figure from helper
+                fig = helper.height_weight_scatter(df, selected_sport)
+
+                if fig:
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.warning(f"No athlete data available for {selected_sport}.")
+
+                st.markdown(f"### Male vs Female Participation Over the Years in {selected_sport}")
+                fig_gender = helper.male_vs_female_participation_sport(df, selected_sport)
+                if fig_gender:
+                    st.plotly_chart(fig_gender, use_container_width=True)
+                else:
+                    st.warning(f"No male/female athlete data available for {selected_sport}.")
+        except Exception as e:
+            st.error(f"Error displaying sport-specific analysis: {str(e)}")
+
+        try:
+            st.markdown("### Male vs Female Participation Over the Years")
+            fig = helper.male_vs_female_participation(df)
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
             else:
-                st.warning(f"No athlete data available for {selected_sport}.")
-
-            st.markdown(f"### Male vs Female Participation Over the Years in {selected_sport}")
-            fig_gender = helper.male_vs_female_participation_sport(df, selected_sport)
-            if fig_gender:
-                st.plotly_chart(fig_gender, use_container_width=True)
-            else:
-                st.warning(f"No male/female athlete data available for {selected_sport}.")
-    except Exception as e:
-        st.error(f"Error displaying sport-specific analysis: {str(e)}")
-
-    try:
-        st.markdown("### Male vs Female Participation Over the Years")
-        fig = helper.male_vs_female_participation(df)
-        if fig:
-            st.plotly_chart(fig, use_container_width=True)
+                st.warning("No male/female participation data available")
+        except Exception as e:
+            st.error(f"Error displaying male/female participation: {str(e)}")
+
+# ----------------- BACKGROUND WARM-UP PROGRESS (DEBUG EXPANDER) ----------------- #
+def warm_up_panel(df, source):
+    """Warm-up progress, refreshed every 2 s while it runs"""
+    status = helper.warm_up_status(df)
+    if status is None:
+        if source is not df:
+            st.info("Warm-up only applies to the pandas backend (engine results are not memoized)")
+        elif st.button("Start warm-up", key="start_warm_up"):
+            helper.start_warm_up(df, source)
+            st.rerun()
         else:
-            st.warning("No male/female participation data available")
-    except Exception as e:
-        st.error(f"Error displaying male/female participation: {str(e)}")
\ No newline at end of file
+            st.info("Not started (set OLYMPIC_WARMUP=1 to start it with the app)")
+        return
+    total = max(status['total'], 1)
+    st.progress(min((status['done'] + status['failed']) / total, 1.0),
+                text=f"{status['done']} / {status['total']} results cached in {status['elapsed']:.1f}s"
+                     + (" (running)" if status['running'] else ""))
+    if status['failed'] or status['skipped']:
+        st.write(f"**Failed:** {status['failed']} · **Over cache budget:** {status['skipped']}")
+
+
+with warmup_slot:
+    running = (helper.warm_up_status(df) or {}).get('running', False)
+    st.fragment(run_every=2 if running else None)(warm_up_panel)(df, source)
+
+# ----------------- HOT-PATH TIMING TABLE (DEBUG EXPANDER) ----------------- #
+if instrument.is_enabled():
+    with timing_slot:
+        timings = instrument.summary(since=trace_mark, thread=trace_thread)
+        if timings.empty:
+            st.info("No timings recorded for this run yet")
+        else:
+            st.dataframe(timings, use_container_width=True)
@@ -0,0 +1,252 @@
+## athlete_search.py - PREBUILT ATHLETE SEARCH INDEX (PREFIX + N-GRAM)
+#
+# AthleteIndex is built once per dataset version from the preprocessed frame:
+# one row per athlete ID with region, sport and medal counts, a sorted array of
+# normalized full names and name tokens for prefix lookups, and a bigram index
+# over the tokens for typo-tolerant matches.  to_arrays()/from_arrays() round-trip
+# through NumPy arrays so helper.py can persist it with preprocessor.save_artifact.
+
+import bisect
+import difflib
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+SEPARATOR = '\x1f'
+RESULT_COLS = ['ID', 'Name', 'region', 'Sport', 'Gold', 'Silver', 'Bronze', 'total', 'Games', 'match']
+MIN_SIMILARITY = 0.7
+MAX_CANDIDATE_TOKENS = 150
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(text):
+    """Casefold, strip accents and punctuation: 'Jean-François' -> 'jean francois'"""
+    text = str(text)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', text.casefold()).strip()
+
+
+def ngrams(token):
+    """Padded character bigrams of a token ('abc' -> ' a', 'ab', 'bc', 'c ')"""
+    padded = f" {token} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _pack(strings):
+    """List of strings -> uint8 array (separator-joined UTF-8) that np.savez stores without pickling"""
+    return np.frombuffer(SEPARATOR.join(strings).encode('utf-8'), dtype=np.uint8).copy()
+
+
+def _unpack(array, count):
+    """Inverse of _pack for a list known to hold count strings"""
+    return array.tobytes().decode('utf-8').split(SEPARATOR) if count else []
+
+
+def _csr(keys, values):
+    """Group values by integer key: (offsets, values sorted by key) with offsets[k]:offsets[k + 1] per key"""
+    order = np.argsort(keys, kind='stable')
+    offsets = np.zeros(keys.max() + 2 if len(keys) else 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=len(offsets) - 1), out=offsets[1:])
+    return offsets, values[order]
+
+
+class AthleteIndex:
+    """Athlete table plus prefix and bigram indexes over normalized names"""
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.ids = arrays['ids']
+        self.names = _unpack(arrays['names'], len(self.ids))
+        self.regions = _unpack(arrays['region_labels'], int(arrays['n_regions']))
+        self.sports = _unpack(arrays['sport_labels'], int(arrays['n_sports']))
+        self.full_keys = _unpack(arrays['full_keys'], len(arrays['full_offsets']) - 1)
+        self.token_keys = _unpack(arrays['token_keys'], len(arrays['token_offsets']) - 1)
+        self.gram_keys = _unpack(arrays['gram_keys'], len(arrays['gram_offsets']) - 1)
+        self.gram_lookup = {gram: k for k, gram in enumerate(self.gram_keys)}
+        self.token_lengths = np.array([len(token) for token in self.token_keys], dtype=np.int32)
+        # Popularity order used to rank ties: medals, then editions, then name
+        medals = arrays['medals'].sum(axis=1)
+        self.rank = np.lexsort((np.arange(len(self.ids)), -arrays['games'], -medals)).argsort()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __repr__(self):
+        return f"<AthleteIndex {len(self):,} athletes, {len(self.token_keys):,} tokens>"
+
+    # ----------------- BUILD / PERSIST ----------------- #
+    @classmethod
+    def build(cls, df):
+        """Build the index from a preprocessed frame (one entry per athlete ID, or per Name without IDs)"""
+        key = 'ID' if 'ID' in df.columns else 'Name'
+        frame = df.loc[df['Name'].notna()]
+        athlete_codes, athlete_keys = pd.factorize(frame[key], sort=True)
+        n = len(athlete_keys)
+
+        # First-seen name, region and sport per athlete; medal rows and editions counted per athlete
+        first = pd.Series(np.arange(len(frame))).groupby(athlete_codes, sort=True).min().to_numpy()
+        names = frame['Name'].astype(object).to_numpy()[first]
+        region_codes, region_labels = pd.factorize(frame['region'].astype(object).to_numpy()[first]
+                                                   if 'region' in frame.columns else np.full(n, None))
+        sport_codes, sport_labels = pd.factorize(frame['Sport'].astype(object).to_numpy()[first]
+                                                 if 'Sport' in frame.columns else np.full(n, None))
+        medals = np.zeros((n, 3), dtype=np.int32)
+        for k, medal in enumerate(['Gold', 'Silver', 'Bronze']):
+            if medal in frame.columns:
+                medals[:, k] = np.bincount(athlete_codes, weights=frame[medal].to_numpy(dtype='float64'),
+                                           minlength=n)
+        if 'Games' in frame.columns:
+            games = pd.Series(frame['Games'].to_numpy()).groupby(athlete_codes).nunique().to_numpy()
+        else:
+            games = np.ones(n, dtype=np.int64)
+        ids = (athlete_keys.to_numpy(dtype=np.int64) if key == 'ID' else np.arange(n, dtype=np.int64))
+
+        # Normalized full names and their tokens, each mapped to the athletes carrying them
+        normalized = [normalize(name) for name in names]
+        full_codes, full_keys = pd.factorize(np.array(normalized, dtype=object), sort=True)
+        full_offsets, full_postings = _csr(full_codes, np.arange(n, dtype=np.int32))
+
+        token_athletes = [(token, i) for i, name in enumerate(normalized) for token in set(name.split())]
+        tokens = np.array([t for t, _ in token_athletes], dtype=object)
+        owners = np.array([i for _, i in token_athletes], dtype=np.int32)
+        token_codes, token_keys = pd.factorize(tokens, sort=True)
+        token_offsets, token_postings = _csr(token_codes, owners)
+
+        # Bigram -> token postings for fuzzy candidate lookups
+        gram_pairs = [(gram, t) for t, token in enumerate(token_keys) for gram in ngrams(token)]
+        gram_codes, gram_keys = pd.factorize(np.array([g for g, _ in gram_pairs], dtype=object), sort=True)
+        gram_offsets, gram_postings = _csr(gram_codes, np.array([t for _, t in gram_pairs], dtype=np.int32))
+
+        return cls({'ids': ids, 'names': _pack(names), 'region_codes': region_codes.astype(np.int32),
+                    'region_labels': _pack(region_labels), 'n_regions': np.array(len(region_labels)),
+                    'sport_codes': sport_codes.astype(np.int32), 'sport_labels': _pack(sport_labels),
+                    'n_sports': np.array(len(sport_labels)), 'medals': medals, 'games': games.astype(np.int32),
+                    'full_keys': _pack(full_keys), 'full_offsets': full_offsets, 'full_postings': full_postings,
+                    'token_keys': _pack(token_keys), 'token_offsets': token_offsets,
+                    'token_postings': token_postings, 'gram_keys': _pack(gram_keys),
+                    'gram_offsets': gram_offsets, 'gram_postings': gram_postings})
+
+    def to_arrays(self):
+        """Arrays for preprocessor.save_artifact"""
+        return self.arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuild an index from arrays returned by preprocessor.load_artifact (None if incomplete)"""
+        try:
+            return cls(arrays)
+        except (KeyError, ValueError, UnicodeDecodeError):
+            return None
+
+    # ----------------- LOOKUPS ----------------- #
+    @staticmethod
+    def _prefix_range(keys, prefix):
+        """[lo, hi) of the sorted keys that start with prefix"""
+        return bisect.bisect_left(keys, prefix), bisect.bisect_left(keys, prefix + '\U0010ffff')
+
+    def _athletes(self, name, lo, hi):
+        """Athletes posted under keys lo..hi-1 of the full/token index (one contiguous slice)"""
+        offsets = self.arrays[f'{name}_offsets']
+        return self.arrays[f'{name}_postings'][offsets[lo]:offsets[hi]]
+
+    def _fuzzy_tokens(self, token):
+        """(token ids, similarity) of indexed tokens within typo distance of token
+
+        Shared bigrams among tokens of similar length pick the candidates; difflib's ratio
+        scores them, so transpositions ('phleps') match although they break several n-grams.
+        """
+        grams = [self.gram_lookup[g] for g in ngrams(token) if g in self.gram_lookup]
+        if not grams:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        offsets, postings = self.arrays['gram_offsets'], self.arrays['gram_postings']
+        shared = np.zeros(len(self.token_keys), dtype=np.int32)
+        for g in grams:
+            shared[postings[offsets[g]:offsets[g + 1]]] += 1
+        length_gap = np.abs(self.token_lengths - len(token))
+        candidates = np.flatnonzero((shared >= max(1, len(grams) // 2)) & (length_gap <= max(1, len(token) // 3)))
+        if len(candidates) > MAX_CANDIDATE_TOKENS:
+            priority = 2 * shared[candidates] - length_gap[candidates]
+            candidates = np.sort(candidates[np.argpartition(-priority, MAX_CANDIDATE_TOKENS)[:MAX_CANDIDATE_TOKENS]])
+
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        matcher.set_seq2(token)
+        similarity = np.zeros(len(candidates))
+        for k, t in enumerate(candidates.tolist()):
+            matcher.set_seq1(self.token_keys[t])
+            if matcher.quick_ratio() >= MIN_SIMILARITY:
+                similarity[k] = matcher.ratio()
+        keep = np.flatnonzero(similarity >= MIN_SIMILARITY)
+        return candidates[keep], similarity[keep]
+
+    def search(self, query, limit=10):
+        """Ranked athletes for query: full-name prefix, then all-token prefix, then n-gram (typo) matches"""
+        q = normalize(query)
+        if not q or limit <= 0:
+            return self._frame(np.empty(0, dtype=np.int64), [])
+        found, kinds = [], []
+        seen = np.zeros(len(self.ids), dtype=bool)
+
+        def take(candidates, kind, score=None):
+            candidates = candidates[~seen[candidates]]
+            if not len(candidates):
+                return
+            candidates = np.unique(candidates)
+            if score is None:
+                order = np.argsort(self.rank[candidates], kind='stable')
+            else:
+                order = np.lexsort((self.rank[candidates], -score[candidates]))
+            chosen = candidates[order[:limit - len(found)]]
+            seen[chosen] = True
+            found.extend(chosen.tolist())
+            kinds.extend([kind] * len(chosen))
+
+        # 1) The whole query is a prefix of the normalized name
+        take(self._athletes('full', *self._prefix_range(self.full_keys, q)), 'prefix')
+
+        # 2) Every query token is a prefix of some name token ('phelps mich' -> 'Michael Fred Phelps, II')
+        query_tokens = q.split()
+        if len(found) < limit:
+            matched = None
+            for token in sorted(query_tokens, key=len, reverse=True):
+                athletes = self._athletes('token', *self._prefix_range(self.token_keys, token))
+                matched = athletes if matched is None else np.intersect1d(matched, athletes, assume_unique=False)
+                if not len(matched):
+                    break
+            if matched is not None:
+                take(matched, 'token')
+
+        # 3) Typo tolerance: score athletes by their best token similarity per query token
+        if len(found) < limit:
+            score = np.zeros(len(self.ids))
+            offsets, postings = self.arrays['token_offsets'], self.arrays['token_postings']
+            for token in query_tokens:
+                token_ids, similarity = self._fuzzy_tokens(token)
+                if not len(token_ids):
+                    continue
+                sizes = offsets[token_ids + 1] - offsets[token_ids]
+                athletes = np.concatenate([postings[offsets[t]:offsets[t + 1]] for t in token_ids.tolist()])
+                best = np.zeros(len(self.ids))
+                np.maximum.at(best, athletes, np.repeat(similarity, sizes))
+                score += best
+            candidates = np.flatnonzero(score >= MIN_SIMILARITY * max(len(query_tokens), 1))
+            take(candidates, 'fuzzy', score)
+
+        return self._frame(np.array(found, dtype=np.int64), kinds)
+
+    def _frame(self, rows, kinds):
+        """Result frame for athlete rows in ranked order"""
+        if not len(rows):
+            return pd.DataFrame(columns=RESULT_COLS)
+        medals = self.arrays['medals'][rows]
+        region_codes, sport_codes = self.arrays['region_codes'][rows], self.arrays['sport_codes'][rows]
+        return pd.DataFrame({
+            'ID': self.ids[rows],
+            'Name': [self.names[i] for i in rows.tolist()],
+            'region': [self.regions[c] if c >= 0 else None for c in region_codes.tolist()],
+            'Sport': [self.sports[c] if c >= 0 else None for c in sport_codes.tolist()],
+            'Gold': medals[:, 0], 'Silver': medals[:, 1], 'Bronze': medals[:, 2], 'total': medals.sum(axis=1),
+            'Games': self.arrays['games'][rows], 'match': kinds})
@@ -0,0 +1,354 @@
+## benchmark.py - TIMING SUITE FOR THE helper.py ANALYTICS
+#
+# Usage:
+#   python benchmark.py                              # real data + 10x, 100x
+#   python benchmark.py --scales 1 10 100 1000 --repeat 5
+#   python benchmark.py --baseline bench/baseline.json --fail-on-regression
+#   python benchmark.py --only fetch_medal_tally most_successful
+#   python benchmark.py --scales 1 100 1000 --source synthetic --seed 7
+#   python benchmark.py --parity polars --scales 1 10      # engine vs pandas outputs
+#   python benchmark.py --check-keys --scales 1 10         # surrogate keys vs drop_duplicates
+#   python benchmark.py --replicas 4                       # per-process memory, private vs mmap frame
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import helper
+import instrument
+import preprocessor
+import synthetic
+
+
+def _load_quietly():
+    """Run preprocess() with its progress prints swallowed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return preprocessor.preprocess()
+
+
+def scaled_dataset(df, factor):
+    """Return df tiled factor times with distinct athletes and events per copy"""
+    if factor == 1:
+        return df
+    n = len(df)
+    copy_ids = np.repeat(np.arange(factor), n)
+    scaled = {}
+    for col in df.columns:
+        values = df[col]
+        if col in ('Name', 'Event', 'ID') or col in preprocessor.SURROGATE_KEYS:
+            continue
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = np.tile(values.cat.codes.to_numpy(), factor)
+            scaled[col] = pd.Categorical.from_codes(codes, dtype=values.dtype)
+        else:
+            scaled[col] = np.tile(values.to_numpy(), factor)
+
+    # Each copy gets its own athletes and events so deduplication keeps the extra rows
+    for col in ('Name', 'Event'):
+        if col in df.columns:
+            base = df[col].astype('category')
+            categories = base.cat.categories.astype(str)
+            n_cat = len(categories)
+            new_categories = np.concatenate([categories if k == 0 else categories + f" #{k}"
+                                             for k in range(factor)])
+            codes = np.tile(base.cat.codes.to_numpy().astype(np.int64), factor)
+            codes = np.where(codes >= 0, codes + copy_ids * n_cat, -1)
+            scaled[col] = pd.Categorical.from_codes(codes, categories=new_categories)
+    if 'ID' in df.columns:
+        scaled['ID'] = np.tile(df['ID'].to_numpy(dtype=np.int64), factor) + copy_ids * (int(df['ID'].max()) + 1)
+
+    out = preprocessor.add_surrogate_keys(pd.DataFrame(scaled))[list(df.columns)]
+    return preprocessor.set_dataset_version(out, f"scaled:{helper.dataset_version(df)}:{factor}")
+
+
+def synthetic_dataset(df, factor, seed=0):
+    """Return a seeded synthetic frame with factor times the rows of df"""
+    if factor == 1:
+        return df
+    rows = len(df) * factor
+    with contextlib.redirect_stdout(io.StringIO()):
+        out = preprocessor.optimize_schema(synthetic.generate(rows, seed))
+    return preprocessor.set_dataset_version(out, f"synthetic:{rows}:{seed}")
+
+
+def benchmark_cases(df):
+    """Return (label, function, args) for every public helper on df"""
+    medals = helper.medal_events(df)
+    top_country = medals['region'].value_counts().index[0] if not medals.empty else 'Overall'
+    top_sport = medals['Sport'].value_counts().index[0] if not medals.empty else 'Overall'
+    years = sorted(df['Year'].dropna().unique().tolist())
+    last_year = years[-1] if years else 'Overall'
+    sports = df['Sport'].value_counts().index[:4].tolist()
+
+    return [
+        ('country_year_list', helper.country_year_list, ()),
+        ('medal_tally', helper.medal_tally, ()),
+        ('fetch_medal_tally[Overall,Overall]', helper.fetch_medal_tally, ('Overall', 'Overall')),
+        (f'fetch_medal_tally[{last_year},Overall]', helper.fetch_medal_tally, (last_year, 'Overall')),
+        (f'fetch_medal_tally[Overall,{top_country}]', helper.fetch_medal_tally, ('Overall', top_country)),
+        ('edition_metrics', helper.edition_metrics, ()),
+        ('edition_metrics[by_season]', helper.edition_metrics, (None, True)),
+        ('data_over_time[region]', helper.data_over_time, ('region',)),
+        ('data_over_time[Event]', helper.data_over_time, ('Event',)),
+        ('data_over_time[Name]', helper.data_over_time, ('Name',)),
+        ('events_per_sport_over_time', helper.events_per_sport_over_time, ()),
+        ('most_successful[Overall]', helper.most_successful, ('Overall',)),
+        (f'most_successful[{top_sport}]', helper.most_successful, (top_sport,)),
+        (f'most_successful2[{top_country}]', helper.most_successful2, (top_country,)),
+        (f'yearwise_medal_tally[{top_country}]', helper.yearwise_medal_tally, (top_country,)),
+        (f'country_sport_heatmap[{top_country}]', helper.country_sport_heatmap, (top_country,)),
+        ('age_distribution', helper.age_distribution, ()),
+        ('gold_age_distribution_by_sport', helper.gold_age_distribution_by_sport, (sports,)),
+        (f'height_weight_scatter[{top_sport}]', helper.height_weight_scatter, (top_sport,)),
+        ('male_vs_female_participation', helper.male_vs_female_participation, ()),
+        ('search_athletes[prefix]', helper.search_athletes, ('mich',)),
+        ('search_athletes[typo]', helper.search_athletes, ('Micheal Phelsp',)),
+        (f'male_vs_female_participation_sport[{top_sport}]', helper.male_vs_female_participation_sport,
+         (top_sport,)),
+    ]
+
+
+def time_call(func, df, args, repeat):
+    """Return (cold seconds, median warm seconds, peak traced bytes) for func(df, *args)"""
+    gc.collect()
+    start = time.perf_counter()
+    func(df, *args)
+    cold = time.perf_counter() - start
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df, *args)
+        timings.append(time.perf_counter() - start)
+
+    # Separate traced run: tracemalloc slows the call down, so it is not timed
+    gc.collect()
+    tracemalloc.start()
+    func(df, *args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cold, statistics.median(timings), peak
+
+
+def run(scales=(1, 10, 100), repeat=3, only=None, source='synthetic', seed=0):
+    """Benchmark every helper at each dataset scale and return the result records"""
+    helper.configure_memo(enabled=False)
+    base = _load_quietly()
+    results = []
+
+    for factor in scales:
+        helper._DERIVED.clear()
+        start = time.perf_counter()
+        df = synthetic_dataset(base, factor, seed) if source == 'synthetic' else scaled_dataset(base, factor)
+        build_seconds = time.perf_counter() - start
+        rows = len(df)
+        print(f"\n📏 Scale {factor}x ({source if factor > 1 else 'real'}): {rows:,} rows ({df.memory_usage(deep=True).sum() / 1e6:.0f} MB, "
+              f"built in {build_seconds:.1f}s)")
+        print(f"{'helper':<55} {'cold s':>9} {'warm s':>9} {'peak MB':>9} {'Mrows/s':>9}")
+
+        for label, func, args in benchmark_cases(df):
+            if only and func.__name__ not in only:
+                continue
+            cold, warm, peak = time_call(func, df, args, repeat)
+            throughput = rows / warm / 1e6 if warm > 0 else float('inf')
+            results.append({'case': label, 'function': func.__name__, 'source': source,
+                            'scale': factor, 'rows': rows, 'cold_seconds': cold, 'warm_seconds': warm,
+                            'peak_bytes': peak, 'rows_per_second': rows / warm if warm > 0 else None})
+            print(f"{label[:55]:<55} {cold:>9.4f} {warm:>9.4f} {peak / 1e6:>9.1f} {throughput:>9.2f}")
+        del df
+    return results
+
+
+def _decoded(value):
+    """Categorical columns as plain objects so engines returning decoded strings compare equal"""
+    if isinstance(value, pd.DataFrame):
+        return value.astype({col: object for col in value.columns
+                             if isinstance(value[col].dtype, pd.CategoricalDtype)})
+    return value
+
+
+def parity(engine, scales=(1,), only=None, seed=0):
+    """Compare every pushed-down helper on engine against the pandas path; return the mismatches"""
+    helper.configure_memo(enabled=False)
+    base = _load_quietly()
+    mismatches = []
+
+    for factor in scales:
+        helper._DERIVED.clear()
+        df = synthetic_dataset(base, factor, seed)
+        start = time.perf_counter()
+        source = helper.analytics_source(df, engine)
+        print(f"\n🔍 Parity {engine} vs pandas at {factor}x: {len(df):,} rows "
+              f"(engine built in {time.perf_counter() - start:.1f}s)")
+        print(f"{'helper':<55} {'pandas s':>9} {engine + ' s':>9}  result")
+
+        for label, func, args in benchmark_cases(df):
+            if source is df or not hasattr(source, func.__name__) or (only and func.__name__ not in only):
+                continue
+            start = time.perf_counter()
+            expected = func(df, *args)
+            pandas_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            actual = func(source, *args)
+            engine_seconds = time.perf_counter() - start
+            try:
+                if isinstance(expected, pd.DataFrame):
+                    pd.testing.assert_frame_equal(_decoded(expected), _decoded(actual), check_index_type=False,
+                                                  check_column_type=False, check_categorical=False)
+                else:
+                    assert expected == actual, "values differ"
+                status = '✅'
+            except AssertionError as e:
+                status = f"❌ {str(e).splitlines()[0]}"
+                mismatches.append({'case': label, 'scale': factor, 'error': str(e)})
+            print(f"{label[:55]:<55} {pandas_seconds:>9.4f} {engine_seconds:>9.4f}  {status}")
+        del df, source
+    return mismatches
+
+
+def check_keys(scales=(1,), source='synthetic', seed=0):
+    """Check that each surrogate key selects the same rows as drop_duplicates; return the mismatches"""
+    base = _load_quietly()
+    mismatches = []
+    for factor in scales:
+        df = scaled_dataset(base, factor) if source == 'tiled' else synthetic_dataset(base, factor, seed)
+        start = time.perf_counter()
+        bad = [name for name, cols in preprocessor.SURROGATE_KEYS.items() if name in df.columns
+               and not df[cols].drop_duplicates().index.equals(helper._dedup(df, [name]).index)]
+        status = f"❌ {', '.join(bad)}" if bad else '✅'
+        print(f"🔑 {factor}x ({len(df):,} rows): {status} in {time.perf_counter() - start:.2f}s")
+        mismatches += [{'key': name, 'scale': factor} for name in bad]
+    return mismatches
+
+
+# Child process of replica_memory(): load the dataset like app.py does, report, wait to be measured
+_REPLICA = """
+import contextlib, io, sys
+import helper, preprocessor
+with contextlib.redirect_stdout(io.StringIO()):
+    df = preprocessor.preprocess()
+    helper.medal_events(df)
+    helper.medal_cube(df)
+print('ready', len(df), flush=True)
+sys.stdin.read()
+"""
+
+
+def replica_memory(replicas=4):
+    """Start replicas processes loading the dataset, with and without the shared mapping; return memory rows"""
+    _load_quietly()  # build the cache (and column files) once, outside the measured processes
+    here = os.path.dirname(os.path.abspath(__file__))
+    rows = []
+    print(f"\n🧠 Memory of {replicas} replica processes holding the dataset")
+    print(f"{'frame':<14} {'rss MB':>8} {'pss MB':>8} {'private MB':>11} {'shared MB':>10} {'sum pss MB':>11}")
+    for mode, mmap in [('private copy', '0'), ('memory-mapped', '1')]:
+        env = dict(os.environ, OLYMPIC_MMAP=mmap, PYTHONPATH=here)
+        children = [subprocess.Popen([sys.executable, '-c', _REPLICA], cwd=here, env=env, text=True,
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE) for _ in range(replicas)]
+        try:
+            for child in children:
+                child.stdout.readline()
+            # Measured while all replicas are alive, so shared pages are split between them
+            usage = [instrument.process_memory(child.pid) for child in children]
+        finally:
+            for child in children:
+                child.stdin.close()
+                child.wait()
+        if not all(usage):
+            print("⚠️ Per-process memory needs Linux /proc/<pid>/smaps_rollup")
+            return rows
+        mean = {key: statistics.mean(u[key] for u in usage) / 1e6 for key in usage[0]}
+        total_pss = sum(u['pss'] for u in usage) / 1e6
+        print(f"{mode:<14} {mean['rss']:>8.1f} {mean['pss']:>8.1f} {mean['private']:>11.1f} "
+              f"{mean['shared']:>10.1f} {total_pss:>11.1f}")
+        rows.append(dict(mode=mode, replicas=replicas, total_pss_mb=round(total_pss, 1),
+                         **{f"{key}_mb": round(value, 1) for key, value in mean.items()}))
+    return rows
+
+
+def compare(results, baseline, threshold):
+    """Print warm-time ratios against a baseline run; return the regressed records"""
+    previous = {(r['case'], r['scale']): r for r in baseline.get('results', [])}
+    regressions = []
+    print(f"\n📊 Comparison against baseline (regression threshold {threshold:.2f}x)")
+    print(f"{'helper':<55} {'scale':>6} {'base s':>9} {'now s':>9} {'ratio':>7}")
+    for record in results:
+        old = previous.get((record['case'], record['scale']))
+        if old is None:
+            continue
+        ratio = record['warm_seconds'] / old['warm_seconds'] if old['warm_seconds'] > 0 else float('inf')
+        flag = '  ⚠️' if ratio > threshold else ''
+        print(f"{record['case'][:55]:<55} {record['scale']:>6} {old['warm_seconds']:>9.4f} "
+              f"{record['warm_seconds']:>9.4f} {ratio:>6.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append(dict(record, baseline_seconds=old['warm_seconds'], ratio=ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark helper.py analytics across dataset sizes")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help="dataset scale factors relative to the real data (default: 1 10 100)")
+    parser.add_argument('--source', choices=['synthetic', 'tiled'], default='synthetic',
+                        help="how scaled datasets are built: seeded generator or tiled real data (default: synthetic)")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic generator seed (default: 0)")
+    parser.add_argument('--repeat', type=int, default=3, help="warm repetitions per case (default: 3)")
+    parser.add_argument('--only', nargs='+', help="benchmark only these helper function names")
+    parser.add_argument('--out', default='bench', help="directory for JSON results (default: bench)")
+    parser.add_argument('--baseline', help="previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="warm-time ratio counted as a regression (default: 1.2)")
+    parser.add_argument('--fail-on-regression', action='store_true', help="exit 1 if any case regressed")
+    parser.add_argument('--parity', choices=['sqlite', 'duckdb', 'polars'],
+                        help="instead of timing, compare this engine's outputs with pandas (exit 1 on mismatch)")
+    parser.add_argument('--check-keys', action='store_true',
+                        help="instead of timing, check surrogate keys against drop_duplicates (exit 1 on mismatch)")
+    parser.add_argument('--replicas', type=int,
+                        help="instead of timing, report per-process memory of this many dataset-holding replicas")
+    args = parser.parse_args(argv)
+
+    if args.parity:
+        mismatches = parity(args.parity, args.scales, args.only, args.seed)
+        print(f"\n{len(mismatches)} mismatch(es) between {args.parity} and pandas")
+        return 1 if mismatches else 0
+    if args.replicas:
+        replica_memory(args.replicas)
+        return 0
+    if args.check_keys:
+        mismatches = check_keys(args.scales, args.source, args.seed)
+        print(f"\n{len(mismatches)} surrogate key mismatch(es)")
+        return 1 if mismatches else 0
+
+    results = run(args.scales, args.repeat, args.only, args.source, args.seed)
+
+    os.makedirs(args.out, exist_ok=True)
+    out_path = os.path.join(args.out, time.strftime('bench-%Y%m%d-%H%M%S.json'))
+    with open(out_path, 'w') as f:
+        json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                   'pandas': pd.__version__, 'numpy': np.__version__, 'machine': platform.machine(),
+                   'cpus': os.cpu_count(), 'results': results}, f, indent=2)
+    print(f"\n💾 Results written to {out_path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        print(f"{len(regressions)} regression(s) above {args.threshold:.2f}x")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,544 @@
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
 import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.figure_factory as ff
+import athlete_search
+import instrument
+import kde
+import preprocessor
+import polars_engine
+import sqlstore
+
+# Plotting libraries are imported on first figure build, not at app startup
+px = instrument.lazy_module('plotly.express')
+go = instrument.lazy_module('plotly.graph_objects')
+
+MEDAL_EVENT_COLS = ['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal']
+MEDAL_COLS = ['Gold', 'Silver', 'Bronze']
+MEDAL_COLORS = {'Gold': '#FFD700', 'Silver': '#C0C0C0', 'Bronze': '#CD7F32', 'No Medal': '#A9A9A9'}
+
+# height_weight_scatter: SVG up to the WebGL threshold, WebGL up to the point budget, then binned density
+SCATTER_WEBGL_THRESHOLD = 1000
+SCATTER_POINT_BUDGET = 10000
+
+# Default leaderboard depth for most_successful / most_successful2
+LEADERBOARD_K = 15
+
+# Per-edition distinct counts computed by edition_metrics: nations, events, athletes, sports, host cities
+EDITION_METRICS = ['region', 'Event', 'Name', 'Sport', 'City']
+# Above this many (edition, value) cells distinct counts sort pairs instead of filling a seen-matrix
+_SEEN_MATRIX_CELLS = 64 << 20
+
+# Analytics engine: 'pandas' (in-process frame), an embedded SQL store ('sqlite' / 'duckdb') or 'polars'
+BACKEND = os.environ.get('OLYMPIC_BACKEND', 'pandas').lower()
+
+# Background warm-up of per-country / per-sport results (see start_warm_up)
+WARMUP_ON_START = os.environ.get('OLYMPIC_WARMUP', '').lower() in ('1', 'true', 'yes', 'on')
+WARMUP_WORKERS = int(os.environ.get('OLYMPIC_WARMUP_WORKERS', 1))
+# Share of the result cache the warm-up may fill, so it never evicts what users computed
+WARMUP_CACHE_SHARE = 0.75
+
+# pandas >= 3 always copies on write, so frames can share buffers without defensive copies
+_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3
+
+# (dataset_version, name) -> table derived once per dataset
+_DERIVED = {}
+_MAX_DERIVED = 64
+# Guards _DERIVED; each key being built has its own lock in _DERIVED_BUILDS so concurrent
+# callers (sessions, warm-up threads) wait for one build instead of repeating it
+_DERIVED_LOCK = threading.Lock()
+_DERIVED_BUILDS = {}
+
+
+# ----------------- DATASET VERSION & DERIVED TABLES ----------------- #
+def dataset_version(df):
+    """Return a stable version string identifying the dataset in df"""
+    version = preprocessor.tagged_version(df)
+    if version is not None:
+        return version
+
+    # Untagged frame (or a slice, copy or edit that inherited attrs): fall back to a content hash
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(','.join(map(str, df.columns)).encode())
+    return preprocessor.tag_dataset_version(df, digest.hexdigest()[:16]).attrs['dataset_version']
+
+
+def _derived(df, name, builder):
+    """Return builder(df), computed once per dataset version and shared read-only"""
+    key = (dataset_version(df), name)
+    with _DERIVED_LOCK:
+        if key in _DERIVED:
+            return _DERIVED[key]
+        build_lock = _DERIVED_BUILDS.setdefault(key, threading.Lock())
+    # Built outside _DERIVED_LOCK: builders call _derived for the tables they depend on
+    with build_lock:
+        with _DERIVED_LOCK:
+            if key in _DERIVED:
+                return _DERIVED[key]
+        try:
+            return _put_derived(key, builder(df))
+        finally:
+            with _DERIVED_LOCK:
+                _DERIVED_BUILDS.pop(key, None)
+
+
+def _put_derived(key, value):
+    """Store a derived table, evicting the oldest one when the table is full"""
+    with _DERIVED_LOCK:
+        if key not in _DERIVED and len(_DERIVED) >= _MAX_DERIVED:
+            _DERIVED.pop(next(iter(_DERIVED)))
+        _DERIVED[key] = value
+    return value
+
+
+def _dedup(df, cols):
+    """Rows of df where the cols combination first occurs, like df.drop_duplicates(subset=cols)
+
+    Surrogate key columns (preprocessor.SURROGATE_KEYS) may stand in for their source columns;
+    a frame without the key column falls back to computing it from those columns.
+    """
+    expanded = []
+    for col in cols:
+        if col in preprocessor.SURROGATE_KEYS and col not in df.columns:
+            expanded += preprocessor.SURROGATE_KEYS[col]
+        else:
+            expanded.append(col)
+    if len(expanded) == 1:
+        return df[~pd.Series(df[expanded[0]].to_numpy()).duplicated().to_numpy()]
+    # Fresh keys are numbered in order of appearance: a row is new iff it beats every earlier key
+    key = preprocessor.surrogate_key(df, expanded)
+    first = np.ones(len(key), dtype=bool)
+    first[1:] = key[1:] > np.maximum.accumulate(key)[:-1]
+    return df[first]
+
+
+def _build_medal_events(df):
+    """One row per team medal: medal rows deduplicated on the medal-event columns"""
+    key_cols = [col for col in MEDAL_EVENT_COLS if col in df.columns]
+    keep_cols = key_cols + [col for col in ['region'] + MEDAL_COLS if col in df.columns and col not in key_cols]
+    key = ['medal_event_key'] if 'medal_event_key' in df.columns else key_cols
+    medals = df.loc[df['Medal'].notna(), list(dict.fromkeys(keep_cols + key))]
+    events = _dedup(medals, key)[keep_cols]
+    for medal in MEDAL_COLS:
+        if medal not in events.columns:
+            events[medal] = 0
+    return events.reset_index(drop=True)
+
+
+@instrument.timed
+def medal_events(df):
+    """Return the medal-event fact table for df (one row per team medal, built once)"""
+    if df is None or df.empty or 'Medal' not in df.columns:
+        return pd.DataFrame(columns=MEDAL_EVENT_COLS + ['region'] + MEDAL_COLS)
+    return _derived(df, 'medal_events', _build_medal_events)
+
+
+def _participation(df):
+    """Return the distinct (region, Year) pairs present in df, built once"""
+    cols = [col for col in ['region', 'Year'] if col in df.columns]
+    return _derived(df, 'participation', lambda d: _dedup(d[cols], cols).reset_index(drop=True))
+
+
+# ----------------- RESULT MEMOIZATION ----------------- #
+class MemoCache:
+    """Thread-safe LRU cache of helper results bounded by entry count and bytes"""
+
+    def __init__(self, max_entries=256, max_bytes=256 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, value, nbytes):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            self._evict()
+
+    def resize(self, max_entries=None, max_bytes=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        # Caller holds the lock; drop least recently used entries until within bounds
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self._bytes -= evicted_bytes
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def items(self):
+        with self._lock:
+            return [(key, entry[0]) for key, entry in self._entries.items()]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'enabled': self.enabled, 'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'bytes': self._bytes, 'max_bytes': self.max_bytes, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions,
+                    'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+_MEMO = MemoCache(max_entries=int(os.environ.get('OLYMPIC_MEMO_MAX_ENTRIES', 256)),
+                  max_bytes=int(os.environ.get('OLYMPIC_MEMO_MAX_BYTES', 256 << 20)))
+
+
+def configure_memo(max_entries=None, max_bytes=None, enabled=None):
+    """Change the result cache bounds or switch memoization on/off"""
+    _MEMO.resize(max_entries, max_bytes)
+    if enabled is not None:
+        _MEMO.enabled = enabled
+
+
+def memo_stats():
+    """Return hit/miss/eviction counters and current size of the result cache"""
+    return _MEMO.stats()
+
+
+def clear_memo():
+    """Drop every memoized helper result"""
+    _MEMO.clear()
+
+
+def _freeze(value):
+    """Turn list/dict/set arguments into hashable cache-key parts"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(v) for v in value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _is_figure(value):
+    """True for a Plotly figure (checked by duck type so plotly is not imported for it)"""
+    return hasattr(value, 'to_plotly_json') and hasattr(value, 'layout')
+
+
+def _figure_nbytes(fig):
+    """Estimate a figure's size from its trace arrays (serializing it would cost more than the cache saves)"""
+    total = 1 << 10
+    for trace in fig.data:
+        total += 1 << 9
+        for name in ('x', 'y', 'z', 'text', 'customdata'):
+            values = getattr(trace, name, None)
+            if isinstance(values, np.ndarray):
+                total += values.nbytes
+            elif isinstance(values, (list, tuple)):
+                total += 8 * len(values)
+    return total
+
+
+def _result_nbytes(value):
+    """Estimate the memory held by a cached result"""
+    if isinstance(value, pd.DataFrame):
+        # Categorical columns share their categories with the dataset, count only the codes
+        return int(sum(col.cat.codes.nbytes if isinstance(col.dtype, pd.CategoricalDtype)
+                       else col.memory_usage(deep=True, index=False) for _, col in value.items()))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_result_nbytes(v) for v in value)
+    if _is_figure(value):
+        return _figure_nbytes(value)
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1 << 10
+
+
+def _result_copy(value):
+    """Copy small mutable results so callers cannot alter the cached entry"""
+    if isinstance(value, pd.DataFrame):
+        # Under copy-on-write a shallow copy is enough: writes to it copy the touched columns
+        return value.copy(deep=not _COPY_ON_WRITE)
+    if isinstance(value, (list, tuple)):
+        return copy.deepcopy(value)
+    if _is_figure(value):
+        # Callers restyle figures (update_layout), so each gets its own copy
+        return go.Figure(value)
+    return value
+
+
+def memoize(func):
+    """Cache func(df, *args) per dataset version and arguments in the shared LRU cache"""
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        if not _MEMO.enabled or not isinstance(df, pd.DataFrame) or df.empty:
+            return func(df, *args, **kwargs)
+        try:
+            key = (func.__name__, dataset_version(df), _freeze(args), _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            return func(df, *args, **kwargs)
+
+        entry = _MEMO.get(key)
+        if entry is not None:
+            return _result_copy(entry[0])
+        value = func(df, *args, **kwargs)
+        _MEMO.put(key, value, _result_nbytes(value))
+        return _result_copy(value)
+    return wrapper
+
+
+# ----------------- SQL / POLARS BACKENDS ----------------- #
+def analytics_source(df, backend=None):
+    """Return df, a SQL store ('sqlite'/'duckdb') or a Polars frame ('polars') built from it"""
+    backend = (backend or BACKEND).lower()
+    if backend == 'pandas' or df is None or df.empty:
+        return df
+    if backend == 'polars':
+        return _derived(df, "polars_frame", lambda d: polars_engine.PolarsFrame(d, version=dataset_version(d)))
+    return _derived(df, f"sql_store:{backend}",
+                    lambda d: sqlstore.open_store(d, engine=backend, version=dataset_version(d)))
+
+
+def pushdown(func):
+    """Answer func(engine, ...) with the SQLStore/PolarsFrame method of the same name; frames take the pandas path"""
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        if isinstance(df, (sqlstore.SQLStore, polars_engine.PolarsFrame)):
+            return getattr(df, func.__name__)(*args, **kwargs)
+        return func(df, *args, **kwargs)
+    return wrapper
+
+
+# ----------------- MEDAL CUBE ----------------- #
+def _cube_arrays(medals, played):
+    """Region x year medal counts and participation mask from medal events and (region, Year) pairs"""
+    played = played.dropna()
+    # Fixed-width unicode, not object: np.savez would pickle an object array and
+    # load_artifact (allow_pickle=False) could never read the cube back
+    regions = np.sort(played['region'].astype(str).unique()).astype(str)
+    years = np.sort(played['Year'].astype('int64').unique())
+    n_regions, n_years = len(regions), len(years)
+
+    def flat_index(frame):
+        r = pd.Index(regions).get_indexer(frame['region'].to_numpy(dtype=object))
+        y = pd.Index(years).get_indexer(frame['Year'].to_numpy(dtype='float64'))
+        ok = (r >= 0) & (y >= 0)
+        return r[ok] * n_years + y[ok], ok
+
+    flat, ok = flat_index(medals)
+    counts = np.zeros((n_regions, n_years, len(MEDAL_COLS)), dtype=np.int64)
+    for k, medal in enumerate(MEDAL_COLS):
+        weights = medals[medal].to_numpy(dtype='float64')[ok]
+        counts[:, :, k] = np.bincount(flat, weights=weights, minlength=n_regions * n_years).reshape(n_regions, n_years)
+
+    played_flat, _ = flat_index(played)
+    mask = np.zeros(n_regions * n_years, dtype=bool)
+    mask[played_flat] = True
+    return {'counts': counts, 'played': mask.reshape(n_regions, n_years), 'regions': regions, 'years': years}
+
+
+def _finish_cube(arrays):
+    """Add totals and label lookups to stored cube arrays"""
+    cube = dict(arrays)
+    cube['overall'] = cube['counts'].sum(axis=1)
+    cube['labels'] = cube['regions'].astype(object)
+    cube['region_index'] = {region: i for i, region in enumerate(cube['regions'].tolist())}
+    cube['year_index'] = {year: j for j, year in enumerate(cube['years'].tolist())}
+    return cube
+
+
+def _build_medal_cube(df):
+    """Dense region x year x medal counts plus a region x year participation mask"""
+    arrays = preprocessor.load_artifact(df, 'medal_cube')
+    if arrays is None:
+        arrays = _cube_arrays(medal_events(df), _participation(df))
+        preprocessor.save_artifact(df, 'medal_cube', arrays)
+    return _finish_cube(arrays)
+
+
+@instrument.timed
+def medal_cube(df):
+    """Return the region x year x medal cube for df (built once, persisted with the cache)"""
+    if df is None or df.empty or not {'region', 'Year', 'Medal'}.issubset(df.columns):
+        return None
+    return _derived(df, 'medal_cube', _build_medal_cube)
+
+
+def _cube_frame(key, labels, counts, order):
+    """Build a tally frame from label and (n, 3) count arrays in the given row order"""
+    counts = counts[order]
+    return pd.DataFrame({key: labels[order], 'Gold': counts[:, 0], 'Silver': counts[:, 1],
+                         'Bronze': counts[:, 2], 'total': counts.sum(axis=1)}, copy=False)
+
+
+def _cube_tally(cube, year, country):
+    """Answer a fetch_medal_tally selection by slicing the medal cube"""
+    empty = pd.DataFrame(columns=['region', 'Gold', 'Silver', 'Bronze', 'total'])
+    j = None
+    if year != 'Overall':
+        try:
+            j = cube['year_index'].get(int(year), -1)
+        except (TypeError, ValueError):
+            pass
+
+    if country != 'Overall':
+        i = cube['region_index'].get(country)
+        if j is None:
+            if i is None:
+                return pd.DataFrame(columns=['Year', 'Gold', 'Silver', 'Bronze', 'total'])
+            order = np.flatnonzero(cube['played'][i])
+            return _cube_frame('Year', cube['years'], cube['counts'][i], order)
+        if i is None or j < 0 or not cube['played'][i, j]:
+            return empty
+        return _cube_frame('region', cube['labels'], cube['counts'][:, j], np.array([i]))
+
+    if j is None:
+        counts, mask = cube['overall'], cube['played'].any(axis=1)
+    elif j < 0:
+        return empty
+    else:
+        counts, mask = cube['counts'][:, j], cube['played'][:, j]
+    rows = np.flatnonzero(mask)
+    order = rows[np.argsort(-counts[rows, 0], kind='stable')]
+    return _cube_frame('region', cube['labels'], counts, order)
+
+
+# ----------------- SHARED UTILITIES ----------------- #
+def _tally_by(medals, played, key):
+    """Sum medal flags per key, keeping medal-less participants (key values in played) as zeros"""
+    x = medals.groupby(key, observed=True)[MEDAL_COLS].sum()
+    present = played[key].dropna().unique()
+    x = x.reindex(x.index.append(pd.Index(present)).unique(), fill_value=0)
+    x.index.name = key
+    return x.sort_values('Gold', ascending=False).reset_index()
+
+
+def _density_figure(hist_data, group_labels, colors):
+    """Line figure of per-group age densities from one batched KDE pass"""
+    grid, densities, bounds = kde.gaussian_kde_grid(hist_data)
+    fig = go.Figure()
+    for index, label in enumerate(group_labels):
+        # Like create_distplot, draw each curve only over its own data range
+        inside = (grid >= bounds[index, 0]) & (grid <= bounds[index, 1])
+        fig.add_trace(go.Scatter(x=grid[inside], y=densities[index, inside].astype('float32'),
+                                 mode='lines', name=label, legendgroup=label,
+                                 line=dict(color=colors[index % len(colors)])))
+    return fig
+
+
+# ----------------- LEADERBOARD INDEX ----------------- #
+def _ranked_scopes(group, n_groups, athlete, n_athletes, gold, rows):
+    """Rank athletes within each group by (wins desc, golds desc, first row asc) in one grouped pass"""
+    ok = group >= 0
+    flat = group[ok].astype(np.int64) * n_athletes + athlete[ok]
+    keys, first, inverse = np.unique(flat, return_index=True, return_inverse=True)
+    wins = np.bincount(inverse, minlength=len(keys))
+    golds = np.bincount(inverse, weights=gold[ok], minlength=len(keys)).astype(np.int64)
+    first_row = rows[ok][first]  # rows ascend, so the first occurrence is the first-seen row
+    groups = keys // n_athletes
+    order = np.lexsort((first_row, -golds, -wins, groups))
+    offsets = np.searchsorted(groups[order], np.arange(n_groups + 1))
+    return {'offsets': offsets, 'wins': wins[order], 'gold': golds[order], 'row': first_row[order]}
+
+
+def _build_leaderboards(df):
+    """Per-athlete medal-row rankings overall, per Sport and per region, keyed by athlete ID"""
+    medal_rows = np.flatnonzero((df['Medal'].notna() & df['Name'].notna()).to_numpy())
+    key = 'ID' if 'ID' in df.columns else 'Name'
+    athlete, athletes = pd.factorize(df[key].to_numpy()[medal_rows])
+    if 'Gold' in df.columns:
+        gold = df['Gold'].to_numpy(dtype='float64')[medal_rows]
+    else:
+        gold = (df['Medal'].to_numpy(dtype=object)[medal_rows] == 'Gold').astype('float64')
+
+    boards = {'Overall': _ranked_scopes(np.zeros(len(medal_rows), dtype=np.int64), 1, athlete,
+                                        len(athletes), gold, medal_rows)}
+    for col in ('Sport', 'region'):
+        if col in df.columns:
+            codes, labels = pd.factorize(df[col].to_numpy()[medal_rows])
+            board = _ranked_scopes(codes, len(labels), athlete, len(athletes), gold, medal_rows)
+            board['index'] = {label: i for i, label in enumerate(labels.tolist())}
+            boards[col] = board
+
+    # Athlete info of each entry's first-seen row, so lookups never touch the frame
+    info = {col: df[col].to_numpy() for col in ('ID', 'Name', 'Sport', 'region') if col in df.columns}
+    for board in boards.values():
+        board['info'] = {col: values[board['row']] for col, values in info.items()}
+    return boards
+
+
+@instrument.timed
+def leaderboards(df):
+    """Return the precomputed leaderboard index for df (built once per dataset version)"""
+    if df is None or df.empty or not {'Medal', 'Name'}.issubset(df.columns):
+        return None
+    return _derived(df, 'leaderboards', _build_leaderboards)
+
+
+def _leaderboard(df, col, value, info_cols, k):
+    """Top k athletes for value of col ('Overall' for all) as a frame; O(k) once the index exists"""
+    columns = ['ID', 'Name', 'Total Wins', 'Gold'] + info_cols
+    boards = leaderboards(df)
+    if boards is None:
+        return pd.DataFrame(columns=columns)
+    if value == 'Overall' or col not in boards:
+        board, start, stop = boards['Overall'], 0, boards['Overall']['offsets'][1]
+    else:
+        board = boards[col]
+        group = board['index'].get(value)
+        if group is None:
+            return pd.DataFrame(columns=columns)
+        start, stop = board['offsets'][group], board['offsets'][group + 1]
+    stop = min(stop, start + (LEADERBOARD_K if k is None else k))
+    if stop <= start:
+        return pd.DataFrame(columns=columns)
+
+    # Labels stay plain objects (like the SQL/Polars engines) instead of inferring the str dtype
+    info = board['info']
+
+    def label(col):
+        return pd.Series(info[col][start:stop], dtype=object if col != 'ID' else None, copy=False)
+
+    out = {col: label(col) for col in ('ID', 'Name') if col in info}
+    out['Total Wins'] = board['wins'][start:stop].astype(np.int64)
+    out['Gold'] = board['gold'][start:stop]
+    out.update({col: label(col) for col in info_cols if col in info})
+    return pd.DataFrame(out)
 
 
 # ----------------- MEDAL TALLY ----------------- #
+@instrument.timed
+@memoize
 def medal_tally(df):
     """Return medal tally with safe error handling"""
     if df is None or df.empty:
@@ -17,21 +551,11 @@ def medal_tally(df):
         return pd.DataFrame(columns=['region', 'Gold', 'Silver', 'Bronze', 'total'])
 
     try:
-        temp_df = df.drop_duplicates(
-            subset=['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal']
-        )
-
-        # Ensure medal columns exist
-        for medal in ['Gold', 'Silver', 'Bronze']:
-            if medal not in temp_df.columns:
-                temp_df[medal] = 0
-
-        medal_df = (
-            temp_df.groupby('region')[['Gold', 'Silver', 'Bronze']]
-            .sum()
-            .sort_values('Gold', ascending=False)
-            .reset_index()
-        )
+        cube = medal_cube(df)
+        if cube is not None:
+            return _cube_tally(cube, 'Overall', 'Overall')
+
+        medal_df = _tally_by(medal_events(df), _participation(df), 'region')
         medal_df['total'] = medal_df['Gold'] + medal_df['Silver'] + medal_df['Bronze']
         return medal_df
     except Exception as e:
@@ -40,6 +564,9 @@ def medal_tally(df):
 
 
 # ----------------- COUNTRY & YEAR LIST ----------------- #
+@instrument.timed
+@pushdown
+@memoize
 def country_year_list(df):
     """Return years and countries lists with safe fallbacks"""
     # Default values (website won't crash)
@@ -74,6 +601,9 @@ def country_year_list(df):
 
 
 # ----------------- FETCH MEDAL TALLY ----------------- #
+@instrument.timed
+@pushdown
+@memoize
 def fetch_medal_tally(df, year, country):
     """Fetch medal tally with safe error handling"""
     # Return empty DataFrame if input is invalid
@@ -81,48 +611,32 @@ def fetch_medal_tally(df, year, country):
         return pd.DataFrame(columns=['region', 'Gold', 'Silver', 'Bronze', 'total'])
 
     try:
-        # Create a copy to avoid modifying original
-        temp_df = df.copy()
+        # O(1) answer from the precomputed region x year x medal cube
+        cube = medal_cube(df)
+        if cube is not None:
+            return _cube_tally(cube, year, country)
 
-        # Remove duplicates if columns exist
-        duplicate_cols = ['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal']
-        existing_cols = [col for col in duplicate_cols if col in temp_df.columns]
-        if existing_cols:
-            temp_df = temp_df.drop_duplicates(subset=existing_cols)
+        medals = medal_events(df)
+        played = _participation(df)
 
         # Filter by year
-        if year != 'Overall' and 'Year' in temp_df.columns:
+        if year != 'Overall' and 'Year' in medals.columns:
             try:
-                temp_df = temp_df[temp_df['Year'] == int(year)]
+                medals = medals[medals['Year'] == int(year)]
+                played = played[played['Year'] == int(year)]
             except:
                 pass
 
         # Filter by country
-        if country != 'Overall' and 'region' in temp_df.columns:
-            temp_df = temp_df[temp_df['region'] == country]
-
-        # Ensure medal columns exist
-        for medal in ['Gold', 'Silver', 'Bronze']:
-            if medal not in temp_df.columns:
-                temp_df[medal] = 0
+        if country != 'Overall' and 'region' in medals.columns:
+            medals = medals[medals['region'] == country]
+            played = played[played['region'] == country]
 
         # Group based on selection
-        if year == 'Overall' and country != 'Overall' and 'Year' in temp_df.columns and 'region' in temp_df.columns:
-            x = (
-                temp_df.groupby(['region', 'Year'])[['Gold', 'Silver', 'Bronze']]
-                .sum()
-                .sort_values(['Year', 'Gold'], ascending=[True, False])
-                .reset_index()
-            )
-            if 'region' in x.columns:
-                x = x.drop(columns=['region'])
-        elif 'region' in temp_df.columns:
-            x = (
-                temp_df.groupby('region')[['Gold', 'Silver', 'Bronze']]
-                .sum()
-                .sort_values('Gold', ascending=False)
-                .reset_index()
-            )
+        if year == 'Overall' and country != 'Overall' and 'Year' in medals.columns and 'region' in medals.columns:
+            x = _tally_by(medals, played, 'Year').sort_values('Year').reset_index(drop=True)
+        elif 'region' in medals.columns:
+            x = _tally_by(medals, played, 'region')
         else:
             x = pd.DataFrame(columns=['region', 'Gold', 'Silver', 'Bronze'])
 
@@ -138,27 +652,90 @@ def fetch_medal_tally(df, year, country):
         return pd.DataFrame(columns=['region', 'Gold', 'Silver', 'Bronze', 'total'])
 
 
+# ----------------- EDITION METRICS ----------------- #
+def _codes(values):
+    """Integer codes (-1 for missing) and labels of a column, labels in category/sorted order"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    array = values.to_numpy()
+    if array.dtype.kind in 'iu' and len(array):
+        # Small integer ranges (years): dense lookup table instead of hashing
+        low, high = int(array.min()), int(array.max())
+        if high - low <= 1 << 16:
+            present = np.bincount(array - low, minlength=high - low + 1) > 0
+            lookup = np.cumsum(present) - 1
+            return lookup[array - low], (np.flatnonzero(present) + low).astype(array.dtype)
+    return pd.factorize(array, sort=True)
+
+
+def _distinct_per_group(groups, n_groups, codes, n_codes):
+    """Number of distinct non-missing codes within each group"""
+    ok = (groups >= 0) & (codes >= 0)
+    groups, codes = groups[ok].astype(np.int64), codes[ok].astype(np.int64)
+    if n_groups * n_codes <= _SEEN_MATRIX_CELLS:
+        seen = np.zeros(n_groups * n_codes, dtype=bool)
+        seen[groups * n_codes + codes] = True
+        return seen.reshape(n_groups, n_codes).sum(axis=1)
+    pairs = np.unique(groups * n_codes + codes)
+    return np.bincount(pairs // n_codes, minlength=n_groups)
+
+
+@instrument.timed
+@pushdown
+@memoize
+def edition_metrics(df, metrics=None, by_season=False):
+    """Distinct counts per edition for several columns at once: Edition[, Season], one column per metric"""
+    metrics = list(EDITION_METRICS if metrics is None else metrics)
+    keys = ['Edition'] + (['Season'] if by_season else [])
+    if df is None or df.empty or 'Year' not in df.columns or (by_season and 'Season' not in df.columns):
+        return pd.DataFrame(columns=keys + metrics)
+
+    try:
+        metrics = [col for col in metrics if col in df.columns]
+        # Edition (and Season) codes once; every metric is then one scatter over its value codes
+        years = df['Year']
+        year_codes, year_labels = _codes(years)
+        groups, n_seasons = year_codes.astype(np.int64), 1
+        if by_season:
+            season_codes, season_labels = _codes(df['Season'])
+            n_seasons = len(season_labels)
+            groups = np.where((year_codes >= 0) & (season_codes >= 0), groups * n_seasons + season_codes, -1)
+        n_groups = len(year_labels) * n_seasons
+        present = np.flatnonzero(np.bincount(groups[groups >= 0], minlength=n_groups))
+
+        out = {'Edition': pd.Series(np.asarray(year_labels)[present // n_seasons], dtype=years.dtype)}
+        if by_season:
+            out['Season'] = pd.Series(np.asarray(season_labels, dtype=object)[present % n_seasons], dtype=object)
+        for col in metrics:
+            codes, labels = _codes(df[col])
+            counts = _distinct_per_group(groups, n_groups, codes, len(labels))
+            out[col] = counts[present].astype(np.int64)
+        return pd.DataFrame(out)
+    except Exception as e:
+        print(f"Error in edition_metrics: {e}")
+        return pd.DataFrame(columns=keys + metrics)
+
+
 # ----------------- DATA OVER TIME ----------------- #
+@instrument.timed
+@pushdown
+@memoize
 def data_over_time(df, col):
     """Return data over time with safe error handling"""
     if df is None or df.empty or col not in df.columns or 'Year' not in df.columns:
         return pd.DataFrame(columns=['Edition', col])
 
     try:
-        if col == "region":
-            temp_df = df.drop_duplicates(['Year', 'region'])
-        else:
-            temp_df = df.drop_duplicates(['Year', col])
-
-        x = temp_df.groupby('Year')[col].nunique().reset_index()
-        x.rename(columns={'Year': 'Edition', col: col}, inplace=True)
-        return x
+        return edition_metrics(df, [col])
     except Exception as e:
         print(f"Error in data_over_time: {e}")
         return pd.DataFrame(columns=['Edition', col])
 
 
 # ----------------- EVENTS PER SPORT OVER TIME ----------------- #
+@instrument.timed
+@pushdown
+@memoize
 def events_per_sport_over_time(df):
     """Return pivot table of events per sport over time with safe handling"""
     if df is None or df.empty:
@@ -169,12 +746,13 @@ def events_per_sport_over_time(df):
         return pd.DataFrame()
 
     try:
-        temp_df = df.drop_duplicates(subset=['Year', 'Sport', 'Event'])
+        temp_df = _dedup(df, ['Year', 'Sport', 'Event'])
         pivot_df = temp_df.pivot_table(
             index='Sport',
             columns='Year',
             values='Event',
-            aggfunc='count'
+            aggfunc='count',
+            observed=True
         ).fillna(0).astype(int)
         return pivot_df
     except Exception as e:
@@ -183,60 +761,36 @@ def events_per_sport_over_time(df):
 
 
 # ----------------- MOST SUCCESSFUL ATHLETES ----------------- #
-def most_successful(df, sport):
-    """Return most successful athletes with safe handling"""
+@instrument.timed
+@pushdown
+@memoize
+def most_successful(df, sport, k=None):
+    """Return the top k athletes (by medals, then golds) overall or in one sport"""
     if df is None or df.empty:
-        return pd.DataFrame(columns=['Name', 'Total Wins', 'Sport', 'region'])
+        return pd.DataFrame(columns=['ID', 'Name', 'Total Wins', 'Gold', 'Sport', 'region'])
 
     try:
-        temp_df = df.dropna(subset=['Medal']).copy()
-        if temp_df.empty:
-            return pd.DataFrame(columns=['Name', 'Total Wins', 'Sport', 'region'])
-
-        if sport != 'Overall' and 'Sport' in temp_df.columns:
-            temp_df = temp_df[temp_df['Sport'] == sport]
-
-        if temp_df.empty or 'Name' not in temp_df.columns:
-            return pd.DataFrame(columns=['Name', 'Total Wins', 'Sport', 'region'])
-
-        athlete_medals = temp_df['Name'].value_counts().reset_index()
-        athlete_medals.columns = ['Name', 'Total Wins']
-        top_15 = athlete_medals.head(15)
-
-        # Add athlete info if columns exist
-        info_cols = ['Name']
-        if 'Sport' in temp_df.columns:
-            info_cols.append('Sport')
-        if 'region' in temp_df.columns:
-            info_cols.append('region')
-
-        athlete_info = temp_df[info_cols].drop_duplicates(subset=['Name'])
-        final_output = pd.merge(top_15, athlete_info, on='Name', how='left')
-
-        return final_output.sort_values(by='Total Wins', ascending=False).reset_index(drop=True)
+        return _leaderboard(df, 'Sport', sport, ['Sport', 'region'], k)
     except Exception as e:
         print(f"Error in most_successful: {e}")
-        return pd.DataFrame(columns=['Name', 'Total Wins', 'Sport', 'region'])
+        return pd.DataFrame(columns=['ID', 'Name', 'Total Wins', 'Gold', 'Sport', 'region'])
 
 
 # ----------------- COUNTRY YEARWISE MEDAL TALLY ----------------- #
+@instrument.timed
+@pushdown
+@memoize
 def yearwise_medal_tally(df, country):
     """Return year-wise medal tally for a country with safe handling"""
     if df is None or df.empty or 'region' not in df.columns or 'Year' not in df.columns:
         return pd.DataFrame(columns=['Year', 'Medal'])
 
     try:
-        temp_df = df.dropna(subset=['Medal']).copy()
-        if temp_df.empty:
+        medals = medal_events(df)
+        if medals.empty:
             return pd.DataFrame(columns=['Year', 'Medal'])
 
-        # Remove duplicates
-        duplicate_cols = ['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal']
-        existing_cols = [col for col in duplicate_cols if col in temp_df.columns]
-        if existing_cols:
-            temp_df.drop_duplicates(subset=existing_cols, inplace=True)
-
-        country_df = temp_df[temp_df['region'] == country]
+        country_df = medals[medals['region'] == country]
         if country_df.empty:
             return pd.DataFrame(columns=['Year', 'Medal'])
 
@@ -248,23 +802,20 @@ def yearwise_medal_tally(df, country):
 
 
 # ----------------- COUNTRY SPORT HEATMAP ----------------- #
+@instrument.timed
+@pushdown
+@memoize
 def country_sport_heatmap(df, country):
     """Return heatmap data for country's performance with safe handling"""
     if df is None or df.empty or 'region' not in df.columns:
         return pd.DataFrame()
 
     try:
-        temp_df = df.dropna(subset=['Medal']).copy()
-        if temp_df.empty:
+        medals = medal_events(df)
+        if medals.empty:
             return pd.DataFrame()
 
-        # Remove duplicates
-        duplicate_cols = ['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal']
-        existing_cols = [col for col in duplicate_cols if col in temp_df.columns]
-        if existing_cols:
-            temp_df.drop_duplicates(subset=existing_cols, inplace=True)
-
-        country_df = temp_df[temp_df['region'] == country]
+        country_df = medals[medals['region'] == country]
         if country_df.empty or 'Sport' not in country_df.columns or 'Year' not in country_df.columns:
             return pd.DataFrame()
 
@@ -272,7 +823,8 @@ def country_sport_heatmap(df, country):
             index='Sport',
             columns='Year',
             values='Medal',
-            aggfunc='count'
+            aggfunc='count',
+            observed=True
         ).fillna(0).astype(int)
         return pivot_df
     except Exception as e:
@@ -281,40 +833,24 @@ def country_sport_heatmap(df, country):
 
 
 # ----------------- MOST SUCCESSFUL ATHLETES BY COUNTRY ----------------- #
-def most_successful2(df, country):
-    """Return most successful athletes by country with safe handling"""
+@instrument.timed
+@pushdown
+@memoize
+def most_successful2(df, country, k=None):
+    """Return the top k athletes (by medals, then golds) overall or for one country"""
     if df is None or df.empty:
-        return pd.DataFrame(columns=['Name', 'Total Wins', 'Sport'])
+        return pd.DataFrame(columns=['ID', 'Name', 'Total Wins', 'Gold', 'Sport'])
 
     try:
-        temp_df = df.dropna(subset=['Medal']).copy()
-        if temp_df.empty:
-            return pd.DataFrame(columns=['Name', 'Total Wins', 'Sport'])
-
-        if country != 'Overall' and 'region' in temp_df.columns:
-            temp_df = temp_df[temp_df['region'] == country]
-
-        if temp_df.empty or 'Name' not in temp_df.columns:
-            return pd.DataFrame(columns=['Name', 'Total Wins', 'Sport'])
-
-        athlete_medals = temp_df['Name'].value_counts().reset_index()
-        athlete_medals.columns = ['Name', 'Total Wins']
-        top_15 = athlete_medals.head(15)
-
-        # Add sport info if available
-        if 'Sport' in temp_df.columns:
-            athlete_info = temp_df[['Name', 'Sport']].drop_duplicates(subset=['Name'])
-            final_output = pd.merge(top_15, athlete_info, on='Name', how='left')
-        else:
-            final_output = top_15
-
-        return final_output.sort_values(by='Total Wins', ascending=False).reset_index(drop=True)
+        return _leaderboard(df, 'region', country, ['Sport'], k)
     except Exception as e:
         print(f"Error in most_successful2: {e}")
-        return pd.DataFrame(columns=['Name', 'Total Wins', 'Sport'])
+        return pd.DataFrame(columns=['ID', 'Name', 'Total Wins', 'Gold', 'Sport'])
 
 
 # ----------------- AGE DISTRIBUTION ----------------- #
+@instrument.timed
+@memoize
 def age_distribution(df):
     """Return age distribution plot with safe handling"""
     if df is None or df.empty or 'Age' not in df.columns or 'Medal' not in df.columns:
@@ -324,18 +860,18 @@ def age_distribution(df):
         return fig
 
     try:
-        athlete_df = df.drop_duplicates(subset=['Name', 'region'])
+        athlete_df = _dedup(df, ['athlete_key'])
 
-        x_all = athlete_df['Age'].dropna()
-        x_gold = athlete_df[athlete_df['Medal'] == 'Gold']['Age'].dropna()
-        x_silver = athlete_df[athlete_df['Medal'] == 'Silver']['Age'].dropna()
-        x_bronze = athlete_df[athlete_df['Medal'] == 'Bronze']['Age'].dropna()
+        x_all = athlete_df['Age'].dropna().astype(float)
+        x_gold = athlete_df[athlete_df['Medal'] == 'Gold']['Age'].dropna().astype(float)
+        x_silver = athlete_df[athlete_df['Medal'] == 'Silver']['Age'].dropna().astype(float)
+        x_bronze = athlete_df[athlete_df['Medal'] == 'Bronze']['Age'].dropna().astype(float)
 
         hist_data = [x_all, x_gold, x_silver, x_bronze]
         group_labels = ['All Athletes', 'Gold', 'Silver', 'Bronze']
         colors = ['#B0C4DE', '#FFD580', '#C1E1C1', '#FFB6C1']
 
-        fig = ff.create_distplot(hist_data, group_labels, bin_size=2, show_hist=False, show_rug=False, colors=colors)
+        fig = _density_figure(hist_data, group_labels, colors)
         fig.update_layout(title_text='Age Distribution of Olympic Medalists vs All Athletes',
                           template='plotly_white', xaxis_title='Age', yaxis_title='Density',
                           legend_title='Category', font=dict(size=12))
@@ -348,6 +884,8 @@ def age_distribution(df):
 
 
 # ----------------- GOLD AGE DISTRIBUTION BY SPORT ----------------- #
+@instrument.timed
+@memoize
 def gold_age_distribution_by_sport(df, famous_sports):
     """Return gold medalist age distribution by sport with safe handling"""
     if df is None or df.empty or not famous_sports:
@@ -356,14 +894,17 @@ def gold_age_distribution_by_sport(df, famous_sports):
         return fig
 
     try:
-        athlete_df = df.drop_duplicates(subset=['Name', 'region', 'Sport', 'Age', 'Medal'])
+        athlete_df = _dedup(df, ['athlete_key', 'Sport', 'Age', 'Medal'])
         hist_data = []
         group_labels = []
 
+        # Split gold medallist ages by sport in one grouped pass
+        gold_df = athlete_df[(athlete_df['Medal'] == 'Gold') & athlete_df['Sport'].isin(famous_sports)]
+        ages_by_sport = {sport: ages.dropna().astype(float)
+                         for sport, ages in gold_df.groupby('Sport', observed=True)['Age']}
         for sport in famous_sports:
-            temp_df = athlete_df[athlete_df['Sport'] == sport]
-            gold_ages = temp_df[temp_df['Medal'] == 'Gold']['Age'].dropna()
-            if not gold_ages.empty:
+            gold_ages = ages_by_sport.get(sport)
+            if gold_ages is not None and not gold_ages.empty:
                 hist_data.append(gold_ages)
                 group_labels.append(sport)
 
@@ -373,8 +914,7 @@ def gold_age_distribution_by_sport(df, famous_sports):
             return fig
 
         colors = ['#FFD580', '#C1E1C1', '#FFB6C1', '#B0C4DE', '#A0E7E5', '#FFE0AC', '#D7BAFF', '#FFC2E2']
-        fig = ff.create_distplot(hist_data, group_labels, show_hist=False, show_rug=False,
-                                 colors=colors[:len(group_labels)])
+        fig = _density_figure(hist_data, group_labels, colors)
         fig.update_layout(title_text='Age Distribution of Gold Medalists by Sport',
                           template='plotly_white', xaxis_title='Age', yaxis_title='Density',
                           legend_title='Sport', font=dict(size=12))
@@ -387,29 +927,40 @@ def gold_age_distribution_by_sport(df, famous_sports):
 
 
 # ----------------- HEIGHT VS WEIGHT SCATTER ----------------- #
-def height_weight_scatter(df, sport):
-    """Return height vs weight scatter plot with safe handling"""
+@instrument.timed
+@memoize
+def height_weight_scatter(df, sport, webgl_threshold=SCATTER_WEBGL_THRESHOLD, point_budget=SCATTER_POINT_BUDGET):
+    """Return height vs weight scatter plot with safe handling
+
+    Up to webgl_threshold points render as SVG, up to point_budget as WebGL,
+    and beyond that the points are binned server-side into a density plot.
+    """
     if df is None or df.empty or not sport:
         fig = px.scatter(title="No data available")
         fig.update_layout(showlegend=False)
         return fig
 
     try:
-        athlete_df = df.drop_duplicates(subset=['Name', 'region', 'Sport', 'Height', 'Weight', 'Medal']).copy()
-        athlete_df['Medal'] = athlete_df['Medal'].fillna('No Medal')
-
-        temp_df = athlete_df[athlete_df['Sport'] == sport]
+        sport_df = df[df['Sport'] == sport]
+        temp_df = _dedup(sport_df, ['athlete_key', 'Sport', 'Height', 'Weight', 'Medal'])
+        # object dtype so 'No Medal' can be filled into a categorical Medal column
+        temp_df['Medal'] = temp_df['Medal'].astype(object).fillna('No Medal')
         if temp_df.empty:
             fig = px.scatter(title=f"No height/weight data available for {sport}")
             fig.update_layout(showlegend=False)
             return fig
 
-        fig = px.scatter(temp_df, x='Weight', y='Height', color='Medal',
-                         hover_data=['Name', 'region'],
-                         color_discrete_map={'Gold': '#FFD700', 'Silver': '#C0C0C0', 'Bronze': '#CD7F32',
-                                             'No Medal': '#A9A9A9'},
-                         title=f"Height vs Weight of Athletes in {sport}",
-                         template='plotly_white', width=800, height=600)
+        n_points = int((temp_df['Height'].notna() & temp_df['Weight'].notna()).sum())
+        if n_points > point_budget:
+            fig = _binned_density_scatter(temp_df, f"Height vs Weight of Athletes in {sport} "
+                                                   f"(density of {n_points:,} athletes)")
+        else:
+            fig = px.scatter(temp_df, x='Weight', y='Height', color='Medal',
+                             hover_data=['Name', 'region'],
+                             color_discrete_map=MEDAL_COLORS,
+                             render_mode='webgl' if n_points > webgl_threshold else 'svg',
+                             title=f"Height vs Weight of Athletes in {sport}",
+                             template='plotly_white', width=800, height=600)
         fig.update_layout(xaxis_title='Weight (kg)', yaxis_title='Height (cm)', legend_title='Medal Type')
         return fig
     except Exception as e:
@@ -419,7 +970,40 @@ def height_weight_scatter(df, sport):
         return fig
 
 
+def _binned_density_scatter(athlete_df, title, bin_size=(2.0, 2.0)):
+    """Bin weight/height per medal class on a shared grid and draw occupied bins sized by count"""
+    points = athlete_df.dropna(subset=['Weight', 'Height'])
+    weight = points['Weight'].to_numpy(dtype='float64')
+    height = points['Height'].to_numpy(dtype='float64')
+    w_edges = np.arange(np.floor(weight.min()), weight.max() + bin_size[0], bin_size[0])
+    h_edges = np.arange(np.floor(height.min()), height.max() + bin_size[1], bin_size[1])
+    w_centers = (w_edges[:-1] + w_edges[1:]) / 2
+    h_centers = (h_edges[:-1] + h_edges[1:]) / 2
+
+    medals = points['Medal'].to_numpy(dtype=object)
+    grids = {}
+    for medal in ['No Medal', 'Bronze', 'Silver', 'Gold']:
+        mask = medals == medal
+        if mask.any():
+            grids[medal], _, _ = np.histogram2d(weight[mask], height[mask], bins=[w_edges, h_edges])
+    peak = max(grid.max() for grid in grids.values())
+
+    fig = go.Figure()
+    for medal, grid in grids.items():
+        wi, hi = np.nonzero(grid)
+        counts = grid[wi, hi].astype(int)
+        fig.add_trace(go.Scattergl(
+            x=w_centers[wi], y=h_centers[hi], mode='markers', name=medal,
+            marker=dict(color=MEDAL_COLORS[medal], size=4 + 16 * np.sqrt(counts / peak), opacity=0.7),
+            customdata=counts, hovertemplate=f"{medal}<br>Weight %{{x}} kg<br>Height %{{y}} cm"
+                                             f"<br>Athletes %{{customdata}}<extra></extra>"))
+    fig.update_layout(title=title, template='plotly_white', width=800, height=600)
+    return fig
+
+
 # ----------------- MALE VS FEMALE PARTICIPATION ----------------- #
+@instrument.timed
+@memoize
 def male_vs_female_participation(df):
     """Return male vs female participation plot with safe handling"""
     if df is None or df.empty or 'Sex' not in df.columns or 'Year' not in df.columns:
@@ -428,7 +1012,7 @@ def male_vs_female_participation(df):
         return fig
 
     try:
-        athlete_df = df.drop_duplicates(subset=['Name', 'Year'])
+        athlete_df = _dedup(df, ['athlete_edition_key'])
 
         men = athlete_df[athlete_df['Sex'] == 'M'].groupby('Year').count()['Name'].reset_index()
         women = athlete_df[athlete_df['Sex'] == 'F'].groupby('Year').count()['Name'].reset_index()
@@ -452,6 +1036,8 @@ def male_vs_female_participation(df):
 
 
 # ----------------- MALE VS FEMALE PARTICIPATION BY SPORT ----------------- #
+@instrument.timed
+@memoize
 def male_vs_female_participation_sport(df, sport):
     """Return male vs female participation by sport with safe handling"""
     if df is None or df.empty or not sport:
@@ -460,7 +1046,7 @@ def male_vs_female_participation_sport(df, sport):
         return fig
 
     try:
-        athlete_df = df[df['Sport'] == sport].drop_duplicates(subset=['Name', 'Year'])
+        athlete_df = _dedup(df[df['Sport'] == sport], ['athlete_edition_key'])
         if athlete_df.empty:
             fig = px.line(title=f"No participation data available for {sport}")
             fig.update_layout(showlegend=False)
@@ -484,4 +1070,380 @@ def male_vs_female_participation_sport(df, sport):
         print(f"Error in male_vs_female_participation_sport: {e}")
         fig = px.line(title=f"Error loading participation data for {sport}")
         fig.update_layout(showlegend=False)
-        return fig
\ No newline at end of file
+        return fig
+
+
+# ----------------- ATHLETE SEARCH ----------------- #
+def _build_athlete_index(df):
+    """Load the athlete search index persisted for df's version, else build and persist it"""
+    arrays = preprocessor.load_artifact(df, 'athlete_index')
+    index = athlete_search.AthleteIndex.from_arrays(arrays) if arrays is not None else None
+    if index is None:
+        index = athlete_search.AthleteIndex.build(df)
+        preprocessor.save_artifact(df, 'athlete_index', index.to_arrays())
+    return index
+
+
+@instrument.timed
+def athlete_index(df):
+    """Return the prefix/n-gram athlete search index for df (built once, persisted with the cache)"""
+    if df is None or df.empty or 'Name' not in df.columns:
+        return None
+    return _derived(df, 'athlete_index', _build_athlete_index)
+
+
+@instrument.timed
+def search_athletes(df, query, limit=10):
+    """Return up to limit athletes matching query (prefix first, then typo-tolerant) with medal counts"""
+    index = athlete_index(df)
+    if index is None or not query:
+        return pd.DataFrame(columns=athlete_search.RESULT_COLS)
+    try:
+        return index.search(query, limit)
+    except Exception as e:
+        print(f"Error in search_athletes: {e}")
+        return pd.DataFrame(columns=athlete_search.RESULT_COLS)
+
+
+# ----------------- BACKGROUND WARM-UP ----------------- #
+# dataset_version -> WarmUp (one per dataset, shared by every session)
+_WARM_UPS = {}
+_WARM_UPS_LOCK = threading.Lock()
+
+
+def warm_up_tasks(df):
+    """(helper, args) pairs behind the Country-wise page and sport leaderboards, most popular first"""
+    _, regions = country_year_list(df)
+    regions = [r for r in regions if r != 'Overall']
+    # Countries ranked by medal total, then the ones without medals; sports by athlete rows
+    tally = medal_tally(df).sort_values('total', ascending=False, kind='stable')
+    known = set(regions)
+    countries = list(dict.fromkeys([r for r in tally['region'].astype(str) if r in known] + regions))
+    sports = []
+    if 'Sport' in df.columns:
+        counts = df['Sport'].value_counts()
+        sports = [str(sport) for sport in counts[counts > 0].index]
+
+    tasks = []
+    for i in range(max(len(countries), len(sports))):
+        if i < len(countries):
+            tasks += [(func, (countries[i],)) for func in (yearwise_medal_tally, country_sport_heatmap,
+                                                            most_successful2)]
+        if i < len(sports):
+            tasks.append((most_successful, (sports[i],)))
+    return tasks
+
+
+class WarmUp:
+    """Precompute helper results into the result cache on background daemon threads"""
+
+    def __init__(self, df, workers=WARMUP_WORKERS, budget=None):
+        self.df = df
+        self.workers = max(1, workers)
+        self.budget = budget
+        self.total = self.done = self.failed = self.skipped = 0
+        self.started = self.finished = None
+        self.stopped = False
+        self._tasks = deque()
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.started = time.perf_counter()
+        threading.Thread(target=self._run, name='warm-up', daemon=True).start()
+        return self
+
+    def stop(self):
+        """Let the workers finish their current task and drop the rest"""
+        self.stopped = True
+
+    def _run(self):
+        try:
+            tasks = warm_up_tasks(self.df)
+        except Exception as e:
+            print(f"⚠️ Warm-up planning failed: {e}")
+            tasks = []
+        budget = self.budget if self.budget is not None else int(_MEMO.max_entries * WARMUP_CACHE_SHARE)
+        with self._lock:
+            self._tasks.extend(tasks[:budget])
+            self.total, self.skipped = len(self._tasks), max(0, len(tasks) - budget)
+
+        workers = [threading.Thread(target=self._work, name=f'warm-up-{i}', daemon=True)
+                   for i in range(self.workers)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.finished = time.perf_counter()
+        print(f"🔥 Warm-up: {self.done}/{self.total} results cached in {self.finished - self.started:.1f}s"
+              f" ({self.failed} failed, {self.skipped} over the cache budget)")
+
+    def _work(self):
+        while not self.stopped:
+            with self._lock:
+                if not self._tasks:
+                    return
+                func, args = self._tasks.popleft()
+            try:
+                func(self.df, *args)
+                ok = True
+            except Exception as e:
+                print(f"⚠️ Warm-up {func.__name__}{args} failed: {e}")
+                ok = False
+            with self._lock:
+                if ok:
+                    self.done += 1
+                else:
+                    self.failed += 1
+
+    def progress(self):
+        """Snapshot of the warm-up state for the debug panel"""
+        with self._lock:
+            end = self.finished or time.perf_counter()
+            return {'total': self.total, 'done': self.done, 'failed': self.failed, 'skipped': self.skipped,
+                    'pending': len(self._tasks), 'running': self.finished is None,
+                    'elapsed': round(end - self.started, 2) if self.started else 0.0}
+
+
+def start_warm_up(df, source=None, workers=None):
+    """Start the background warm-up for df once per dataset version; return it (None if not applicable)"""
+    # Engine backends answer through pushdown() and are not memoized, so there is nothing to warm
+    if df is None or df.empty or not _MEMO.enabled or (source is not None and source is not df):
+        return None
+    version = dataset_version(df)
+    stop_warm_ups(keep=version)
+    with _WARM_UPS_LOCK:
+        warm = _WARM_UPS.get(version)
+        if warm is None:
+            warm = _WARM_UPS[version] = WarmUp(df, WARMUP_WORKERS if workers is None else workers).start()
+    return warm
+
+
+def stop_warm_ups(keep=None):
+    """Stop and forget every warm-up except the one for dataset version keep (superseded datasets)"""
+    with _WARM_UPS_LOCK:
+        for version in [v for v in _WARM_UPS if v != keep]:
+            _WARM_UPS.pop(version).stop()
+
+
+def warm_up_status(df):
+    """Return the progress() of df's warm-up, or None if none was started"""
+    if df is None or df.empty:
+        return None
+    warm = _WARM_UPS.get(dataset_version(df))
+    return warm.progress() if warm is not None else None
+
+
+# ----------------- SHARED FIGURE BUILDERS (app.py & report.py) ----------------- #
+@instrument.timed
+def top_athletes_figure(top_athletes):
+    """Return the horizontal bar chart of the top 10 athletes in a leaderboard"""
+    fig = px.bar(
+        top_athletes.head(10),
+        x='Total Wins',
+        y='Name',
+        color='Sport',
+        orientation='h',
+        text='Total Wins',
+        color_discrete_sequence=[
+            '#FFB3BA', '#FFDFBA', '#FFFFBA', '#BAFFC9', '#BAE1FF',
+            '#D7BAFF', '#FFC2E2', '#BFFCC6', '#FFE0AC', '#A0E7E5'
+        ]
+    )
+    fig.update_layout(template="plotly_dark", margin=dict(l=20, r=20, t=40, b=20), height=600,
+                      yaxis=dict(autorange="reversed"))
+    return fig
+
+
+@instrument.timed
+def medal_trend_figure(country_medal_df):
+    """Return the line chart of a country's medals per edition ('Year', 'Total Medals')"""
+    fig = px.line(
+        country_medal_df,
+        x='Year',
+        y='Total Medals',
+        markers=True,
+        line_shape='spline',
+        color_discrete_sequence=['#FFB347']
+    )
+    fig.update_layout(
+        template="plotly_dark",
+        margin=dict(l=20, r=20, t=40, b=20),
+        height=450,
+        xaxis_title="Year",
+        yaxis_title="Total Medals"
+    )
+    fig.update_traces(line=dict(width=3))
+    return fig
+
+
+@instrument.timed
+def country_heatmap_figure(heatmap_data, country):
+    """Return the medals-per-sport-per-year heatmap for a country"""
+    fig = px.imshow(
+        heatmap_data,
+        labels=dict(x="Year", y="Sport", color="Number of Medals"),
+        text_auto=True,
+        aspect="auto",
+        color_continuous_scale="Viridis"
+    )
+    fig.update_layout(
+        title=f"Medals per Sport Over the Years - {country}",
+        xaxis_title="Year",
+        yaxis_title="Sport",
+        template="plotly_dark",
+        height=700,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    return fig
+
+
+# ----------------- INCREMENTAL APPEND ----------------- #
+def _merge_cube_arrays(old, new):
+    """Add two cubes' counts and participation over the union of their regions and years"""
+    regions = np.union1d(old['regions'], new['regions'])
+    years = np.union1d(old['years'], new['years'])
+    counts = np.zeros((len(regions), len(years), len(MEDAL_COLS)), dtype=np.int64)
+    played = np.zeros((len(regions), len(years)), dtype=bool)
+    for part in (old, new):
+        cells = np.ix_(np.searchsorted(regions, part['regions']), np.searchsorted(years, part['years']))
+        counts[cells] += part['counts']
+        played[cells] |= part['played']
+    return {'counts': counts, 'played': played, 'regions': regions, 'years': years}
+
+
+def _merge_scope(old, new, key):
+    """One leaderboard scope's entries from old and appended rows, summed per athlete and re-ranked"""
+    # Old entries come first and old rows precede appended ones, so the first occurrence of
+    # an athlete carries their first-seen row and its info
+    codes, _ = pd.factorize(np.concatenate([old['info'][key], new['info'][key]]))
+    first = np.unique(codes, return_index=True)[1]
+    wins = np.bincount(codes, weights=np.concatenate([old['wins'], new['wins']])).astype(np.int64)
+    gold = np.bincount(codes, weights=np.concatenate([old['gold'], new['gold']])).astype(np.int64)
+    row = np.concatenate([old['row'], new['row']])[first]
+    order = np.lexsort((row, -gold, -wins))
+    info = {col: np.concatenate([old['info'][col], new['info'][col]])[first][order] for col in old['info']}
+    return {'wins': wins[order], 'gold': gold[order], 'row': row[order], 'info': info}
+
+
+def _extend_leaderboards(boards, combined, start):
+    """Leaderboards of combined from those of combined[:start] plus the medal rows appended after it"""
+    tail = combined.iloc[start:]
+    medal_rows = np.flatnonzero((tail['Medal'].notna() & tail['Name'].notna()).to_numpy())
+    key = 'ID' if 'ID' in tail.columns else 'Name'
+    athlete, athletes = pd.factorize(tail[key].to_numpy()[medal_rows])
+    if 'Gold' in tail.columns:
+        gold = tail['Gold'].to_numpy(dtype='float64')[medal_rows]
+    else:
+        gold = (tail['Medal'].to_numpy(dtype=object)[medal_rows] == 'Gold').astype('float64')
+    info = {col: tail[col].to_numpy()[medal_rows] for col in boards['Overall']['info']}
+    rows = start + medal_rows
+
+    extended = {}
+    for col, board in boards.items():
+        index = None
+        if col == 'Overall':
+            group = np.zeros(len(medal_rows), dtype=np.int64)
+        else:
+            # Scopes first seen in the appended rows (a new sport or region) are numbered after the old ones
+            index = dict(board['index'])
+            codes, labels = pd.factorize(tail[col].to_numpy()[medal_rows])
+            ids = np.array([index.setdefault(label, len(index)) for label in labels.tolist()] + [-1], dtype=np.int64)
+            group = ids[codes]  # a missing label (code -1) picks the trailing -1
+        n_groups = len(index) if index is not None else 1
+        fresh = _ranked_scopes(group, n_groups, athlete, len(athletes), gold, np.arange(len(medal_rows)))
+        fresh['info'] = {c: values[fresh['row']] for c, values in info.items()}
+        fresh['row'] = rows[fresh['row']]
+
+        # Only scopes that gained medal rows are re-ranked; the others keep their old slices
+        scopes = []
+        for g in range(n_groups):
+            old = _board_slice(board, g) if g < len(board['offsets']) - 1 else None
+            new = _board_slice(fresh, g)
+            if not len(new['row']):
+                scopes.append(old)
+            elif old is None or not len(old['row']):
+                scopes.append(new)
+            else:
+                scopes.append(_merge_scope(old, new, key))
+        merged = {'offsets': np.concatenate([[0], np.cumsum([len(s['row']) for s in scopes])]).astype(np.int64)}
+        for field in ('wins', 'gold', 'row'):
+            merged[field] = np.concatenate([s[field] for s in scopes])
+        merged['info'] = {c: np.concatenate([s['info'][c] for s in scopes]) for c in board['info']}
+        if index is not None:
+            merged['index'] = index
+        extended[col] = merged
+    return extended
+
+
+def _board_slice(board, group):
+    """Entries of one scope of a leaderboard"""
+    start, stop = board['offsets'][group], board['offsets'][group + 1]
+    return {'wins': board['wins'][start:stop], 'gold': board['gold'][start:stop], 'row': board['row'][start:stop],
+            'info': {col: values[start:stop] for col, values in board['info'].items()}}
+
+
+def _carry_by_year(func, old_result, combined, years, args, kwargs):
+    """Per-Year result: keep stored years, recompute only the appended years"""
+    fresh = inspect.unwrap(func)(combined[combined['Year'].isin(years)], *args, **kwargs)
+    if func is events_per_sport_over_time:
+        kept = old_result.drop(columns=[y for y in old_result.columns if y in set(years)])
+        merged = pd.concat([kept, fresh], axis=1).fillna(0).astype(int)
+        merged = merged.reindex(sorted(merged.index, key=str)).sort_index(axis=1)
+        # A recompute pivots on the categorical Sport column; keep that index dtype
+        source = combined[old_result.index.name] if old_result.index.name in combined.columns else None
+        if source is not None and isinstance(source.dtype, pd.CategoricalDtype):
+            merged.index = merged.index.astype(source.dtype)
+        merged.index.name, merged.columns.name = old_result.index.name, old_result.columns.name
+        return merged
+    kept = old_result[~old_result['Edition'].isin(years)]
+    keys = [col for col in ('Edition', 'Season') if col in old_result.columns]
+    return pd.concat([kept, fresh], ignore_index=True).sort_values(keys, kind='stable').reset_index(drop=True)
+
+
+def extend_aggregates(old_df, new_df, combined):
+    """Carry derived tables and memoized results of old_df forward to combined = old_df + new_df"""
+    old_version, version = dataset_version(old_df), dataset_version(combined)
+    years = pd.unique(new_df['Year'].dropna())
+
+    old_events = _DERIVED.get((old_version, 'medal_events'))
+    if old_events is not None:
+        events = preprocessor.concat_frames(old_events, _build_medal_events(new_df))
+        key_cols = [col for col in MEDAL_EVENT_COLS if col in events.columns]
+        _put_derived((version, 'medal_events'), _dedup(events, key_cols).reset_index(drop=True))
+
+    old_played = _DERIVED.get((old_version, 'participation'))
+    if old_played is not None:
+        cols = [col for col in ['region', 'Year'] if col in new_df.columns]
+        played = preprocessor.concat_frames(old_played, _dedup(new_df[cols], cols))
+        _put_derived((version, 'participation'), _dedup(played, cols).reset_index(drop=True))
+
+    old_cube = _DERIVED.get((old_version, 'medal_cube')) or preprocessor.load_artifact(old_df, 'medal_cube')
+    if old_cube is not None:
+        new_arrays = _cube_arrays(_build_medal_events(new_df), _dedup(new_df[['region', 'Year']], ['region', 'Year']))
+        arrays = _merge_cube_arrays(old_cube, new_arrays)
+        preprocessor.save_artifact(combined, 'medal_cube', arrays)
+        _put_derived((version, 'medal_cube'), _finish_cube(arrays))
+
+    # Leaderboards: rank the appended medal rows per scope and merge them into the old index
+    old_boards = _DERIVED.get((old_version, 'leaderboards'))
+    if old_boards is not None:
+        _put_derived((version, 'leaderboards'), _extend_leaderboards(old_boards, combined, len(old_df)))
+
+    # Memoized results that can be updated from the appended rows alone
+    carried = 0
+    for key, value in _MEMO.items():
+        name, key_version, args, kwargs = key
+        if key_version != old_version:
+            continue
+        func = _CARRY_BY_YEAR.get(name)
+        if func is None:
+            continue
+        result = _carry_by_year(func, value, combined, years, args, dict(kwargs))
+        _MEMO.put((name, version, args, kwargs), result, _result_nbytes(result))
+        carried += 1
+    print(f"♻️ Carried derived tables and {carried} memoized results forward to the appended dataset")
+
+
+_CARRY_BY_YEAR = {'data_over_time': data_over_time, 'edition_metrics': edition_metrics,
+                  'events_per_sport_over_time': events_per_sport_over_time}
+preprocessor.on_append(extend_aggregates)
@@ -0,0 +1,260 @@
+## instrument.py - HOT-PATH TIMING FOR HELPER CALLS AND PAGE SECTIONS
+#
+# Enable with OLYMPIC_TRACE=1 (or instrument.configure(enabled=True)); set
+# OLYMPIC_TRACE_FILE=trace.jsonl to also append every record as a JSON line.
+# When disabled, timed() wrappers and section() cost a single flag check.
+# lazy_module() defers heavy imports (plotly) until first attribute access and
+# import_report() gives a `python -X importtime` breakdown for the debug info.
+
+import collections
+import contextlib
+import functools
+import importlib
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pandas as pd
+
+MAX_RECORDS = 2000
+
+
+class _Tracer:
+    """Process-wide trace settings and a bounded buffer of timing records"""
+
+    def __init__(self, enabled=False, trace_file=None):
+        self.enabled = enabled
+        self.trace_file = trace_file
+        self.records = collections.deque(maxlen=MAX_RECORDS)
+        self.lock = threading.Lock()
+        self.seq = itertools.count(1)
+        self.local = threading.local()
+
+
+_TRACE = _Tracer(enabled=os.environ.get('OLYMPIC_TRACE', '').lower() in ('1', 'true', 'yes', 'on'),
+                 trace_file=os.environ.get('OLYMPIC_TRACE_FILE') or None)
+
+
+def configure(enabled=None, trace_file=None):
+    """Turn tracing on/off and set (or clear with '') the JSON-lines trace file"""
+    if enabled is not None:
+        _TRACE.enabled = bool(enabled)
+    if trace_file is not None:
+        _TRACE.trace_file = trace_file or None
+
+
+def is_enabled():
+    """Return True when timings are being recorded"""
+    return _TRACE.enabled
+
+
+def clear():
+    """Drop all buffered records"""
+    with _TRACE.lock:
+        _TRACE.records.clear()
+
+
+def mark():
+    """Return a sequence marker; records(since=marker) yields only newer records"""
+    with _TRACE.lock:
+        return _TRACE.records[-1]['seq'] if _TRACE.records else 0
+
+
+def records(since=0, thread=None):
+    """Return buffered records newer than since, optionally only from one thread"""
+    with _TRACE.lock:
+        return [r for r in _TRACE.records if r['seq'] > since and (thread is None or r['thread'] == thread)]
+
+
+def summary(since=0, thread=None):
+    """Aggregate records per (kind, name) into a timing table"""
+    rows = records(since, thread)
+    if not rows:
+        return pd.DataFrame(columns=['kind', 'name', 'calls', 'total ms', 'mean ms', 'max ms',
+                                     'rows in', 'rows out', 'mem Δ MB'])
+    frame = pd.DataFrame(rows)
+    table = frame.groupby(['kind', 'name'], sort=False).agg(
+        calls=('seconds', 'size'), total=('seconds', 'sum'), mean=('seconds', 'mean'), max=('seconds', 'max'),
+        rows_in=('rows_in', 'max'), rows_out=('rows_out', 'max'), mem=('mem_delta', 'sum')).reset_index()
+    table[['total', 'mean', 'max']] = table[['total', 'mean', 'max']] * 1000
+    table['mem'] = table['mem'] / 1e6
+    table.columns = ['kind', 'name', 'calls', 'total ms', 'mean ms', 'max ms', 'rows in', 'rows out', 'mem Δ MB']
+    return table.sort_values('total ms', ascending=False).round(2).reset_index(drop=True)
+
+
+# ----------------- MEASUREMENT ----------------- #
+def _rss_bytes():
+    """Current resident set size (Linux /proc), falling back to peak RSS elsewhere"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except ImportError:
+            return 0
+
+
+def process_memory(pid=None):
+    """Resident memory of a process in bytes: rss, pss (shared pages split between users), private, shared
+
+    Linux only (/proc/<pid>/smaps_rollup); returns {} elsewhere.  Memory-mapped files held
+    by several processes show up as shared, and count once in the sum of pss.
+    """
+    fields = {'Rss': 'rss', 'Pss': 'pss', 'Private_Clean': 'private', 'Private_Dirty': 'private',
+              'Shared_Clean': 'shared', 'Shared_Dirty': 'shared', 'Anonymous': 'anonymous'}
+    usage = dict.fromkeys(fields.values(), 0)
+    try:
+        with open(f"/proc/{pid or 'self'}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in fields:
+                    usage[fields[name]] += int(rest.split()[0]) * 1024
+    except (OSError, ValueError):
+        return {}
+    return usage
+
+
+def _size(value):
+    """Rows in a frame/series/list, summed over tuples, or plotted points in a figure"""
+    if value is None:
+        return 0
+    if isinstance(value, (pd.DataFrame, pd.Series, list)):
+        return len(value)
+    if isinstance(value, tuple):
+        return sum(_size(v) for v in value)
+    data = getattr(value, 'data', None)
+    if isinstance(data, tuple):
+        return sum(len(trace.x) if getattr(trace, 'x', None) is not None else 0 for trace in data)
+    return 0
+
+
+def _stack():
+    """Per-thread stack of open section names (Streamlit runs each session in its own thread)"""
+    stack = getattr(_TRACE.local, 'stack', None)
+    if stack is None:
+        stack = _TRACE.local.stack = []
+    return stack
+
+
+def _record(kind, name, seconds, rows_in, rows_out, mem_delta, error):
+    """Buffer one record and append it to the trace file when configured"""
+    stack = _stack()
+    record = {'seq': 0, 'ts': round(time.time(), 3), 'thread': threading.get_ident(), 'kind': kind, 'name': name,
+              'section': stack[-1] if stack else None, 'seconds': seconds, 'rows_in': rows_in,
+              'rows_out': rows_out, 'mem_delta': mem_delta, 'error': error}
+    with _TRACE.lock:
+        record['seq'] = next(_TRACE.seq)
+        _TRACE.records.append(record)
+        if _TRACE.trace_file:
+            try:
+                with open(_TRACE.trace_file, 'a') as f:
+                    f.write(json.dumps(record, default=str) + '\n')
+            except OSError as e:
+                print(f"⚠️ Could not write trace file {_TRACE.trace_file}: {e}")
+                _TRACE.trace_file = None
+
+
+def timed(func):
+    """Record wall time, rows in/out and RSS delta of func(df, ...) while tracing is enabled"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _TRACE.enabled:
+            return func(*args, **kwargs)
+        rows_in = _size(args[0]) if args else 0
+        mem_before = _rss_bytes()
+        start = time.perf_counter()
+        error = None
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _record('helper', func.__name__, time.perf_counter() - start, rows_in, _size(result),
+                    _rss_bytes() - mem_before, error)
+    return wrapper
+
+
+@contextlib.contextmanager
+def _section(name):
+    stack = _stack()
+    mem_before = _rss_bytes()
+    start = time.perf_counter()
+    stack.append(name)
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        stack.pop()
+        _record('section', name, time.perf_counter() - start, 0, 0, _rss_bytes() - mem_before, error)
+
+
+def section(name):
+    """Context manager timing a page section; a no-op context while tracing is disabled"""
+    if not _TRACE.enabled:
+        return contextlib.nullcontext()
+    return _section(name)
+
+
+# ----------------- DEFERRED IMPORTS ----------------- #
+class _LazyModule:
+    """Module stand-in that imports the real module on first attribute access"""
+
+    def __init__(self, name):
+        self._lazy_name = name
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._lazy_name)
+        # Later lookups hit the real module directly instead of __getattr__
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._lazy_name in sys.modules else 'deferred'
+        return f"<lazy module {self._lazy_name!r} ({state})>"
+
+
+def lazy_module(name):
+    """Return name's module if already imported, else a stand-in that imports it on first use"""
+    return sys.modules.get(name) or _LazyModule(name)
+
+
+def deferred_status(names):
+    """Map each module name to whether it has been imported in this process"""
+    return {name: name in sys.modules for name in names}
+
+
+def import_report(statement='import helper', top=15, timeout=120):
+    """Run statement in a fresh interpreter under -X importtime; return the slowest imports"""
+    columns = ['module', 'depth', 'self ms', 'cumulative ms']
+    try:
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"⚠️ Import-time report failed: {e}")
+        return pd.DataFrame(columns=columns)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            depth = (len(name) - len(name.lstrip())) // 2
+            rows.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+        except ValueError:
+            continue
+    table = pd.DataFrame(rows, columns=columns)
+    return table.sort_values('cumulative ms', ascending=False).head(top).round(1).reset_index(drop=True)
@@ -0,0 +1,144 @@
+## loadtest.py - CONCURRENT LOAD TEST FOR THE api.py JSON SERVICE
+#
+# Usage:
+#   python loadtest.py                                  # start api.py in-process, 8 clients
+#   python loadtest.py --clients 32 --requests 5000 --revalidate 0.8
+#   python loadtest.py --url http://127.0.0.1:8502      # hit an already running server
+#
+# Each client picks seeded random endpoints and parameters (taken from
+# /api/filters).  With probability --revalidate it sends back the ETag it saw
+# last for that URL, so the report shows both full (200) and 304 latencies.
+
+import argparse
+import collections
+import concurrent.futures
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.parse
+
+SEARCH_QUERIES = ['phelps', 'bolt', 'nadia', 'lewis', 'smith', 'jhonson', 'fischr', 'zhang']
+
+
+def _get(base, path, etag=None):
+    """Return (status, etag, seconds) for one GET on a fresh connection"""
+    url = urllib.parse.urlsplit(base)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    start = time.perf_counter()
+    try:
+        conn.request('GET', path, headers={'If-None-Match': etag} if etag else {})
+        response = conn.getresponse()
+        response.read()
+        return response.status, response.getheader('ETag'), time.perf_counter() - start
+    finally:
+        conn.close()
+
+
+def request_mix(filters, n, seed=0):
+    """Return n seeded request paths covering every endpoint"""
+    rng = random.Random(seed)
+    years = filters['years']
+    regions = [r for r in filters['regions'] if r != 'Overall'] or ['Overall']
+    sports = filters['sports'] or ['Overall']
+    q = urllib.parse.quote
+    makers = [
+        lambda: f"/api/tally?year={rng.choice(years)}&country={q(rng.choice(filters['regions']))}",
+        lambda: f"/api/tally/yearwise?country={q(rng.choice(regions))}",
+        lambda: f"/api/heatmap/country?country={q(rng.choice(regions))}",
+        lambda: f"/api/leaders/country?country={q(rng.choice(regions))}",
+        lambda: f"/api/leaders/sport?sport={q(rng.choice(sports))}",
+        lambda: "/api/over-time" + rng.choice(['', '?by_season=1', '?metrics=region,Event']),
+        lambda: "/api/heatmap/events",
+        lambda: f"/api/athletes?q={rng.choice(SEARCH_QUERIES)}",
+    ]
+    return [rng.choice(makers)() for _ in range(n)]
+
+
+def _percentiles(seconds):
+    if not seconds:
+        return '-'
+    ms = sorted(s * 1000 for s in seconds)
+    pick = lambda p: ms[min(len(ms) - 1, int(p * len(ms)))]
+    return f"p50 {pick(0.5):7.1f}  p95 {pick(0.95):7.1f}  p99 {pick(0.99):7.1f} ms"
+
+
+def run(base, clients=8, requests=1000, revalidate=0.5, seed=0):
+    """Fire requests from clients threads against base; return the per-request records"""
+    status, _, _ = _get(base, '/api/health')
+    if status != 200:
+        raise RuntimeError(f"{base} is not healthy (status {status})")
+    url = urllib.parse.urlsplit(base)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    conn.request('GET', '/api/filters')
+    filters = json.loads(conn.getresponse().read())
+    conn.close()
+
+    paths = request_mix(filters, requests, seed)
+    etags, lock = {}, threading.Lock()
+    rng = random.Random(seed + 1)
+    revalidating = [rng.random() < revalidate for _ in paths]
+
+    def one(i):
+        path = paths[i]
+        with lock:
+            etag = etags.get(path) if revalidating[i] else None
+        status, new_etag, seconds = _get(base, path, etag)
+        if new_etag:
+            with lock:
+                etags[path] = new_etag
+        return {'endpoint': path.split('?')[0], 'status': status, 'seconds': seconds}
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=clients) as pool:
+        records = list(pool.map(one, range(len(paths))))
+    elapsed = time.perf_counter() - start
+
+    statuses = collections.Counter(r['status'] for r in records)
+    print(f"\n🚀 {len(records)} requests from {clients} clients in {elapsed:.2f}s "
+          f"({len(records) / elapsed:.0f} req/s)")
+    print(f"   statuses: {dict(sorted(statuses.items()))}")
+    print(f"   all  {_percentiles([r['seconds'] for r in records])}")
+    for status in sorted(statuses):
+        print(f"   {status}  {_percentiles([r['seconds'] for r in records if r['status'] == status])}")
+    print(f"\n{'endpoint':<24} {'n':>6} {'mean ms':>9}  latency")
+    by_endpoint = collections.defaultdict(list)
+    for r in records:
+        by_endpoint[r['endpoint']].append(r['seconds'])
+    for endpoint, seconds in sorted(by_endpoint.items()):
+        print(f"{endpoint:<24} {len(seconds):>6} {statistics.mean(seconds) * 1000:>9.1f}  {_percentiles(seconds)}")
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the api.py JSON service")
+    parser.add_argument('--url', help="base URL of a running server (default: start one in-process)")
+    parser.add_argument('--clients', type=int, default=8, help="concurrent clients (default: 8)")
+    parser.add_argument('--requests', type=int, default=1000, help="total requests (default: 1000)")
+    parser.add_argument('--revalidate', type=float, default=0.5,
+                        help="share of requests sending If-None-Match when an ETag is known (default: 0.5)")
+    parser.add_argument('--workers', type=int, default=8, help="server worker threads when started here (default: 8)")
+    parser.add_argument('--seed', type=int, default=0, help="request mix seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    server = None
+    base = args.url
+    if base is None:
+        import api
+        server = api.create_server(port=0, workers=args.workers)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    try:
+        records = run(base, args.clients, args.requests, args.revalidate, args.seed)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    errors = sum(1 for r in records if r['status'] >= 500)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+## polars_engine.py - POLARS LAZY-QUERY ENGINE FOR THE helper.py ANALYTICS
+#
+# PolarsFrame holds a Polars copy of the dataset and answers the tally,
+# time-series, heatmap and leaderboard helpers as lazy query plans that Polars
+# optimizes and runs on all cores.  Only the small aggregated results are
+# converted to pandas, at the chart/table boundary.
+# Select it with OLYMPIC_BACKEND=polars (polars is an optional dependency).
+
+import pandas as pd
+
+MEDAL_EVENT_COLS = ['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal']
+MEDAL_COLS = ['Gold', 'Silver', 'Bronze']
+TALLY_COLS = MEDAL_COLS + ['total']
+TOP_K = 15
+EDITION_METRICS = ['region', 'Event', 'Name', 'Sport', 'City']
+ROW = '__row'
+
+
+def _polars():
+    """Import polars on first use (it is optional and slow to import)"""
+    try:
+        import polars
+    except ImportError:
+        raise ImportError("polars is required for OLYMPIC_BACKEND=polars (pip install polars)")
+    return polars
+
+
+class PolarsFrame:
+    """Polars copy of a dataset; methods mirror the helper.py analytics"""
+
+    def __init__(self, df, version=None):
+        pl = _polars()
+        self.version = version if version is not None else df.attrs.get('dataset_version')
+        self.dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
+        self.columns = list(df.columns)
+        # Pivot rows follow the Sport category order, as pandas pivot_table(observed=True) does
+        self.sport_order = (list(df['Sport'].cat.categories)
+                            if 'Sport' in df.columns and isinstance(df['Sport'].dtype, pd.CategoricalDtype) else None)
+
+        # Strings as plain Utf8 (sorting/comparison by value), NaN as null, plus a row index
+        # so "first seen" ties resolve exactly like the pandas path
+        plain = {col: (df[col].astype(object) if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col])
+                 for col in df.columns}
+        frame = pl.from_pandas(pd.DataFrame(plain), nan_to_null=True).with_row_index(ROW)
+        self.frame = frame.rechunk()
+        key = (['medal_event_key'] if 'medal_event_key' in self.columns
+               else [col for col in MEDAL_EVENT_COLS if col in self.columns])
+        self.medals = (frame.lazy().filter(pl.col('Medal').is_not_null())
+                       .unique(subset=key, keep='first', maintain_order=True).collect())
+
+    def __repr__(self):
+        return f"<PolarsFrame {self.frame.height} rows version={self.version}>"
+
+    def lazy(self):
+        return self.frame.lazy()
+
+    def _typed(self, frame, columns=()):
+        """Cast key columns of a pandas result back to the dtypes of the source frame"""
+        for col in columns:
+            if col in frame.columns and col in self.dtypes:
+                dtype = self.dtypes[col]
+                if dtype == 'category' or dtype.startswith(('str', 'object')):
+                    frame[col] = frame[col].astype(object)
+                else:
+                    frame[col] = frame[col].astype(dtype)
+        return frame
+
+    @staticmethod
+    def _to_pandas(result):
+        """Collected Polars frame -> pandas with numpy-backed columns"""
+        return pd.DataFrame({col: result[col].to_numpy() for col in result.columns})
+
+    # ----------------- FILTER LISTS ----------------- #
+    def country_year_list(self):
+        pl = _polars()
+        years = (self.lazy().select(pl.col('Year').drop_nulls().unique().sort()).collect()['Year'].to_list())
+        regions = (self.lazy().select(pl.col('region').drop_nulls().unique().sort()).collect()['region'].to_list())
+        return (['Overall'] + [int(y) for y in years] if years else ['Overall'],
+                ['Overall'] + regions if regions else ['Overall'])
+
+    # ----------------- MEDAL TALLY ----------------- #
+    def fetch_medal_tally(self, year, country):
+        """Tally over (region, Year) pairs that took part, matching helper's medal-cube answers"""
+        pl = _polars()
+        try:
+            year = int(year) if year != 'Overall' else None
+        except (TypeError, ValueError):
+            year = None
+        country = None if country == 'Overall' else country
+
+        condition = pl.col('region').is_not_null() & pl.col('Year').is_not_null()
+        if year is not None:
+            condition &= pl.col('Year') == year
+        if country is not None:
+            condition &= pl.col('region') == country
+        key = 'Year' if year is None and country is not None else 'region'
+
+        played = self.lazy().filter(condition).select('region', 'Year').unique()
+        tally = (self.medals.lazy().filter(condition).group_by('region', 'Year')
+                 .agg([pl.col(m).sum().alias(m) for m in MEDAL_COLS]))
+        x = (played.join(tally, on=['region', 'Year'], how='left')
+             .group_by(key).agg([pl.col(m).sum().fill_null(0).cast(pl.Int64) for m in MEDAL_COLS]))
+        x = x.sort('Year') if key == 'Year' else x.sort(['Gold', 'region'], descending=[True, False])
+        x = x.with_columns((pl.col('Gold') + pl.col('Silver') + pl.col('Bronze')).alias('total')).collect()
+        if x.height == 0:
+            return pd.DataFrame(columns=[key] + TALLY_COLS)
+        x = self._to_pandas(x)
+        x[key] = x[key].astype('int64' if key == 'Year' else 'str')
+        return x
+
+    def yearwise_medal_tally(self, country):
+        pl = _polars()
+        x = (self.medals.lazy().filter(pl.col('region') == country).group_by('Year')
+             .agg(pl.col('Medal').count().cast(pl.Int64).alias('Medal')).sort('Year').collect())
+        if x.height == 0:
+            return pd.DataFrame(columns=['Year', 'Medal'])
+        return self._typed(self._to_pandas(x), ['Year'])
+
+    # ----------------- TIME SERIES & PIVOTS ----------------- #
+    def data_over_time(self, col):
+        pl = _polars()
+        if col not in self.columns:
+            raise KeyError(f"Unknown column {col!r}")
+        x = (self.lazy().filter(pl.col('Year').is_not_null()).group_by('Year')
+             .agg(pl.col(col).drop_nulls().n_unique().cast(pl.Int64).alias(col))
+             .sort('Year').rename({'Year': 'Edition'}).collect())
+        if x.height == 0:
+            return pd.DataFrame(columns=['Edition', col])
+        x = self._to_pandas(x)
+        if 'Year' in self.dtypes:
+            x['Edition'] = x['Edition'].astype(self.dtypes['Year'])
+        return x
+
+    def edition_metrics(self, metrics=None, by_season=False):
+        """Distinct counts per edition (and Season) for several columns in one grouped plan"""
+        pl = _polars()
+        metrics = list(EDITION_METRICS if metrics is None else metrics)
+        keys = ['Edition'] + (['Season'] if by_season else [])
+        if by_season and 'Season' not in self.columns:
+            return pd.DataFrame(columns=keys + metrics)
+        metrics = [col for col in metrics if col in self.columns]
+        group = ['Year', 'Season'] if by_season else ['Year']
+        x = (self.lazy().filter(pl.all_horizontal([pl.col(col).is_not_null() for col in group]))
+             .group_by(group).agg([pl.col(col).drop_nulls().n_unique().cast(pl.Int64).alias(col) for col in metrics])
+             .sort(group).rename({'Year': 'Edition'}).collect())
+        if x.height == 0:
+            return pd.DataFrame(columns=keys + metrics)
+        x = self._to_pandas(x)
+        if 'Year' in self.dtypes:
+            x['Edition'] = x['Edition'].astype(self.dtypes['Year'])
+        return self._typed(x, ['Season'])
+
+    def _pivot(self, counts):
+        """Sport x Year pivot of collected (Sport, Year, n) rows, zero-filled like pivot_table(...).fillna(0)"""
+        if counts.height == 0:
+            return pd.DataFrame()
+        counts = self._typed(self._to_pandas(counts), ['Year'])
+        pivot = counts.pivot(index='Sport', columns='Year', values='n').fillna(0).astype(int)
+        order = self.sport_order
+        pivot = pivot.reindex([s for s in order if s in pivot.index]) if order else pivot.sort_index()
+        pivot = pivot.sort_index(axis=1)
+        pivot.columns.name = 'Year'
+        return pivot
+
+    def events_per_sport_over_time(self):
+        pl = _polars()
+        counts = (self.lazy().filter(pl.col('Sport').is_not_null() & pl.col('Year').is_not_null())
+                  .group_by('Sport', 'Year').agg(pl.col('Event').drop_nulls().n_unique().alias('n'))
+                  .filter(pl.col('n') > 0).collect())
+        return self._pivot(counts)
+
+    def country_sport_heatmap(self, country):
+        pl = _polars()
+        counts = (self.medals.lazy()
+                  .filter((pl.col('region') == country) & pl.col('Sport').is_not_null() & pl.col('Year').is_not_null())
+                  .group_by('Sport', 'Year').agg(pl.col('Medal').count().alias('n')).collect())
+        return self._pivot(counts)
+
+    # ----------------- LEADERBOARDS ----------------- #
+    def _leaders(self, filter_col, value, info_cols, k=None):
+        """Top k athletes by medal rows, then golds; ties keep first-seen row order like helper.leaderboards"""
+        pl = _polars()
+        condition = pl.col('Medal').is_not_null() & pl.col('Name').is_not_null()
+        if value != 'Overall' and filter_col in self.columns:
+            condition &= pl.col(filter_col) == value
+        key = 'ID' if 'ID' in self.columns else 'Name'
+        gold = pl.col('Gold') if 'Gold' in self.columns else (pl.col('Medal') == 'Gold')
+        ident = ['ID', 'Name'] if key == 'ID' else ['Name']
+        info_cols = [col for col in info_cols if col in self.columns]
+        order = dict(by=['Total Wins', 'Gold', 'first_row'], descending=[True, True, False])
+        wins = (self.lazy().filter(condition).group_by(key)
+                .agg(pl.len().cast(pl.Int64).alias('Total Wins'), gold.cast(pl.Int64).sum().alias('Gold'),
+                     pl.col(ROW).min().alias('first_row'))
+                .sort(**order).head(TOP_K if k is None else k))
+        info = self.lazy().select([ROW] + ident + info_cols)
+        x = (wins.drop(key).join(info, left_on='first_row', right_on=ROW, how='left')
+             .sort(**order).select(ident + ['Total Wins', 'Gold'] + info_cols).collect())
+        if x.height == 0:
+            return pd.DataFrame(columns=ident + ['Total Wins', 'Gold'] + info_cols)
+        return self._typed(self._to_pandas(x), ident + info_cols)
+
+    def most_successful(self, sport, k=None):
+        return self._leaders('Sport', sport, ['Sport', 'region'], k)
+
+    def most_successful2(self, country, k=None):
+        return self._leaders('region', country, ['Sport'], k)
@@ -1,7 +1,50 @@
 ## preprocessor.py - USING PRE-PROCESSED DATA
 
 import pandas as pd
+import numpy as np
 import os
+import io
+import gzip
+import contextlib
+import json
+import time
+import hashlib
+import shutil
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Bump when the cached frame layout changes so stale caches are rebuilt
+CACHE_VERSION = 3
+CACHE_DIR_NAME = '.olympic_cache'
+COLUMNS_DIR_NAME = 'columns'
+
+# Serve cached frames memory-mapped read-only from per-column files, so every process
+# (Streamlit replica, api.py) shares one copy in the OS page cache; OLYMPIC_MMAP=0 disables
+SHARED_MMAP = os.environ.get('OLYMPIC_MMAP', '1').lower() not in ('0', 'false', 'no', 'off')
+
+# Data files live next to this module (the repo checkout on Streamlit Cloud)
+DATA_DIR = os.environ.get('OLYMPIC_DATA_DIR', os.path.dirname(os.path.abspath(__file__)))
+
+# Fallback synthetic dataset size and seed when no data files are present
+SYNTHETIC_ROWS = int(os.environ.get('OLYMPIC_SYNTHETIC_ROWS', 20000))
+SYNTHETIC_SEED = int(os.environ.get('OLYMPIC_SYNTHETIC_SEED', 0))
+
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+INGEST_CHUNK_BYTES = 8 << 20
+
+# Compact in-memory schema (see optimize_schema)
+CATEGORY_COLS = ['Name', 'Sex', 'Team', 'NOC', 'Games', 'Season', 'City', 'Sport', 'Event', 'Medal', 'region']
+NARROW_DTYPES = {'ID': 'int32', 'Year': 'int16', 'Age': 'uint8',
+                 'Height': 'float32', 'Weight': 'float32',
+                 'Gold': 'uint8', 'Silver': 'uint8', 'Bronze': 'uint8'}
+NULLABLE_INTS = {'int16': 'Int16', 'int32': 'Int32', 'uint8': 'UInt8'}
+
+# Integer surrogate keys (see add_surrogate_keys): key column -> the columns it identifies
+SURROGATE_KEYS = {'medal_event_key': ['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal'],
+                  'athlete_key': ['Name', 'region'],
+                  'athlete_edition_key': ['Name', 'Year']}
+
 
 def preprocess():
     """Load pre-processed Olympic data"""
@@ -10,68 +53,749 @@ def preprocess():
     print("PREPROCESSOR - USING PRE-PROCESSED DATA")
     print("=" * 50)
 
-    current_dir = '/mount/src/olympic_data_analyser_new'
+    current_dir = DATA_DIR
     print(f"📁 Current directory: {current_dir}")
 
     # Try to load pre-processed data first (compressed)
     processed_path = os.path.join(current_dir, 'processed_olympic_data.csv.gz')
     sample_path = os.path.join(current_dir, 'sample_olympic_data.csv')
+    events_path = os.path.join(current_dir, 'athlete_events.csv')
+    regions_path = os.path.join(current_dir, 'noc_regions.csv')
 
     # Method 1: Load compressed processed data
     if os.path.exists(processed_path):
         print(f"✅ Found processed data: {processed_path}")
         try:
-            df = pd.read_csv(processed_path, compression='gzip')
+            df = load_cached([processed_path], lambda: optimize_schema(pd.read_csv(processed_path, compression='gzip')))
             print(f"✅ Loaded {len(df)} rows from processed data")
             print(f"✅ Columns: {df.columns.tolist()}")
             return df
         except Exception as e:
             print(f"❌ Error loading processed data: {e}")
 
-    # Method 2: Load sample data
+    # Method 2: Build from the raw athlete_events.csv + noc_regions.csv
+    if os.path.exists(events_path) and os.path.exists(regions_path):
+        print(f"✅ Found raw data: {events_path}")
+        try:
+            df = load_cached([events_path, regions_path], lambda: optimize_schema(ingest(events_path, regions_path)))
+            print(f"✅ Loaded {len(df)} rows from raw data")
+            print(f"✅ Columns: {df.columns.tolist()}")
+            return df
+        except Exception as e:
+            print(f"❌ Error ingesting raw data: {e}")
+
+    # Method 3: Load sample data
     if os.path.exists(sample_path):
         print(f"✅ Found sample data: {sample_path}")
         try:
-            df = pd.read_csv(sample_path)
+            df = load_cached([sample_path], lambda: optimize_schema(pd.read_csv(sample_path)))
             print(f"✅ Loaded {len(df)} rows from sample data")
             return df
         except Exception as e:
             print(f"❌ Error loading sample data: {e}")
 
-    # Method 3: Create minimal sample data
+    # Method 4: Create minimal sample data
     print("⚠️ No pre-processed files found, creating minimal sample")
-    return create_minimal_sample()
-
-
-def create_minimal_sample():
-    """Create minimal sample data"""
-    import numpy as np
-
-    years = [2000, 2004, 2008, 2012, 2016]
-    countries = ['USA', 'CHN', 'RUS', 'GBR', 'GER', 'FRA', 'ITA', 'AUS', 'JPN', 'CAN']
-    regions = ['United States', 'China', 'Russia', 'Great Britain', 'Germany',
-               'France', 'Italy', 'Australia', 'Japan', 'Canada']
-    sports = ['Athletics', 'Swimming', 'Gymnastics']
-
-    data = []
-    for year in years:
-        for sport in sports:
-            for noc, region in zip(countries, regions):
-                for medal in ['Gold', 'Silver', 'Bronze']:
-                    if np.random.random() > 0.5:  # 50% chance
-                        data.append({
-                            'Year': year,
-                            'Sport': sport,
-                            'Event': f"{sport} Event",
-                            'NOC': noc,
-                            'region': region,
-                            'Medal': medal,
-                            'Name': f"{region} Athlete",
-                            'Gold': 1 if medal == 'Gold' else 0,
-                            'Silver': 1 if medal == 'Silver' else 0,
-                            'Bronze': 1 if medal == 'Bronze' else 0
-                        })
-
-    df = pd.DataFrame(data)
-    print(f"✅ Created {len(df)} rows of minimal sample data")
-    return df
\ No newline at end of file
+    df = read_only(optimize_schema(create_minimal_sample()))
+    return set_dataset_version(df, f"synthetic:{SYNTHETIC_ROWS}:{SYNTHETIC_SEED}")
+
+
+# ----------------- DATASET VERSION ----------------- #
+# id(frame) -> weak reference to each frame tagged by tag_dataset_version.  pandas copies
+# attrs onto slices, copies and edited frames, so only the tagged object itself may claim
+# the version in its attrs; everything else is content-hashed (helper.dataset_version)
+_TAGGED = {}
+
+
+def set_dataset_version(df, token):
+    """Tag df with a dataset version derived from token (used to key derived tables)"""
+    return tag_dataset_version(df, hashlib.sha1(f"{CACHE_VERSION}:{token}".encode()).hexdigest()[:16])
+
+
+def tag_dataset_version(df, version):
+    """Mark df itself as holding dataset version"""
+    df.attrs['dataset_version'] = version
+    df.attrs['dataset_rows'] = len(df)
+    key = id(df)
+    _TAGGED[key] = weakref.ref(df, lambda ref: _TAGGED.pop(key) if _TAGGED.get(key) is ref else None)
+    return df
+
+
+def tagged_version(df):
+    """Return the dataset version df was tagged with, or None if df only inherited the attrs"""
+    frame = _TAGGED.get(id(df))
+    if frame is None or frame() is not df or df.attrs.get('dataset_rows') != len(df):
+        return None
+    return df.attrs.get('dataset_version')
+
+
+def carry_attrs(out, df):
+    """Copy df's attrs onto out, a frame holding the same data (keeps a tagged version valid)"""
+    out.attrs.update(df.attrs)
+    version = tagged_version(df)
+    if version is not None:
+        tag_dataset_version(out, version)
+    return out
+
+
+# ----------------- SURROGATE KEYS ----------------- #
+def _column_codes(values):
+    """Return (codes, radix) for a column: 0 for missing values, 1.. for each distinct value"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy().astype(np.int64) + 1, len(values.cat.categories) + 1
+    if pd.api.types.is_integer_dtype(values.dtype):
+        # Integers over a compact range (years, ages, other keys) are their own codes, no hashing
+        missing = values.isna().to_numpy()
+        ints = values.to_numpy(dtype=np.int64, na_value=0)
+        present = ints[~missing]
+        if len(present) and int(present.max()) - int(present.min()) < 4 * len(values) + 256:
+            codes = ints - (int(present.min()) - 1)
+            codes[missing] = 0
+            return codes, int(present.max()) - int(present.min()) + 2
+    codes, uniques = pd.factorize(values)
+    return codes.astype(np.int64) + 1, len(uniques) + 1
+
+
+def surrogate_key(df, cols):
+    """Dense int64 key that is equal exactly where rows agree on every column in cols (NaN == NaN)"""
+    key = np.zeros(len(df), dtype=np.int64)
+    bound = 1
+    for col in cols:
+        codes, radix = _column_codes(df[col])
+        if bound * radix >= 1 << 62:
+            # Re-densify before the mixed-radix product could overflow int64
+            key, uniques = pd.factorize(key)
+            bound = len(uniques)
+        key = key * radix + codes
+        bound *= radix
+    return pd.factorize(key)[0].astype(np.int64)
+
+
+def add_surrogate_keys(df):
+    """Add the SURROGATE_KEYS columns to df in place (keys whose source columns are missing are skipped)"""
+    for name, cols in SURROGATE_KEYS.items():
+        if all(col in df.columns for col in cols):
+            df[name] = surrogate_key(df, cols)
+    return df
+
+
+# ----------------- COMPACT SCHEMA ----------------- #
+def optimize_schema(df):
+    """Return df with categorical strings, narrow ints and float32 body metrics"""
+    before = df.memory_usage(deep=True, index=False)
+
+    # Columns are replaced, never written into, so the caller's frame is left untouched
+    df = df.copy(deep=False)
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    for col, dtype in NARROW_DTYPES.items():
+        if col not in df.columns:
+            continue
+        if dtype in NULLABLE_INTS:
+            # Nullable variant (Int16, UInt8, ...) keeps a mask instead of upcasting to float
+            if df[col].isna().any():
+                dtype = NULLABLE_INTS[dtype]
+            if df[col].dtype.kind == 'f':
+                df[col] = df[col].round()
+        df[col] = df[col].astype(dtype)
+    add_surrogate_keys(df)
+
+    after = df.memory_usage(deep=True, index=False)
+    df.attrs['memory_report'] = {col: {'before': int(before.get(col, 0)), 'after': int(after[col])}
+                                 for col in df.columns}
+    print(f"🗜️ Compact schema: {before.sum() / 1e6:.1f} MB -> {after.sum() / 1e6:.1f} MB")
+    return df
+
+
+def memory_report(df):
+    """Return a per-column bytes table (before/after schema optimization)"""
+    report = df.attrs.get('memory_report')
+    if not report:
+        current = df.memory_usage(deep=True, index=False)
+        report = {col: {'before': int(current[col]), 'after': int(current[col])} for col in df.columns}
+
+    x = pd.DataFrame.from_dict(report, orient='index')
+    x.index.name = 'column'
+    x = x.reset_index()
+    x['saved %'] = (100 * (1 - x['after'] / x['before'].where(x['before'] > 0))).round(1).fillna(0)
+    total = pd.DataFrame([{'column': 'TOTAL', 'before': x['before'].sum(), 'after': x['after'].sum()}])
+    total['saved %'] = round(100 * (1 - total['after'][0] / max(total['before'][0], 1)), 1)
+    return pd.concat([x, total], ignore_index=True)
+
+
+# ----------------- COLUMNAR CACHE ----------------- #
+def _cache_dir(source_path):
+    """Return the cache directory kept next to a source file"""
+    source_dir, source_name = os.path.split(os.path.abspath(source_path))
+    return os.path.join(source_dir, CACHE_DIR_NAME, source_name)
+
+
+def _file_sha256(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fingerprint(sources, with_hash=False):
+    """Return size/mtime (and optionally content hash) for every source file"""
+    prints = []
+    for path in sources:
+        stat = os.stat(path)
+        entry = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        if with_hash:
+            entry['sha256'] = _file_sha256(path)
+        prints.append(entry)
+    return prints
+
+
+def _read_meta(cache_dir):
+    """Return the cache metadata dict, or None if missing or unreadable"""
+    try:
+        with open(os.path.join(cache_dir, 'meta.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(cache_dir, meta):
+    """Atomically write the cache metadata dict"""
+    # Per-process temp name: every process rebuilding the cache writes its own before the rename
+    tmp_path = os.path.join(cache_dir, f"meta.json.tmp-{os.getpid()}")
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(cache_dir, 'meta.json'))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _cache_status(cache_dir, sources):
+    """Return (is_fresh, reason) for the cache built from sources"""
+    meta = _read_meta(cache_dir)
+    if meta is None or not os.path.exists(os.path.join(cache_dir, 'frame.feather')):
+        return False, "no cache"
+    if meta.get('version') != CACHE_VERSION:
+        return False, "cache version changed"
+
+    cached = meta.get('sources', [])
+    current = _fingerprint(sources)
+    if len(cached) != len(current):
+        return False, "source list changed"
+
+    # Fast path: size and mtime unchanged
+    if all(c['path'] == s['path'] and c['size'] == s['size'] and c['mtime_ns'] == s['mtime_ns']
+           for c, s in zip(cached, current)):
+        return True, "mtime match"
+
+    # Slow path: mtime moved (checkout, touch, copy) but content may be identical
+    if any(c['size'] != s['size'] for c, s in zip(cached, current)):
+        return False, "source size changed"
+    hashed = _fingerprint(sources, with_hash=True)
+    if all(c.get('sha256') == s['sha256'] for c, s in zip(cached, hashed)):
+        meta['sources'] = hashed
+        _write_meta(cache_dir, meta)
+        return True, "content hash match"
+    return False, "source content changed"
+
+
+def load_cached(sources, loader):
+    """Load a frame from the columnar cache, rebuilding it with loader() when stale"""
+    start = time.perf_counter()
+    try:
+        import pyarrow  # noqa: F401  (feather backend)
+    except ImportError:
+        print("⚠️ pyarrow not installed, columnar cache disabled")
+        prints = _fingerprint(sources, with_hash=True)
+        df = set_dataset_version(read_only(loader()), json.dumps([entry['sha256'] for entry in prints]))
+        print(f"⏱️ Loaded without cache in {time.perf_counter() - start:.2f}s")
+        return df
+
+    cache_dir = _cache_dir(sources[0])
+    frame_path = os.path.join(cache_dir, 'frame.feather')
+
+    fresh, reason = _cache_status(cache_dir, sources)
+    if fresh:
+        try:
+            attrs = _read_meta(cache_dir).get('attrs', {})
+            df = map_columns(cache_dir, attrs.get('dataset_version')) if SHARED_MMAP else None
+            how = 'memory-mapped' if df is not None else 'feather'
+            if df is None:
+                df = read_only(pd.read_feather(frame_path))
+            df.attrs.update(attrs)
+            if attrs.get('dataset_version'):
+                tag_dataset_version(df, attrs['dataset_version'])
+            df.attrs['cache_dir'] = cache_dir
+            print(f"⚡ Cache HIT ({reason}, {how}): {frame_path}")
+            print(f"⏱️ Loaded from cache in {time.perf_counter() - start:.2f}s")
+            return df
+        except Exception as e:
+            reason = f"unreadable cache ({e})"
+
+    print(f"🔄 Cache MISS ({reason}), rebuilding from source")
+    df = loader()
+    prints = _fingerprint(sources, with_hash=True)
+    set_dataset_version(df, json.dumps([entry['sha256'] for entry in prints]))
+    mapped = None
+    if _write_cache(cache_dir, df, prints) and SHARED_MMAP:
+        # Even the process that built the cache serves the shared mapping, not its private copy
+        mapped = map_columns(cache_dir, df.attrs['dataset_version'])
+    if mapped is not None:
+        df = carry_attrs(mapped, df)
+    else:
+        df = read_only(df)
+    print(f"⏱️ Loaded from source in {time.perf_counter() - start:.2f}s")
+    return df
+
+
+def _write_cache(cache_dir, df, prints):
+    """Write df and its source fingerprints as the cache in cache_dir"""
+    frame_path = os.path.join(cache_dir, 'frame.feather')
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{frame_path}.tmp-{os.getpid()}"
+        df.reset_index(drop=True).to_feather(tmp_path)
+        os.replace(tmp_path, frame_path)
+        if SHARED_MMAP:
+            _write_columns(cache_dir, df)
+        _write_meta(cache_dir, {'version': CACHE_VERSION,
+                                'sources': prints,
+                                'rows': len(df),
+                                'attrs': {k: v for k, v in df.attrs.items() if k != 'cache_dir'}})
+        df.attrs['cache_dir'] = cache_dir
+        print(f"💾 Cache written: {frame_path}")
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not write cache: {e}")
+        return False
+
+
+# ----------------- SHARED MEMORY-MAPPED FRAME ----------------- #
+def _column_kind(dtype):
+    """How a column is stored as files: 'category' (codes + categories), 'masked' (data + mask) or 'numpy'"""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return 'category' if pd.api.types.is_string_dtype(dtype.categories.dtype) else None
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        return 'masked' if getattr(dtype, 'kind', '') in 'iufb' and hasattr(dtype, 'numpy_dtype') else None
+    return 'numpy' if dtype.kind in 'iufb' else None
+
+
+def _write_columns(cache_dir, df):
+    """Write df as one .npy file per column (categories as Arrow IPC) for read-only memory mapping"""
+    import pyarrow as pa
+    kinds = {col: _column_kind(dtype) for col, dtype in df.dtypes.items()}
+    if None in kinds.values():
+        print(f"⚠️ Not memory-mappable, columns {[col for col, kind in kinds.items() if kind is None]}")
+        return False
+
+    target = os.path.join(cache_dir, COLUMNS_DIR_NAME)
+    tmp = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    layout = []
+    for i, (col, values) in enumerate(df.items()):
+        # Files are named by position: column names need not be valid file names
+        stem = os.path.join(tmp, f"{i:03d}")
+        kind = kinds[col]
+        if kind == 'category':
+            np.save(stem + '.npy', values.cat.codes.to_numpy())
+            table = pa.table({'categories': pa.array(values.cat.categories.astype(object), type=pa.large_string())})
+            with pa.ipc.new_file(stem + '.arrow', table.schema) as writer:
+                writer.write_table(table)
+        elif kind == 'masked':
+            np.save(stem + '.npy', values.to_numpy(dtype=values.dtype.numpy_dtype, na_value=0))
+            np.save(stem + '.mask.npy', values.isna().to_numpy())
+        else:
+            np.save(stem + '.npy', values.to_numpy())
+        layout.append({'name': col, 'kind': kind, 'dtype': str(values.dtype)})
+    with open(os.path.join(tmp, 'columns.json'), 'w') as f:
+        json.dump({'version': df.attrs.get('dataset_version'), 'rows': len(df), 'columns': layout}, f)
+
+    # Swap directories; processes still mapping the old files keep them until they unmap
+    old = f"{target}.old-{os.getpid()}"
+    try:
+        if os.path.exists(target):
+            os.replace(target, old)
+        os.replace(tmp, target)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.rmtree(old, ignore_errors=True)
+    return True
+
+
+def read_only(df):
+    """Return df rebuilt on read-only NumPy buffers, so in-place writes raise instead of altering shared data"""
+    def frozen(values):
+        values = np.array(values)
+        values.setflags(write=False)
+        return values
+
+    data = {}
+    for col, values in df.items():
+        kind = _column_kind(values.dtype)
+        if kind == 'category' or isinstance(values.dtype, pd.CategoricalDtype):
+            data[col] = pd.Categorical.from_codes(frozen(values.cat.codes), dtype=values.dtype, validate=False)
+        elif kind == 'masked':
+            masked = type(values.array)
+            data[col] = masked(frozen(values.to_numpy(dtype=values.dtype.numpy_dtype, na_value=0)),
+                               frozen(values.isna()))
+        elif kind == 'numpy':
+            data[col] = frozen(values)
+        else:
+            data[col] = values
+    return carry_attrs(pd.DataFrame(data, index=df.index, copy=False), df)
+
+
+def _categorical_dtype(categories):
+    """CategoricalDtype over categories that were unique when written"""
+    # Skips re-checking uniqueness, which would build a private hash table of every category
+    try:
+        return pd.CategoricalDtype._from_fastpath(categories, False)
+    except AttributeError:
+        return pd.CategoricalDtype(categories)
+
+
+def map_columns(cache_dir, version=None):
+    """Return the frame memory-mapped read-only from cache_dir's column files, or None if unusable"""
+    folder = os.path.join(cache_dir, COLUMNS_DIR_NAME)
+    if not os.path.exists(os.path.join(folder, 'columns.json')):
+        return None
+    try:
+        import pyarrow as pa
+        with open(os.path.join(folder, 'columns.json')) as f:
+            layout = json.load(f)
+        if version is not None and layout.get('version') != version:
+            return None
+        data = {}
+        for i, entry in enumerate(layout['columns']):
+            stem = os.path.join(folder, f"{i:03d}")
+            # Plain ndarray views of the read-only maps (memmap subclasses leak into results)
+            values = np.asarray(np.load(stem + '.npy', mmap_mode='r'))
+            if entry['kind'] == 'category':
+                strings = pa.ipc.open_file(pa.memory_map(stem + '.arrow')).read_all().column(0)
+                categories = pd.Index(pd.array(strings, dtype=pd.StringDtype('pyarrow', na_value=np.nan)))
+                data[entry['name']] = pd.Categorical.from_codes(values, dtype=_categorical_dtype(categories),
+                                                                validate=False)
+            elif entry['kind'] == 'masked':
+                mask = np.asarray(np.load(stem + '.mask.npy', mmap_mode='r'))
+                masked = {'f': pd.arrays.FloatingArray, 'b': pd.arrays.BooleanArray}.get(values.dtype.kind,
+                                                                                        pd.arrays.IntegerArray)
+                data[entry['name']] = masked(values, mask)
+            else:
+                data[entry['name']] = values
+        df = pd.DataFrame(data, copy=False)
+        if len(df) != layout['rows']:
+            return None
+        return df
+    except (OSError, ValueError, KeyError, TypeError, ImportError) as e:
+        print(f"⚠️ Could not map column files: {e}")
+        return None
+
+
+def save_artifact(df, name, arrays):
+    """Persist derived NumPy arrays next to df's cached frame (no-op if df is not cached)"""
+    cache_dir = df.attrs.get('cache_dir')
+    if not cache_dir or not os.path.isdir(cache_dir):
+        return False
+    # Per-process temp name: replicas building the same artifact must not interleave writes
+    tmp_path = os.path.join(cache_dir, f"{name}.tmp-{os.getpid()}.npz")
+    try:
+        np.savez(tmp_path, __version__=np.array(df.attrs.get('dataset_version', '')), **arrays)
+        os.replace(tmp_path, os.path.join(cache_dir, f"{name}.npz"))
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not write {name} artifact: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def load_artifact(df, name):
+    """Return arrays saved by save_artifact for df's dataset version, or None"""
+    cache_dir = df.attrs.get('cache_dir')
+    if not cache_dir:
+        return None
+    path = os.path.join(cache_dir, f"{name}.npz")
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            if str(data['__version__']) != df.attrs.get('dataset_version'):
+                return None
+            return {key: data[key] for key in data.files if key != '__version__'}
+    except (OSError, KeyError, ValueError) as e:
+        print(f"⚠️ Could not load {name} artifact, rebuilding: {e}")
+        return None
+
+
+# ----------------- RAW DATA INGEST ----------------- #
+def _open_raw(path):
+    """Open a raw CSV as a binary stream, transparently decompressing zstd"""
+    f = open(path, 'rb')
+    head = f.read(8)
+    if not head.startswith(ZSTD_MAGIC):
+        f.seek(0)
+        return f
+
+    try:
+        import zstandard
+    except ImportError:
+        f.close()
+        raise ImportError("zstandard is required to read the compressed athlete_events.csv")
+
+    # The shipped archive carries a stray duplicated magic number before the real frame
+    f.seek(4 if head[4:8] == ZSTD_MAGIC else 0)
+    return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+
+
+def _iter_blocks(stream, chunk_bytes):
+    """Yield (header, block) pairs of whole CSV lines read from a binary stream"""
+    # zstd stream readers have no readline(), so split the header off by hand
+    header, _, buffer = stream.read(chunk_bytes).partition(b'\n')
+    header += b'\n'
+
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            break
+        buffer += data
+        cut = buffer.rfind(b'\n')
+        if cut == -1:
+            continue
+        yield header, buffer[:cut + 1]
+        buffer = buffer[cut + 1:]
+
+    if buffer.strip():
+        yield header, buffer
+
+
+def _ingest_chunk(header, block, nocs, regions):
+    """Parse one block of raw rows and derive region + medal columns"""
+    chunk = pd.read_csv(io.BytesIO(header + block))
+
+    # Vectorized NOC -> region lookup via categorical codes (-1 = unknown NOC)
+    codes = pd.Categorical(chunk['NOC'], categories=nocs).codes
+    region = regions[codes]
+    region[codes == -1] = np.nan
+    chunk['region'] = region
+
+    for medal in ['Gold', 'Silver', 'Bronze']:
+        chunk[medal] = (chunk['Medal'] == medal).astype('int64')
+    return chunk
+
+
+def ingest(events_path, regions_path, chunk_bytes=INGEST_CHUNK_BYTES, workers=None):
+    """Build the analysis frame from the raw athlete events and NOC regions files"""
+    start = time.perf_counter()
+
+    regions_df = pd.read_csv(regions_path).drop_duplicates(subset=['NOC'])
+    nocs = regions_df['NOC'].to_numpy()
+    regions = regions_df['region'].to_numpy(dtype=object)
+
+    workers = workers or os.cpu_count() or 1
+    with _open_raw(events_path) as stream:
+        blocks = _iter_blocks(stream, chunk_bytes)
+        if workers == 1:
+            chunks = [_ingest_chunk(header, block, nocs, regions) for header, block in blocks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Read ahead at most two blocks per worker: submitting every block up front would
+                # hold the whole raw file in memory.  Results are collected in submission order
+                pending, chunks = deque(), []
+                for header, block in blocks:
+                    if len(pending) >= 2 * workers:
+                        chunks.append(pending.popleft().result())
+                    pending.append(pool.submit(_ingest_chunk, header, block, nocs, regions))
+                chunks += [future.result() for future in pending]
+
+    if not chunks:
+        return pd.DataFrame()
+
+    df = pd.concat(chunks, ignore_index=True)
+    df = df.drop_duplicates().reset_index(drop=True)
+    print(f"✅ Ingested {len(df)} rows in {len(chunks)} chunks on {workers} worker(s) "
+          f"in {time.perf_counter() - start:.2f}s")
+    return df
+
+
+def create_minimal_sample(n_rows=None, seed=None):
+    """Create a seeded synthetic dataset (see synthetic.py)"""
+    import synthetic
+
+    n_rows = int(n_rows if n_rows is not None else SYNTHETIC_ROWS)
+    seed = int(seed if seed is not None else SYNTHETIC_SEED)
+    df = synthetic.generate(n_rows, seed)
+    print(f"✅ Created {len(df)} rows of synthetic sample data (seed {seed})")
+    return df
+
+
+# ----------------- INCREMENTAL APPEND ----------------- #
+# hook(old_df, new_df, combined_df) callbacks run after append_editions() stores new rows
+_APPEND_HOOKS = []
+
+
+def on_append(hook):
+    """Register a callback that updates derived data after append_editions()"""
+    if hook not in _APPEND_HOOKS:
+        _APPEND_HOOKS.append(hook)
+    return hook
+
+
+def concat_frames(old, new):
+    """Append new rows to old, keeping categorical columns categorical (sorted union of categories)"""
+    columns = {}
+    for col in old.columns:
+        if isinstance(old[col].dtype, pd.CategoricalDtype):
+            a = old[col].cat.rename_categories(old[col].cat.categories.astype(object))
+            b = new[col].astype(object).astype('category')
+            b = b.cat.rename_categories(b.cat.categories.astype(object))
+            union = pd.api.types.union_categoricals([a, b], sort_categories=True)
+            # Back to the category dtype optimize_schema gives a fresh load (str, not object)
+            categories = pd.Index(union.categories, dtype=old[col].cat.categories.dtype)
+            columns[col] = pd.Categorical.from_codes(union.codes, dtype=pd.CategoricalDtype(categories))
+        else:
+            columns[col] = pd.concat([old[col], new[col]], ignore_index=True)
+    combined = pd.DataFrame(columns)
+    combined.attrs.update({k: v for k, v in old.attrs.items() if k not in ('memory_report', 'cache_dir')})
+    return combined
+
+
+def _region_mapping(df, regions_path):
+    """Return the NOC -> region mapping: noc_regions.csv plus any other NOC already stored in df"""
+    # Stored NOCs missing from noc_regions.csv (e.g. SGP) keep the region they were ingested with
+    pairs = df[['NOC', 'region']].astype(object).drop_duplicates(subset=['NOC'])
+    mapping = dict(zip(pairs['NOC'], pairs['region']))
+    if regions_path and os.path.exists(regions_path):
+        regions_df = pd.read_csv(regions_path).drop_duplicates(subset=['NOC'])
+        mapping.update(zip(regions_df['NOC'], regions_df['region']))
+    return mapping
+
+
+def validate_new_rows(new_rows, df, regions_path=None):
+    """Check new editions' rows against df's schema and NOC mapping; return them in df's layout"""
+    problems = []
+    derived_cols = ['region', 'Gold', 'Silver', 'Bronze'] + list(SURROGATE_KEYS)
+    missing = [col for col in df.columns if col not in new_rows.columns and col not in derived_cols]
+    extra = [col for col in new_rows.columns if col not in df.columns]
+    if missing:
+        problems.append(f"missing columns {missing}")
+    if extra:
+        problems.append(f"unexpected columns {extra}")
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    new = new_rows.copy().reset_index(drop=True)
+    for col in ['ID', 'Year', 'Age', 'Height', 'Weight']:
+        if col in new.columns:
+            values = pd.to_numeric(new[col], errors='coerce')
+            bad = values.isna() & new[col].notna()
+            if bad.any():
+                problems.append(f"{col}: {int(bad.sum())} non-numeric values")
+            new[col] = values
+    if new['Year'].isna().any():
+        problems.append("Year: missing values")
+
+    allowed = {'Medal': {'Gold', 'Silver', 'Bronze'}, 'Season': {'Summer', 'Winter'}, 'Sex': {'M', 'F'}}
+    for col, values in allowed.items():
+        if col in new.columns:
+            unexpected = set(new[col].dropna().astype(str)) - values
+            if unexpected:
+                problems.append(f"{col}: unexpected values {sorted(unexpected)[:5]}")
+
+    mapping = _region_mapping(df, regions_path)
+    unknown = sorted(set(new['NOC'].dropna().astype(str)) - set(mapping))
+    if unknown or new['NOC'].isna().any():
+        problems.append(f"NOC: unknown codes {unknown[:10]}" if unknown else "NOC: missing values")
+    region = new['NOC'].astype(object).map(mapping)
+    if 'region' in new_rows.columns:
+        given = new['region'].astype(object)
+        conflict = given.notna() & (given != region)
+        if conflict.any():
+            problems.append(f"region: {int(conflict.sum())} rows disagree with the NOC mapping")
+    new['region'] = region
+
+    # Only whole new editions can be appended; changing a stored edition needs a full rebuild
+    stored = set(zip(df['Year'].astype('int64'), df['Season'].astype(str)))
+    clashes = sorted({(int(y), str(s)) for y, s in zip(new['Year'].dropna(), new['Season'])
+                      if (int(y), str(s)) in stored})
+    if clashes:
+        problems.append(f"editions already stored: {clashes}")
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    for medal in ['Gold', 'Silver', 'Bronze']:
+        new[medal] = (new['Medal'] == medal).astype('int64')
+    return new[[col for col in df.columns if col not in SURROGATE_KEYS]].drop_duplicates().reset_index(drop=True)
+
+
+def append_editions(new_rows, regions_path=None):
+    """Validate new editions' rows, append them to the stored dataset and return the combined frame"""
+    start = time.perf_counter()
+    processed_path = os.path.join(DATA_DIR, 'processed_olympic_data.csv.gz')
+    regions_path = regions_path or os.path.join(DATA_DIR, 'noc_regions.csv')
+
+    df = preprocess()
+    new = validate_new_rows(new_rows, df, regions_path)
+    if new.empty:
+        print("⚠️ No new rows to append")
+        return df
+
+    # The processed file is the stored dataset; materialize it once if data came from elsewhere
+    if not os.path.exists(processed_path):
+        df.drop(columns=list(SURROGATE_KEYS), errors='ignore').to_csv(processed_path, index=False, compression='gzip')
+        print(f"💾 Stored current dataset as {processed_path}")
+
+    # A gzip file may hold several members, so new rows are appended without rewriting old ones
+    with gzip.open(processed_path, 'rt', newline='') as f:
+        header = f.readline().strip().split(',')
+    with gzip.open(processed_path, 'at', newline='') as f:
+        new[header].to_csv(f, index=False, header=False)
+
+    # Compact the new rows like a fresh load would (quietly: the report is for the full frame)
+    with contextlib.redirect_stdout(io.StringIO()):
+        new = optimize_schema(new)
+    # Keys are dense codes of the whole frame, so they are recomputed rather than concatenated
+    combined = add_surrogate_keys(concat_frames(df, new))
+    prints = _fingerprint([processed_path], with_hash=True)
+    set_dataset_version(combined, json.dumps([entry['sha256'] for entry in prints]))
+    _write_cache(_cache_dir(processed_path), combined, prints)
+
+    for hook in _APPEND_HOOKS:
+        try:
+            hook(df, new, combined)
+        except Exception as e:
+            print(f"⚠️ Append hook {getattr(hook, '__name__', hook)} failed: {e}")
+
+    editions = sorted({f"{int(y)} {s}" for y, s in zip(new['Year'], new['Season'].astype(str))})
+    print(f"✅ Appended {len(new)} rows ({', '.join(editions)}) in {time.perf_counter() - start:.2f}s")
+    # Same contract as load_cached: callers share this frame, so it must not be written into
+    return read_only(combined)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Append new Games editions to the stored Olympic dataset")
+    parser.add_argument('--append', nargs='+', required=True, metavar='CSV',
+                        help="CSV files with athlete_events.csv columns for the new editions")
+    args = parser.parse_args(argv)
+
+    # Go through the importable module (not __main__) so helper's append hook is registered
+    # on the same module and the persisted medal cube is updated too
+    import helper
+    new_rows = pd.concat([pd.read_csv(path) for path in args.append], ignore_index=True)
+    try:
+        helper.preprocessor.append_editions(new_rows)
+    except ValueError as e:
+        print(f"❌ Rejected new rows: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
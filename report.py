@@ -0,0 +1,179 @@
+## report.py - HEADLESS BATCH REPORTS FOR EVERY COUNTRY AND SPORT
+#
+# Usage:
+#   python report.py --out reports                 # all countries and sports
+#   python report.py --out reports --only countries --workers 8 --format html
+#   python report.py --out reports --limit 5       # quick smoke run
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import helper
+import preprocessor
+
+# Dataset loaded once per worker process by _init_worker()
+_DF = None
+
+
+def _load_quietly():
+    """Run preprocess() with its progress prints swallowed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return preprocessor.preprocess()
+
+
+def _init_worker():
+    """Process pool initializer: load the dataset once for this worker"""
+    global _DF
+    _DF = _load_quietly()
+
+
+def _slug(name):
+    """Filesystem-safe name for a country or sport"""
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(name)).strip('_') or 'unnamed'
+
+
+def _write_figure(fig, path_stem, formats):
+    """Write a plotly figure as JSON and/or standalone HTML"""
+    written = []
+    if 'json' in formats:
+        with open(path_stem + '.json', 'w') as f:
+            f.write(fig.to_json())
+        written.append(path_stem + '.json')
+    if 'html' in formats:
+        fig.write_html(path_stem + '.html', include_plotlyjs='cdn')
+        written.append(path_stem + '.html')
+    return written
+
+
+def _write_table(table, path, index=False):
+    """Write a result table as CSV"""
+    table.to_csv(path, index=index)
+    return [path]
+
+
+def render_country(df, country, out_dir, formats):
+    """Render the Country-wise Analysis tables and charts for one region"""
+    target = os.path.join(out_dir, 'countries', _slug(country))
+    os.makedirs(target, exist_ok=True)
+    written = []
+
+    tally = helper.yearwise_medal_tally(df, country)
+    if not tally.empty:
+        tally = tally.rename(columns={'Medal': 'Total Medals'})
+        written += _write_table(tally, os.path.join(target, 'yearwise_medal_tally.csv'))
+        written += _write_figure(helper.medal_trend_figure(tally), os.path.join(target, 'yearwise_medal_tally'), formats)
+
+    heatmap = helper.country_sport_heatmap(df, country)
+    if not heatmap.empty:
+        written += _write_table(heatmap, os.path.join(target, 'sport_heatmap.csv'), index=True)
+        written += _write_figure(helper.country_heatmap_figure(heatmap, country),
+                                 os.path.join(target, 'sport_heatmap'), formats)
+
+    top_athletes = helper.most_successful2(df, country)
+    if not top_athletes.empty:
+        written += _write_table(top_athletes, os.path.join(target, 'most_successful.csv'))
+        written += _write_figure(helper.top_athletes_figure(top_athletes),
+                                 os.path.join(target, 'most_successful'), formats)
+    return written
+
+
+def render_sport(df, sport, out_dir, formats):
+    """Render the leaderboard and participation charts for one sport"""
+    target = os.path.join(out_dir, 'sports', _slug(sport))
+    os.makedirs(target, exist_ok=True)
+    written = []
+
+    top_athletes = helper.most_successful(df, sport)
+    if not top_athletes.empty:
+        written += _write_table(top_athletes, os.path.join(target, 'most_successful.csv'))
+        written += _write_figure(helper.top_athletes_figure(top_athletes),
+                                 os.path.join(target, 'most_successful'), formats)
+
+    written += _write_figure(helper.male_vs_female_participation_sport(df, sport),
+                             os.path.join(target, 'male_vs_female_participation'), formats)
+    return written
+
+
+def _run_task(kind, name, out_dir, formats):
+    """Render one report in a worker; returns a summary dict instead of raising"""
+    start = time.perf_counter()
+    try:
+        render = render_country if kind == 'country' else render_sport
+        files = render(_DF, name, out_dir, formats)
+        error = None
+    except Exception as e:
+        files, error = [], f"{type(e).__name__}: {e}"
+    return {'kind': kind, 'name': name, 'seconds': round(time.perf_counter() - start, 3),
+            'files': len(files), 'error': error}
+
+
+def build_tasks(df, only=None, limit=None):
+    """List (kind, name) report tasks for every region and sport in df"""
+    _, countries = helper.country_year_list(df)
+    sports = sorted(df['Sport'].dropna().unique().tolist()) if 'Sport' in df.columns else []
+
+    tasks = []
+    if only in (None, 'countries'):
+        tasks += [('country', c) for c in countries if c != 'Overall'][:limit]
+    if only in (None, 'sports'):
+        tasks += [('sport', s) for s in sports][:limit]
+    return tasks
+
+
+def run(out_dir, workers=None, only=None, limit=None, formats=('json',)):
+    """Render all reports over a process pool and write a summary.json"""
+    start = time.perf_counter()
+    df = _load_quietly()
+    if df is None or df.empty:
+        print("❌ No data available, nothing to render")
+        return []
+
+    tasks = build_tasks(df, only, limit)
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    print(f"📦 Rendering {len(tasks)} reports to {out_dir} on {workers} worker(s)")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_run_task, kind, name, out_dir, tuple(formats)) for kind, name in tasks]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            status = f"❌ {result['error']}" if result['error'] else f"{result['files']} files"
+            print(f"[{done}/{len(tasks)}] {result['kind']:<7} {result['name']:<40} "
+                  f"{result['seconds']:>6.2f}s  {status}")
+
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda r: (r['kind'], r['name']))
+    with open(os.path.join(out_dir, 'summary.json'), 'w') as f:
+        json.dump({'elapsed_seconds': round(elapsed, 2), 'workers': workers, 'reports': results}, f, indent=2)
+
+    failed = sum(1 for r in results if r['error'])
+    print(f"✅ {len(results) - failed} reports rendered, {failed} failed in {elapsed:.1f}s")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render country and sport reports without the Streamlit UI")
+    parser.add_argument('--out', default='reports', help="output directory (default: reports)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--only', choices=['countries', 'sports'], help="render only one report kind")
+    parser.add_argument('--limit', type=int, default=None, help="render at most N reports per kind")
+    parser.add_argument('--format', choices=['json', 'html', 'both'], default='json',
+                        help="figure output format (default: json)")
+    args = parser.parse_args(argv)
+
+    formats = ('json', 'html') if args.format == 'both' else (args.format,)
+    results = run(args.out, args.workers, args.only, args.limit, formats)
+    return 1 if any(r['error'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
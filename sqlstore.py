@@ -0,0 +1,331 @@
+## sqlstore.py - EMBEDDED SQL BACKEND (SQLite / DuckDB FILE) FOR THE helper.py ANALYTICS
+#
+# The dataset is exported once per dataset version to a database file next to
+# the columnar cache; SQLStore then answers the tally, time-series, heatmap and
+# leaderboard helpers as pushed-down queries that return only the small result.
+# Select it with OLYMPIC_BACKEND=sqlite (stdlib) or OLYMPIC_BACKEND=duckdb.
+
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+ENGINES = ('sqlite', 'duckdb')
+SCHEMA_VERSION = 2
+MEDAL_EVENT_COLS = ['Team', 'NOC', 'Games', 'Year', 'City', 'Sport', 'Event', 'Medal']
+TALLY_COLS = ['Gold', 'Silver', 'Bronze', 'total']
+TOP_K = 15
+EDITION_METRICS = ['region', 'Event', 'Name', 'Sport', 'City']
+# Categorical columns whose category order (not alphabetical) orders pivot rows, as in pandas
+ORDERED_COLS = ['Sport']
+
+
+def _connect(engine, path, read_only):
+    """Open a connection to the database file for the given engine"""
+    if engine == 'duckdb':
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("duckdb is required for OLYMPIC_BACKEND=duckdb (pip install duckdb)")
+        return duckdb.connect(path, read_only=read_only)
+    if read_only:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    return sqlite3.connect(path)
+
+
+def default_path(df, engine):
+    """Database file next to df's columnar cache (or OLYMPIC_SQL_PATH)"""
+    path = os.environ.get('OLYMPIC_SQL_PATH')
+    if path:
+        return path
+    cache_dir = df.attrs.get('cache_dir') or os.path.join(os.getcwd(), '.olympic_cache')
+    return os.path.join(cache_dir, f"olympic.{engine}")
+
+
+def _plain(df):
+    """Frame with categoricals decoded and nullable ints widened, ready for a database insert"""
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        text = values.dtype == object or pd.api.types.is_string_dtype(values.dtype)
+        if isinstance(values.dtype, pd.CategoricalDtype) or text:
+            # Strings go in as Python objects (None for missing), never through a numeric cast
+            out[col] = values.astype(object).where(values.notna(), None)
+        elif pd.api.types.is_extension_array_dtype(values.dtype) or values.dtype.kind == 'f':
+            out[col] = values.astype('float64')
+        else:
+            out[col] = values.astype('int64')
+    return pd.DataFrame(out)
+
+
+def export(df, path, engine='sqlite', version=''):
+    """Write df (plus its medal-event table and indexes) to a new database file"""
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # Per-process temp file: replicas exporting at once must not remove or write into each other's
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    frame = _plain(df)
+    try:
+        conn = _connect(engine, tmp_path, read_only=False)
+        try:
+            if engine == 'duckdb':
+                conn.register('frame', frame)
+                conn.execute("CREATE TABLE athlete_events AS SELECT * FROM frame")
+                conn.unregister('frame')
+            else:
+                frame.to_sql('athlete_events', conn, index=False)
+
+            # Same fact table as helper.medal_events(): first row of each team medal, in row order
+            key = ('medal_event_key' if 'medal_event_key' in frame.columns
+                   else ', '.join(col for col in MEDAL_EVENT_COLS if col in frame.columns))
+            conn.execute(f"""
+                CREATE TABLE medal_events AS
+                SELECT * FROM athlete_events
+                WHERE rowid IN (SELECT MIN(rowid) FROM athlete_events WHERE Medal IS NOT NULL GROUP BY {key})
+                ORDER BY rowid""")
+            for table, cols in [('athlete_events', 'Year'), ('athlete_events', 'region, Year'),
+                                ('athlete_events', 'Sport, Year, Event'), ('athlete_events', 'Sport, Medal'),
+                                ('athlete_events', 'Medal, Name'), ('medal_events', 'region, Year')]:
+                name = f"idx_{table}_{cols.replace(', ', '_').lower()}"
+                conn.execute(f"CREATE INDEX {name} ON {table} ({cols})")
+
+            conn.execute("CREATE TABLE category_order (col VARCHAR, pos INTEGER, value VARCHAR)")
+            for col in ORDERED_COLS:
+                if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                    conn.executemany("INSERT INTO category_order VALUES (?, ?, ?)",
+                                     [(col, pos, str(value)) for pos, value in enumerate(df[col].cat.categories)])
+
+            dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
+            conn.execute("CREATE TABLE meta (key VARCHAR, value VARCHAR)")
+            conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                             [('schema_version', str(SCHEMA_VERSION)), ('dataset_version', version),
+                              ('rows', str(len(df)))] + [(f"dtype:{col}", dtype) for col, dtype in dtypes.items()])
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+    finally:
+        # Left behind only by a failed build
+        for leftover in (tmp_path, f"{tmp_path}.wal"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    print(f"💾 {engine} store written: {path} ({os.path.getsize(path) / 1e6:.1f} MB "
+          f"in {time.perf_counter() - start:.2f}s)")
+    return path
+
+
+def _stored_version(engine, path):
+    """Return (schema_version, dataset_version) recorded in a database file, or None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        conn = _connect(engine, path, read_only=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        finally:
+            conn.close()
+        return meta.get('schema_version'), meta.get('dataset_version')
+    except Exception:
+        return None
+
+
+def open_store(df, engine='sqlite', path=None, version=None):
+    """Return a SQLStore for df, exporting it first when the file is missing or stale"""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown SQL engine {engine!r}; expected one of {ENGINES}")
+    path = path or default_path(df, engine)
+    version = version if version is not None else str(df.attrs.get('dataset_version', ''))
+    if _stored_version(engine, path) != (str(SCHEMA_VERSION), version) or not version:
+        export(df, path, engine, version)
+    else:
+        print(f"⚡ {engine} store up to date: {path}")
+    return SQLStore(path, engine)
+
+
+class SQLStore:
+    """Read-only handle on an exported database; methods mirror the helper.py analytics"""
+
+    def __init__(self, path, engine='sqlite'):
+        self.path = path
+        self.engine = engine
+        self._local = threading.local()
+        self._root = _connect(engine, path, read_only=True) if engine == 'duckdb' else None
+        meta = dict(self._conn().execute("SELECT key, value FROM meta").fetchall())
+        self.version = meta.get('dataset_version')
+        self.dtypes = {key[len('dtype:'):]: value for key, value in meta.items() if key.startswith('dtype:')}
+        self.columns = list(self.dtypes)
+        self.orders = {}
+        for col, value in self._conn().execute("SELECT col, value FROM category_order ORDER BY col, pos").fetchall():
+            self.orders.setdefault(col, []).append(value)
+
+    def __repr__(self):
+        return f"<SQLStore {self.engine} {self.path} version={self.version}>"
+
+    def _conn(self):
+        """One connection (sqlite) or cursor (duckdb) per thread: Streamlit runs sessions in threads"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._root.cursor() if self._root is not None else _connect(self.engine, self.path, True)
+            self._local.conn = conn
+        return conn
+
+    def query(self, sql, params=()):
+        """Run sql with positional ? parameters and return a DataFrame"""
+        cursor = self._conn().execute(sql, list(params))
+        columns = [d[0] for d in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    def _typed(self, frame, columns=()):
+        """Cast key columns back to the pandas dtypes they had in the exported frame"""
+        for col in columns:
+            if col in frame.columns and col in self.dtypes:
+                dtype = self.dtypes[col]
+                if dtype == 'category' or dtype.startswith(('str', 'object')):
+                    frame[col] = frame[col].astype(object)
+                else:
+                    frame[col] = frame[col].astype(dtype)
+        return frame
+
+    def _column(self, col):
+        """Validate a column name before it is interpolated into SQL"""
+        if col not in self.columns:
+            raise KeyError(f"Unknown column {col!r}")
+        return f'"{col}"'
+
+    # ----------------- FILTER LISTS ----------------- #
+    def country_year_list(self):
+        years = [int(y) for (y,) in self._conn().execute(
+            "SELECT DISTINCT Year FROM athlete_events WHERE Year IS NOT NULL ORDER BY Year").fetchall()]
+        regions = [r for (r,) in self._conn().execute(
+            "SELECT DISTINCT region FROM athlete_events WHERE region IS NOT NULL ORDER BY region").fetchall()]
+        return ['Overall'] + years if years else ['Overall'], ['Overall'] + regions if regions else ['Overall']
+
+    # ----------------- MEDAL TALLY ----------------- #
+    def fetch_medal_tally(self, year, country):
+        """Tally over (region, Year) pairs that took part, matching helper's medal-cube answers"""
+        try:
+            year = int(year) if year != 'Overall' else None
+        except (TypeError, ValueError):
+            year = None
+        country = None if country == 'Overall' else country
+
+        where, params = ["region IS NOT NULL", "Year IS NOT NULL"], []
+        if year is not None:
+            where.append("Year = ?")
+            params.append(year)
+        if country is not None:
+            where.append("region = ?")
+            params.append(country)
+        condition = ' AND '.join(where)
+        key = 'Year' if year is None and country is not None else 'region'
+        sql = f"""
+            WITH played AS (SELECT DISTINCT region, Year FROM athlete_events WHERE {condition}),
+                 tally AS (SELECT region, Year, SUM(Gold) AS g, SUM(Silver) AS s, SUM(Bronze) AS b
+                           FROM medal_events WHERE {condition} GROUP BY region, Year)
+            SELECT p.{key} AS {key}, COALESCE(SUM(t.g), 0) AS Gold, COALESCE(SUM(t.s), 0) AS Silver,
+                   COALESCE(SUM(t.b), 0) AS Bronze
+            FROM played p LEFT JOIN tally t ON t.region = p.region AND t.Year = p.Year
+            GROUP BY p.{key}
+            ORDER BY {'p.Year' if key == 'Year' else 'Gold DESC, p.region'}"""
+        x = self.query(sql, params * 2)
+        if x.empty:
+            return pd.DataFrame(columns=[key] + TALLY_COLS)
+        x[['Gold', 'Silver', 'Bronze']] = x[['Gold', 'Silver', 'Bronze']].astype('int64')
+        x['total'] = x['Gold'] + x['Silver'] + x['Bronze']
+        if key == 'Year':
+            x['Year'] = x['Year'].astype('int64')
+        return x
+
+    def yearwise_medal_tally(self, country):
+        x = self.query("SELECT Year, COUNT(Medal) AS Medal FROM medal_events WHERE region = ? "
+                       "GROUP BY Year ORDER BY Year", [country])
+        if x.empty:
+            return pd.DataFrame(columns=['Year', 'Medal'])
+        x['Medal'] = x['Medal'].astype('int64')
+        return self._typed(x, ['Year'])
+
+    # ----------------- TIME SERIES & PIVOTS ----------------- #
+    def data_over_time(self, col):
+        column = self._column(col)
+        x = self.query(f"SELECT Year AS Edition, COUNT(DISTINCT {column}) AS {column} FROM athlete_events "
+                       f"WHERE Year IS NOT NULL GROUP BY Year ORDER BY Year")
+        if x.empty:
+            return pd.DataFrame(columns=['Edition', col])
+        x[col] = x[col].astype('int64')
+        if 'Year' in self.dtypes:
+            x['Edition'] = x['Edition'].astype(self.dtypes['Year'])
+        return x
+
+    def edition_metrics(self, metrics=None, by_season=False):
+        """Distinct counts per edition (and Season) for several columns in one GROUP BY"""
+        metrics = list(EDITION_METRICS if metrics is None else metrics)
+        keys = ['Edition'] + (['Season'] if by_season else [])
+        if by_season and 'Season' not in self.columns:
+            return pd.DataFrame(columns=keys + metrics)
+        metrics = [col for col in metrics if col in self.columns]
+        group = 'Year, Season' if by_season else 'Year'
+        counts = ''.join(f", COUNT(DISTINCT {self._column(col)}) AS {self._column(col)}" for col in metrics)
+        x = self.query(f"SELECT Year AS Edition{', Season' if by_season else ''}{counts} FROM athlete_events "
+                       f"WHERE Year IS NOT NULL{' AND Season IS NOT NULL' if by_season else ''} "
+                       f"GROUP BY {group} ORDER BY {group}")
+        if x.empty:
+            return pd.DataFrame(columns=keys + metrics)
+        x[metrics] = x[metrics].astype('int64')
+        if 'Year' in self.dtypes:
+            x['Edition'] = x['Edition'].astype(self.dtypes['Year'])
+        return self._typed(x, ['Season'])
+
+    def _pivot(self, counts):
+        """Sport x Year pivot of (Sport, Year, n) rows, zero-filled like pivot_table(...).fillna(0)"""
+        if counts.empty:
+            return pd.DataFrame()
+        counts = self._typed(counts, ['Year'])
+        pivot = counts.pivot(index='Sport', columns='Year', values='n').fillna(0).astype(int)
+        order = self.orders.get('Sport')
+        pivot = pivot.reindex([s for s in order if s in pivot.index]) if order else pivot.sort_index()
+        pivot = pivot.sort_index(axis=1)
+        pivot.columns.name = 'Year'
+        return pivot
+
+    def events_per_sport_over_time(self):
+        counts = self.query("SELECT Sport, Year, COUNT(DISTINCT Event) AS n FROM athlete_events "
+                            "WHERE Sport IS NOT NULL AND Year IS NOT NULL GROUP BY Sport, Year")
+        return self._pivot(counts)
+
+    def country_sport_heatmap(self, country):
+        counts = self.query("SELECT Sport, Year, COUNT(Medal) AS n FROM medal_events "
+                            "WHERE region = ? AND Sport IS NOT NULL AND Year IS NOT NULL GROUP BY Sport, Year",
+                            [country])
+        return self._pivot(counts)
+
+    # ----------------- LEADERBOARDS ----------------- #
+    def _leaders(self, filter_col, value, info_cols, k=None):
+        """Top k athletes by medal rows, then golds; ties keep first-seen row order like helper.leaderboards"""
+        where, params = ["Medal IS NOT NULL", "Name IS NOT NULL"], []
+        if value != 'Overall' and filter_col in self.columns:
+            where.append(f"{self._column(filter_col)} = ?")
+            params.append(value)
+        key = 'ID' if 'ID' in self.columns else 'Name'
+        gold = "SUM(Gold)" if 'Gold' in self.columns else "SUM(CASE WHEN Medal = 'Gold' THEN 1 ELSE 0 END)"
+        ident = ['ID', 'Name'] if key == 'ID' else ['Name']
+        select = ', '.join(f"a.{col}" for col in ident)
+        info = ''.join(f", a.{col}" for col in info_cols if col in self.columns)
+        x = self.query(f"""
+            WITH wins AS (SELECT {key} AS athlete, COUNT(*) AS n, {gold} AS g, MIN(rowid) AS first_row
+                          FROM athlete_events WHERE {' AND '.join(where)} GROUP BY {key}
+                          ORDER BY n DESC, g DESC, first_row LIMIT {int(TOP_K if k is None else k)})
+            SELECT {select}, w.n AS "Total Wins", w.g AS Gold{info}
+            FROM wins w JOIN athlete_events a ON a.rowid = w.first_row
+            ORDER BY w.n DESC, w.g DESC, w.first_row""", params)
+        if x.empty:
+            return pd.DataFrame(columns=ident + ['Total Wins', 'Gold'] + info_cols)
+        x[['Total Wins', 'Gold']] = x[['Total Wins', 'Gold']].astype('int64')
+        return self._typed(x, ident + info_cols)
+
+    def most_successful(self, sport, k=None):
+        return self._leaders('Sport', sport, ['Sport', 'region'], k)
+
+    def most_successful2(self, country, k=None):
+        return self._leaders('region', country, ['Sport'], k)
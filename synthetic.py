@@ -0,0 +1,303 @@
+## synthetic.py - VECTORIZED, SEEDABLE SYNTHETIC OLYMPIC DATA
+#
+# Usage:
+#   python synthetic.py --rows 10000000 --seed 42 --out processed_olympic_data.csv.gz
+#   python synthetic.py --rows 2000000 --chunk-rows 500000 --out load_test.csv
+#
+# Rows have the same columns as the ingested athlete_events.csv + noc_regions.csv
+# frame.  Everything is generated with NumPy array ops; chunks are independent
+# given (seed, chunk index) so arbitrarily large datasets can be streamed to disk.
+
+import argparse
+import gzip
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+ROWS_PER_ATHLETE = 1.9          # real data: ~271k rows for ~135k athletes
+MEDAL_NAMES = np.array(['Gold', 'Silver', 'Bronze'])
+
+SUMMER_HOSTS = {
+    1896: 'Athina', 1900: 'Paris', 1904: 'St. Louis', 1908: 'London', 1912: 'Stockholm', 1920: 'Antwerpen',
+    1924: 'Paris', 1928: 'Amsterdam', 1932: 'Los Angeles', 1936: 'Berlin', 1948: 'London', 1952: 'Helsinki',
+    1956: 'Melbourne', 1960: 'Roma', 1964: 'Tokyo', 1968: 'Mexico City', 1972: 'Munich', 1976: 'Montreal',
+    1980: 'Moskva', 1984: 'Los Angeles', 1988: 'Seoul', 1992: 'Barcelona', 1996: 'Atlanta', 2000: 'Sydney',
+    2004: 'Athina', 2008: 'Beijing', 2012: 'London', 2016: 'Rio de Janeiro',
+}
+WINTER_HOSTS = {
+    1924: 'Chamonix', 1928: 'Sankt Moritz', 1932: 'Lake Placid', 1936: 'Garmisch-Partenkirchen',
+    1948: 'Sankt Moritz', 1952: 'Oslo', 1956: "Cortina d'Ampezzo", 1960: 'Squaw Valley', 1964: 'Innsbruck',
+    1968: 'Grenoble', 1972: 'Sapporo', 1976: 'Innsbruck', 1980: 'Lake Placid', 1984: 'Sarajevo',
+    1988: 'Calgary', 1992: 'Albertville', 1994: 'Lillehammer', 1998: 'Nagano', 2002: 'Salt Lake City',
+    2006: 'Torino', 2010: 'Vancouver', 2014: 'Sochi',
+}
+
+# (NOC, region) ordered by medal strength; a Zipf weight is applied down the list
+NATIONS = [
+    ('USA', 'USA'), ('URS', 'Russia'), ('GER', 'Germany'), ('GBR', 'UK'), ('FRA', 'France'),
+    ('ITA', 'Italy'), ('SWE', 'Sweden'), ('CAN', 'Canada'), ('AUS', 'Australia'), ('HUN', 'Hungary'),
+    ('NOR', 'Norway'), ('NED', 'Netherlands'), ('CHN', 'China'), ('JPN', 'Japan'), ('FIN', 'Finland'),
+    ('SUI', 'Switzerland'), ('ROU', 'Romania'), ('KOR', 'South Korea'), ('DEN', 'Denmark'), ('POL', 'Poland'),
+    ('ESP', 'Spain'), ('BRA', 'Brazil'), ('BEL', 'Belgium'), ('AUT', 'Austria'), ('CUB', 'Cuba'),
+    ('CZE', 'Czech Republic'), ('BUL', 'Bulgaria'), ('NZL', 'New Zealand'), ('ARG', 'Argentina'),
+    ('IND', 'India'), ('KEN', 'Kenya'), ('JAM', 'Jamaica'), ('MEX', 'Mexico'), ('GRE', 'Greece'),
+    ('TUR', 'Turkey'), ('RSA', 'South Africa'), ('EGY', 'Egypt'), ('IRI', 'Iran'), ('NGR', 'Nigeria'),
+    ('ETH', 'Ethiopia'),
+]
+N_NATIONS = 200                 # the list above plus a generated long tail
+
+# (sport, season, popularity, events per sex, team size)
+SPORTS = [
+    ('Athletics', 'Summer', 14.0, 24, 1), ('Swimming', 'Summer', 8.0, 17, 1), ('Gymnastics', 'Summer', 7.0, 9, 1),
+    ('Rowing', 'Summer', 4.0, 7, 4), ('Cycling', 'Summer', 4.0, 9, 1), ('Fencing', 'Summer', 3.5, 5, 1),
+    ('Football', 'Summer', 3.0, 1, 11), ('Hockey', 'Summer', 2.0, 1, 11), ('Basketball', 'Summer', 2.0, 1, 12),
+    ('Wrestling', 'Summer', 3.0, 9, 1), ('Boxing', 'Summer', 2.5, 7, 1), ('Sailing', 'Summer', 2.0, 5, 2),
+    ('Shooting', 'Summer', 3.0, 8, 1), ('Canoeing', 'Summer', 2.5, 8, 1), ('Judo', 'Summer', 1.5, 7, 1),
+    ('Weightlifting', 'Summer', 1.5, 8, 1), ('Water Polo', 'Summer', 1.5, 1, 13), ('Handball', 'Summer', 1.5, 1, 14),
+    ('Volleyball', 'Summer', 1.5, 1, 12), ('Equestrianism', 'Summer', 1.5, 3, 1), ('Tennis', 'Summer', 1.0, 3, 1),
+    ('Archery', 'Summer', 0.8, 2, 1), ('Diving', 'Summer', 1.0, 4, 1),
+    ('Cross Country Skiing', 'Winter', 2.5, 6, 1), ('Alpine Skiing', 'Winter', 2.5, 5, 1),
+    ('Speed Skating', 'Winter', 1.8, 6, 1), ('Ice Hockey', 'Winter', 1.8, 1, 22), ('Biathlon', 'Winter', 1.4, 5, 1),
+    ('Figure Skating', 'Winter', 0.8, 3, 1), ('Bobsleigh', 'Winter', 0.8, 2, 4), ('Ski Jumping', 'Winter', 0.8, 2, 1),
+    ('Curling', 'Winter', 0.4, 1, 4),
+]
+
+_NAME_STARTS = ['Al', 'Be', 'Car', 'Da', 'El', 'Fe', 'Ga', 'Ha', 'I', 'Jo', 'Ka', 'Le', 'Ma', 'Ni', 'O', 'Pe',
+                'Ra', 'Sa', 'Ta', 'Va', 'Wi', 'Yu', 'Ze', 'An']
+_NAME_ENDS_M = ['x', 'rt', 'nio', 'rik', 'van', 'lo', 'mir', 'son', 'ko', 'do', 'ren', 'ter']
+_NAME_ENDS_F = ['na', 'ra', 'lia', 'rina', 'ssa', 'nne', 'ja', 'lle', 'ka', 'sha', 'la', 'ne']
+_SURNAME_PARTS = ['And', 'Bern', 'Chen', 'Dub', 'Erik', 'Fisch', 'Garc', 'Hof', 'Ivan', 'Joh', 'Kow', 'Lind',
+                  'Mart', 'Nak', 'Ols', 'Petr', 'Ross', 'Schm', 'Tan', 'Wag', 'Yam', 'Zhou', 'Mull', 'Kim']
+_SURNAME_ENDS = ['ersen', 'er', 'ov', 'ova', 'ez', 'sson', 'ski', 'ura', 'ini', 'ley', 'ens', 'ic', 'berg', 'ton']
+
+
+# ----------------- STATIC TABLES ----------------- #
+def _editions():
+    """Return (years, seasons, cities) arrays for every Summer and Winter edition"""
+    years = list(SUMMER_HOSTS) + list(WINTER_HOSTS)
+    seasons = ['Summer'] * len(SUMMER_HOSTS) + ['Winter'] * len(WINTER_HOSTS)
+    cities = list(SUMMER_HOSTS.values()) + list(WINTER_HOSTS.values())
+    return np.array(years), np.array(seasons), np.array(cities, dtype=object)
+
+
+def _nations():
+    """Return (nocs, regions, weights) with a Zipf-shaped long tail"""
+    nocs = [noc for noc, _ in NATIONS] + [f"X{i:02d}" for i in range(len(NATIONS), N_NATIONS)]
+    regions = [region for _, region in NATIONS] + [f"Nation {i:03d}" for i in range(len(NATIONS), N_NATIONS)]
+    weights = 1.0 / np.arange(1, N_NATIONS + 1) ** 0.9
+    return np.array(nocs, dtype=object), np.array(regions, dtype=object), weights / weights.sum()
+
+
+def _events():
+    """Return per-sport event offsets and the flat event-name table (sport x sex x event)"""
+    names, offsets = [], []
+    for sport, _, _, n_events, _ in SPORTS:
+        offsets.append(len(names))
+        for sex in ("Men's", "Women's"):
+            names += [f"{sport} {sex} Event {k + 1}" for k in range(n_events)]
+    return np.array(offsets), np.array(names, dtype=object)
+
+
+def _splitmix64(x):
+    """Vectorized splitmix64 finalizer: uint64 -> well-mixed uint64"""
+    x = x.astype(np.uint64, copy=True)
+    with np.errstate(over='ignore'):
+        x += np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _hash_uniform(seed, *keys):
+    """Deterministic uniform [0, 1) per row from integer keys (same keys -> same value)"""
+    h = np.full(len(keys[0]), seed, dtype=np.uint64)
+    for key in keys:
+        h = _splitmix64(h ^ key.astype(np.uint64))
+    return (h >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _names(codes, sex):
+    """Build 'First M. Surname' strings for unique name codes (vectorized over the uniques)"""
+    n_first, n_mid, n_last = len(_NAME_STARTS) * 12, 26, len(_SURNAME_PARTS) * len(_SURNAME_ENDS)
+    first = codes % n_first
+    mid = (codes // n_first) % n_mid
+    last = (codes // (n_first * n_mid)) % n_last
+    ends = np.where(sex == 1, np.array(_NAME_ENDS_F, dtype=object)[first % 12],
+                    np.array(_NAME_ENDS_M, dtype=object)[first % 12])
+    given = np.array(_NAME_STARTS, dtype=object)[first // 12] + ends
+    initials = np.array([chr(ord('A') + i) + '.' for i in range(26)], dtype=object)[mid]
+    surname = (np.array(_SURNAME_PARTS, dtype=object)[last // len(_SURNAME_ENDS)]
+               + np.array(_SURNAME_ENDS, dtype=object)[last % len(_SURNAME_ENDS)])
+    return given + ' ' + initials + ' ' + surname
+
+
+# ----------------- GENERATOR ----------------- #
+def generate_chunk(n_rows, seed=0, chunk_index=0, id_offset=0):
+    """Generate one independent chunk of n_rows Olympic-shaped rows (athlete IDs start after id_offset)"""
+    rng = np.random.default_rng([seed, chunk_index])
+    years, seasons, cities = _editions()
+    nocs, regions, nation_w = _nations()
+    event_offsets, event_names = _events()
+    sport_names = np.array([s[0] for s in SPORTS], dtype=object)
+    sport_winter = np.array([s[1] == 'Winter' for s in SPORTS])
+    sport_w = np.array([s[2] for s in SPORTS])
+    sport_events = np.array([s[3] for s in SPORTS])
+    sport_team = np.array([s[4] > 1 for s in SPORTS])
+
+    # ---- athletes: country, sport, sex, debut edition and body profile ----
+    n_athletes = max(1, int(np.ceil(n_rows / ROWS_PER_ATHLETE)))
+    nation = rng.choice(len(nocs), n_athletes, p=nation_w)
+    sport = rng.choice(len(SPORTS), n_athletes, p=sport_w / sport_w.sum())
+    winter = sport_winter[sport]
+
+    # Later editions are larger: debut edition weighted by position within its season
+    summer_idx = np.flatnonzero(seasons == 'Summer')
+    winter_idx = np.flatnonzero(seasons == 'Winter')
+
+    def pick(idx, size):
+        weights = np.arange(1, len(idx) + 1, dtype=float) ** 1.5
+        return rng.choice(len(idx), size, p=weights / weights.sum())
+
+    debut_pos = np.where(winter, pick(winter_idx, n_athletes), pick(summer_idx, n_athletes))
+    debut_year = np.where(winter, years[winter_idx][np.minimum(debut_pos, len(winter_idx) - 1)],
+                          years[summer_idx][np.minimum(debut_pos, len(summer_idx) - 1)])
+
+    # Women's share grows from ~2% (1896) to ~45% (2016)
+    female_share = 0.02 + 0.43 * (debut_year - 1896) / 120
+    sex = (rng.random(n_athletes) < female_share).astype(np.int8)   # 1 = F
+    base_age = np.clip(rng.normal(np.where(sport == 2, 21.0, 25.0), 4.0), 13, 60)
+    height = rng.normal(np.where(sex == 1, 168.0, 179.0), 8.0)
+    weight = np.where(sex == 1, 61.0, 75.0) + 0.9 * (height - np.where(sex == 1, 168.0, 179.0)) \
+        + rng.normal(0.0, 7.0, n_athletes)
+    name_code = rng.integers(0, len(_NAME_STARTS) * 12 * 26 * len(_SURNAME_PARTS) * len(_SURNAME_ENDS), n_athletes)
+
+    # ---- rows: each athlete appears in a geometric number of (edition, event) entries ----
+    reps = rng.geometric(1.0 / ROWS_PER_ATHLETE, n_athletes)
+    athlete = np.repeat(np.arange(n_athletes), reps)[:n_rows]
+    if len(athlete) < n_rows:
+        athlete = np.concatenate([athlete, rng.integers(0, n_athletes, n_rows - len(athlete))])
+    starts = np.concatenate([[0], np.cumsum(reps)[:-1]])
+    entry = np.arange(len(athlete)) - starts[athlete]
+
+    # Two entries per Games on average, so entry // 2 editions after the debut
+    a_winter = winter[athlete]
+    pos = np.where(a_winter,
+                   np.minimum(debut_pos[athlete] + entry // 2, len(winter_idx) - 1),
+                   np.minimum(debut_pos[athlete] + entry // 2, len(summer_idx) - 1))
+    edition = np.where(a_winter, winter_idx[np.minimum(pos, len(winter_idx) - 1)],
+                       summer_idx[np.minimum(pos, len(summer_idx) - 1)])
+    year = years[edition]
+
+    a_sport = sport[athlete]
+    a_sex = sex[athlete]
+    event_k = rng.integers(0, sport_events[a_sport])
+    event = event_offsets[a_sport] + a_sex * sport_events[a_sport] + event_k
+    a_nation = nation[athlete]
+
+    # ---- medals: stronger nations medal more often; team events share one medal per team ----
+    strength = (nation_w / nation_w[0])[a_nation]
+    p_medal = 0.06 + 0.30 * strength
+    team = sport_team[a_sport]
+    u_row = rng.random(len(athlete))
+    v_row = rng.random(len(athlete))
+    u_team = _hash_uniform(seed, a_nation, edition, event, np.ones_like(event))
+    v_team = _hash_uniform(seed, a_nation, edition, event, np.full_like(event, 2))
+    u = np.where(team, u_team, u_row)
+    v = np.where(team, v_team, v_row)
+    medal_code = np.where(u < p_medal, np.minimum((v * 3).astype(np.int8), 2), -1)
+
+    # ---- body metrics and missingness (sparser in early editions) ----
+    age = np.round(base_age[athlete] + (year - debut_year[athlete])).astype(float)
+    early = year < 1960
+    age[rng.random(len(athlete)) < 0.03] = np.nan
+    body_missing = rng.random(len(athlete)) < np.where(early, 0.75, 0.12)
+    h = np.where(body_missing, np.nan, np.round(height[athlete]))
+    w = np.where(body_missing, np.nan, np.round(weight[athlete]))
+
+    # ---- assemble with categoricals built from codes (no per-row Python strings) ----
+    unique_names, name_idx = np.unique(name_code[athlete], return_inverse=True)
+    first_sex = np.zeros(len(unique_names), dtype=np.int8)
+    first_sex[name_idx] = a_sex
+    name_codes, name_labels = pd.factorize(_names(unique_names, first_sex))
+    name_cat = pd.Categorical.from_codes(name_codes[name_idx], categories=pd.Index(name_labels, dtype=object))
+
+    games_labels = np.array([f"{y} {s}" for y, s in zip(years, seasons)], dtype=object)
+    df = pd.DataFrame({
+        'ID': (id_offset + athlete + 1).astype(np.int64),
+        'Name': name_cat,
+        'Sex': pd.Categorical.from_codes(a_sex, categories=['M', 'F']),
+        'Age': age,
+        'Height': h,
+        'Weight': w,
+        'Team': pd.Categorical.from_codes(a_nation, categories=pd.Index(regions)),
+        'NOC': pd.Categorical.from_codes(a_nation, categories=pd.Index(nocs)),
+        'Games': pd.Categorical.from_codes(edition, categories=pd.Index(games_labels)),
+        'Year': year.astype(np.int64),
+        'Season': pd.Categorical.from_codes(np.where(a_winter, 1, 0), categories=['Summer', 'Winter']),
+        'City': pd.Categorical(cities[edition]),
+        'Sport': pd.Categorical.from_codes(a_sport, categories=pd.Index(sport_names)),
+        'Event': pd.Categorical.from_codes(event, categories=pd.Index(event_names)),
+        'Medal': pd.Categorical.from_codes(medal_code, categories=MEDAL_NAMES),
+        'region': pd.Categorical.from_codes(a_nation, categories=pd.Index(regions)),
+    })
+    for k, medal in enumerate(MEDAL_NAMES):
+        df[medal] = (medal_code == k).astype(np.int64)
+    return df
+
+
+def iter_chunks(n_rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield DataFrame chunks totalling n_rows; the output depends only on (n_rows, seed, chunk_rows)"""
+    chunk_rows = max(1, int(chunk_rows))
+    for chunk_index, start in enumerate(range(0, int(n_rows), chunk_rows)):
+        size = min(chunk_rows, int(n_rows) - start)
+        # Athletes never outnumber rows, so start is a collision-free ID offset
+        yield generate_chunk(size, seed, chunk_index, id_offset=start)
+
+
+def generate(n_rows=10_000, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Return a synthetic Olympic frame of n_rows rows as a single DataFrame"""
+    chunks = list(iter_chunks(n_rows, seed, chunk_rows))
+    if not chunks:
+        return generate_chunk(0, seed).iloc[0:0]
+    if len(chunks) == 1:
+        return chunks[0]
+
+    # Name categories differ per chunk: union them so the column stays categorical
+    names = pd.api.types.union_categoricals([c['Name'] for c in chunks])
+    df = pd.concat([c.drop(columns='Name') for c in chunks], ignore_index=True)
+    df.insert(1, 'Name', names)
+    return df
+
+
+def write_csv(path, n_rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream n_rows synthetic rows to a CSV file (gzip-compressed if path ends in .gz)"""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    start = time.perf_counter()
+    written = 0
+    with opener(path, 'wt', newline='') as f:
+        for chunk in iter_chunks(n_rows, seed, chunk_rows):
+            chunk.to_csv(f, index=False, header=written == 0)
+            written += len(chunk)
+            print(f"🔄 {written:,}/{int(n_rows):,} rows written ({time.perf_counter() - start:.1f}s)")
+    print(f"✅ Wrote {written:,} synthetic rows to {path} in {time.perf_counter() - start:.1f}s")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Olympic dataset")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="rows to generate (default: 1000000)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"rows generated per chunk (default: {DEFAULT_CHUNK_ROWS})")
+    parser.add_argument('--out', default='synthetic_olympic_data.csv.gz',
+                        help="output CSV path, gzip if it ends in .gz (default: synthetic_olympic_data.csv.gz)")
+    args = parser.parse_args(argv)
+    write_csv(args.out, args.rows, args.seed, args.chunk_rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,35 @@
+## conftest.py - SHARED PYTEST FIXTURES
+#
+# The modules live at the repository root (no package), so make them importable
+# when pytest is run from anywhere.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import helper  # noqa: E402
+import preprocessor  # noqa: E402
+import synthetic  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Every test starts without memoized results or derived tables from another dataset"""
+    helper.clear_memo()
+    helper._DERIVED.clear()
+    yield
+    helper.clear_memo()
+    helper._DERIVED.clear()
+
+
+@pytest.fixture(scope='session')
+def synthetic_frame(tmp_path_factory):
+    """Small compacted synthetic dataset, tagged with a dataset version like a real load"""
+    df = preprocessor.optimize_schema(synthetic.generate(20_000, seed=0))
+    df = preprocessor.set_dataset_version(preprocessor.read_only(df), 'synthetic:20000:0')
+    # Engine databases and artifacts go to a scratch directory, not the checkout
+    df.attrs['cache_dir'] = str(tmp_path_factory.mktemp('olympic_cache'))
+    return df
@@ -0,0 +1,50 @@
+## test_api.py - ETag REVALIDATION OF THE JSON API
+
+import http.client
+import threading
+
+import pytest
+
+import api
+
+
+@pytest.fixture(scope='module')
+def server(synthetic_frame):
+    server = api.create_server(port=0, workers=2, df=synthetic_frame)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path, etag=None):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        conn.request('GET', path, headers={'If-None-Match': etag} if etag else {})
+        response = conn.getresponse()
+        response.read()
+        return response.status, response.getheader('ETag')
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize('header', [
+    '{etag}',
+    'W/{etag}',
+    '"other", {etag}',
+    '"other",W/{etag} , "more"',
+    '*',
+])
+def test_matching_if_none_match_gets_304(server, header):
+    status, etag = _get(server, '/api/tally?year=2016')
+    assert status == 200 and etag
+    assert _get(server, '/api/tally?year=2016', header.format(etag=etag)) == (304, etag)
+
+
+@pytest.mark.parametrize('header', ['"other"', 'W/"other", "more"'])
+def test_other_etags_get_200(server, header):
+    assert _get(server, '/api/tally?year=2016', header)[0] == 200
+
+
+def test_unknown_path_is_never_304(server):
+    assert _get(server, '/api/nope', '*')[0] == 404
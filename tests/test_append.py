@@ -0,0 +1,92 @@
+## test_append.py - APPENDED EDITIONS MATCH A FRESH LOAD
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helper
+import preprocessor
+import synthetic
+
+HELD_OUT = ['2016 Summer', '2014 Winter']
+
+CALLS = [
+    ('fetch_medal_tally', ('Overall', 'Overall')),
+    ('fetch_medal_tally', (2016, 'Overall')),
+    ('fetch_medal_tally', ('Overall', 'USA')),
+    ('yearwise_medal_tally', ('USA',)),
+    ('country_sport_heatmap', ('USA',)),
+    ('data_over_time', ('region',)),
+    ('data_over_time', ('Name',)),
+    ('events_per_sport_over_time', ()),
+    ('edition_metrics', (None, True)),
+    ('most_successful', ('Swimming',)),
+    ('most_successful', ('Overall',)),
+    ('most_successful2', ('USA',)),
+]
+
+
+@pytest.fixture
+def appended(tmp_path, monkeypatch, capsys):
+    """(combined, carried results, carried leaderboards) after appending the held-out editions to the rest"""
+    monkeypatch.setattr(preprocessor, 'DATA_DIR', str(tmp_path))
+    raw = synthetic.generate(20_000, seed=0)
+    held = raw['Games'].isin(HELD_OUT)
+    assert held.any() and not held.all()
+    raw[~held].to_csv(tmp_path / 'processed_olympic_data.csv.gz', index=False, compression='gzip')
+
+    old = preprocessor.preprocess()
+    for name, args in CALLS:
+        getattr(helper, name)(old, *args)
+    combined = preprocessor.append_editions(raw[held].drop(columns=['region', 'Gold', 'Silver', 'Bronze']))
+    boards = helper._DERIVED.get((helper.dataset_version(combined), 'leaderboards'))
+    carried = {(name, args): getattr(helper, name)(combined, *args) for name, args in CALLS}
+    capsys.readouterr()
+    return combined, carried, boards
+
+
+def test_appended_frame_matches_fresh_load(appended):
+    combined, _, _ = appended
+    fresh = preprocessor.preprocess()
+    assert helper.dataset_version(combined) == helper.dataset_version(fresh)
+    pd.testing.assert_frame_equal(combined, fresh)
+
+
+@pytest.mark.parametrize('name, args', CALLS)
+def test_carried_results_match_recompute(appended, name, args):
+    _, carried, _ = appended
+    helper.clear_memo()
+    helper._DERIVED.clear()
+    fresh = preprocessor.preprocess()
+    pd.testing.assert_frame_equal(carried[(name, args)], getattr(helper, name)(fresh, *args))
+
+
+def _assert_same_boards(actual, expected):
+    """Every scope of two leaderboard indexes ranks the same entries, whatever the scope numbering"""
+    for col, board in expected.items():
+        scopes = board.get('index', {'Overall': 0})
+        assert set(scopes) == set(actual[col].get('index', {'Overall': 0}))
+        for label, group in scopes.items():
+            want = helper._board_slice(board, group)
+            got = helper._board_slice(actual[col], actual[col]['index'][label] if 'index' in board else 0)
+            for field in ('wins', 'gold', 'row'):
+                np.testing.assert_array_equal(got[field], want[field], err_msg=f"{col}={label} {field}")
+            for info in want['info']:
+                np.testing.assert_array_equal(got['info'][info], want['info'][info])
+
+
+def test_leaderboards_are_extended_not_rebuilt(appended):
+    combined, _, carried = appended
+    assert carried is not None, "leaderboards were not carried forward on append"
+    _assert_same_boards(carried, helper._build_leaderboards(combined))
+
+
+def test_extended_leaderboards_add_new_scopes(synthetic_frame):
+    # Swimming (and any region only seen there) first appears in the appended rows
+    df = synthetic_frame
+    swimming = (df['Sport'] == 'Swimming').to_numpy()
+    combined = df.iloc[np.r_[np.flatnonzero(~swimming), np.flatnonzero(swimming)]].reset_index(drop=True)
+    start = int((~swimming).sum())
+    old = helper._build_leaderboards(combined.iloc[:start])
+    assert 'Swimming' not in old['Sport']['index']
+    _assert_same_boards(helper._extend_leaderboards(old, combined, start), helper._build_leaderboards(combined))
@@ -0,0 +1,76 @@
+## test_athlete_search.py - PREFIX, TOKEN AND TYPO-TOLERANT ATHLETE SEARCH
+
+import pandas as pd
+import pytest
+
+import athlete_search
+import helper
+
+
+@pytest.fixture(scope='module')
+def star(synthetic_frame):
+    """Name of the athlete with the most medal rows"""
+    medal_names = synthetic_frame.loc[synthetic_frame['Medal'].notna(), 'Name'].astype(str)
+    return medal_names.value_counts().index[0]
+
+
+def _keys(result):
+    return list(zip(result['total'], result['Games']))
+
+
+def test_prefix_matches_rank_by_medals_then_editions(synthetic_frame, star):
+    query = athlete_search.normalize(star)[:3]
+    result = helper.search_athletes(synthetic_frame, query, limit=50)
+    prefix = result[result['match'] == 'prefix']
+    assert len(prefix) and result['match'].iloc[0] == 'prefix'
+    assert all(athlete_search.normalize(name).startswith(query) for name in prefix['Name'])
+    assert _keys(prefix) == sorted(_keys(prefix), reverse=True)
+    assert list(result.columns) == athlete_search.RESULT_COLS
+
+
+def test_every_query_token_may_prefix_any_name_token(synthetic_frame, star):
+    tokens = athlete_search.normalize(star).split()
+    result = helper.search_athletes(synthetic_frame, f"{tokens[-1]} {tokens[0][:3]}", limit=50)
+    assert star in set(result.loc[result['match'] == 'token', 'Name'])
+
+
+def test_typo_finds_the_athlete(synthetic_frame, star):
+    tokens = athlete_search.normalize(star).split()
+    surname = tokens[-1]
+    typo = surname[0] + surname[2] + surname[1] + surname[3:]  # transposition
+    result = helper.search_athletes(synthetic_frame, f"{tokens[0]} {typo}")
+    assert result['Name'].iloc[0] == star
+    assert result['match'].iloc[0] == 'fuzzy'
+
+
+def test_limit_bounds_the_results(synthetic_frame):
+    assert len(helper.search_athletes(synthetic_frame, 'a', limit=7)) == 7
+    assert len(helper.search_athletes(synthetic_frame, 'a', limit=1)) == 1
+    assert helper.search_athletes(synthetic_frame, 'a', limit=0).empty
+    empty = helper.search_athletes(synthetic_frame, '  ', limit=10)
+    assert empty.empty and list(empty.columns) == athlete_search.RESULT_COLS
+
+
+def test_persisted_index_gives_the_same_results(synthetic_frame, star):
+    index = helper.athlete_index(synthetic_frame)
+    expected = index.search(star[:4], 20)
+    reloaded = athlete_search.AthleteIndex.from_arrays(index.to_arrays())
+    pd.testing.assert_frame_equal(reloaded.search(star[:4], 20), expected)
+    # A fresh process loads the artifact saved next to the cache instead of rebuilding
+    helper._DERIVED.clear()
+    pd.testing.assert_frame_equal(helper.search_athletes(synthetic_frame, star[:4], 20), expected)
+
+
+def test_index_is_rebuilt_for_a_new_dataset_version(synthetic_frame, star):
+    before = helper.athlete_index(synthetic_frame)
+    renamed = synthetic_frame.copy()
+    renamed['Name'] = renamed['Name'].cat.rename_categories({star: 'Zebedee Quux'})
+    assert helper.dataset_version(renamed) != helper.dataset_version(synthetic_frame)
+
+    assert helper.athlete_index(renamed) is not before
+    found = helper.search_athletes(renamed, 'zebedee')
+    assert found['Name'].tolist()[:1] == ['Zebedee Quux']
+    assert star not in set(helper.search_athletes(renamed, star)['Name'])
+    # The original dataset still answers from its own index
+    assert helper.search_athletes(synthetic_frame, 'zebedee').empty
+    assert helper.search_athletes(synthetic_frame, star)['Name'].iloc[0] == star
@@ -0,0 +1,40 @@
+## test_kde.py - BINNED FFT KDE AGAINST scipy.stats.gaussian_kde
+
+import numpy as np
+import pytest
+
+import kde
+
+
+def _age_groups(df):
+    """Ages overall and per medal, like age_distribution() plots them"""
+    ages = df['Age'].to_numpy(dtype='float64', na_value=np.nan)
+    medal = df['Medal'].astype(object).to_numpy()
+    return [ages] + [ages[medal == name] for name in ('Gold', 'Silver', 'Bronze')]
+
+
+def test_matches_scipy_on_integer_ages(synthetic_frame):
+    stats = pytest.importorskip('scipy.stats')
+    groups = _age_groups(synthetic_frame)
+    grid, densities, bounds = kde.gaussian_kde_grid(groups)
+    assert densities.shape == (len(groups), len(grid))
+    for g, values in enumerate(groups):
+        values = values[np.isfinite(values)]
+        np.testing.assert_array_equal(bounds[g], [values.min(), values.max()])
+        expected = stats.gaussian_kde(values)(grid)
+        np.testing.assert_allclose(densities[g], expected, rtol=0, atol=1e-12)
+
+
+def test_single_sample_and_empty_groups_get_nan_rows():
+    grid, densities, bounds = kde.gaussian_kde_grid([[20, 22, 25, 31], [27], [], [np.nan, 30, 30]])
+    assert np.isfinite(densities[0]).all()
+    assert np.isnan(densities[1:]).all()
+    np.testing.assert_array_equal(bounds[1], [27, 27])
+    assert np.isnan(bounds[2]).all()
+    np.testing.assert_array_equal(bounds[3], [30, 30])
+
+
+def test_no_valid_group_returns_empty_grid():
+    grid, densities, bounds = kde.gaussian_kde_grid([[], [40]])
+    assert grid.size == 0 and densities.shape == (2, 0)
+    np.testing.assert_array_equal(bounds[1], [40, 40])
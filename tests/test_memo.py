@@ -0,0 +1,92 @@
+## test_memo.py - RESULT CACHE BOUNDS, COPIES AND DATASET VERSIONS
+
+import pytest
+
+import helper
+import preprocessor
+
+
+def _lookups():
+    stats = helper.memo_stats()
+    return stats['hits'], stats['misses']
+
+
+def test_lru_evicts_least_recently_used_over_entry_bound():
+    cache = helper.MemoCache(max_entries=3, max_bytes=1 << 20)
+    for key in 'abc':
+        cache.put(key, key.upper(), 1)
+    assert cache.get('a') == ('A', 1)  # 'b' is now the least recently used
+    cache.put('d', 'D', 1)
+    assert cache.get('b') is None
+    assert [key for key, _ in cache.items()] == ['c', 'a', 'd']
+    assert cache.stats()['evictions'] == 1
+
+
+def test_lru_stays_within_byte_bound():
+    cache = helper.MemoCache(max_entries=100, max_bytes=100)
+    cache.put('x', 'x', 60)
+    cache.put('y', 'y', 30)
+    cache.put('z', 'z', 30)
+    assert [key for key, _ in cache.items()] == ['y', 'z']
+    assert cache.stats()['bytes'] == 60
+    # Replacing an entry accounts only for its new size
+    cache.put('y', 'y2', 10)
+    assert cache.stats()['bytes'] == 40 and cache.get('y') == ('y2', 10)
+    # An entry larger than the whole bound is not kept
+    cache.put('huge', 'h', 500)
+    assert cache.get('huge') is None and cache.stats()['bytes'] <= 100
+
+
+def test_resize_evicts_down_to_the_new_bounds():
+    cache = helper.MemoCache(max_entries=10, max_bytes=1000)
+    for i in range(6):
+        cache.put(i, i, 100)
+    cache.resize(max_entries=4, max_bytes=250)
+    assert [key for key, _ in cache.items()] == [4, 5]
+
+
+def test_cached_frame_is_a_copy_safe_to_mutate(synthetic_frame):
+    first = helper.medal_tally(synthetic_frame)
+    expected = first.copy(deep=True)
+    first['Gold'] = -1
+    first.loc[0, 'region'] = 'Nowhere'
+    hits, misses = _lookups()
+    second = helper.medal_tally(synthetic_frame)
+    assert _lookups() == (hits + 1, misses)  # served from the cache...
+    assert second is not first
+    assert second.equals(expected)  # ...without the caller's edits
+
+
+def test_cached_figure_is_a_copy_safe_to_mutate(synthetic_frame):
+    pytest.importorskip('plotly')
+    first = helper.age_distribution(synthetic_frame)
+    title, name = first.layout.title.text, first.data[0].name
+    first.update_layout(title='restyled')
+    first.data[0].update(name='renamed')
+    hits, misses = _lookups()
+    second = helper.age_distribution(synthetic_frame)
+    assert _lookups() == (hits + 1, misses)
+    assert second is not first
+    assert (second.layout.title.text, second.data[0].name) == (title, name)
+
+
+def test_new_dataset_version_misses_the_cache(synthetic_frame):
+    helper.medal_tally(synthetic_frame)
+    other = preprocessor.set_dataset_version(synthetic_frame.copy(), 'another dataset')
+    hits, misses = _lookups()
+    helper.medal_tally(other)
+    assert _lookups() == (hits, misses + 1)
+    versions = {key[1] for key, _ in helper._MEMO.items() if key[0] == 'medal_tally'}
+    assert versions == {helper.dataset_version(synthetic_frame), helper.dataset_version(other)}
+
+
+def test_edited_copy_is_not_served_the_original_result(synthetic_frame):
+    original = helper.medal_tally(synthetic_frame)
+    # Same length and inherited attrs, different data: must be recomputed, not looked up
+    edited = synthetic_frame.copy()
+    edited['Medal'] = edited['Medal'].where(edited['region'] != 'USA')
+    assert edited.attrs.get('dataset_version') == synthetic_frame.attrs['dataset_version']
+    assert helper.dataset_version(edited) != helper.dataset_version(synthetic_frame)
+    usa = helper.medal_tally(edited).set_index('region').loc['USA']
+    assert original.set_index('region').loc['USA', 'total'] > 0
+    assert usa['total'] == 0
@@ -0,0 +1,66 @@
+## test_surrogate_keys.py - INTEGER KEYS AND _dedup AGREE WITH drop_duplicates
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helper
+import preprocessor
+
+KEYS = list(preprocessor.SURROGATE_KEYS.items())
+
+
+def _first_rows(df, name):
+    """Index of the rows where key column name first takes each value"""
+    return df.index[~pd.Series(df[name].to_numpy()).duplicated().to_numpy()]
+
+
+@pytest.mark.parametrize('name, cols', KEYS, ids=[name for name, _ in KEYS])
+def test_key_first_rows_match_drop_duplicates(synthetic_frame, name, cols):
+    df = synthetic_frame
+    assert df[name].dtype == np.int64
+    assert _first_rows(df, name).equals(df[cols].drop_duplicates().index)
+
+
+@pytest.mark.parametrize('name, cols', KEYS, ids=[name for name, _ in KEYS])
+def test_key_is_dense_and_one_per_combination(synthetic_frame, name, cols):
+    key = synthetic_frame[name].to_numpy()
+    n_combinations = synthetic_frame.groupby(cols, dropna=False, observed=True).ngroups
+    assert key.min() == 0 and key.max() == n_combinations - 1
+    assert len(np.unique(key)) == n_combinations
+
+
+def test_key_survives_int64_overflow_guard():
+    # Radix product of these columns exceeds 2**62, forcing a re-densify mid-way
+    n = 5_000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"c{i}": rng.integers(0, 1 << 20, n) * (1 << 12) for i in range(6)})
+    df = pd.concat([df, df.iloc[::7]], ignore_index=True)
+    key = preprocessor.surrogate_key(df, list(df.columns))
+    assert df.index[~pd.Series(key).duplicated().to_numpy()].equals(df.drop_duplicates().index)
+
+
+@pytest.mark.parametrize('cols', [
+    helper.MEDAL_EVENT_COLS,
+    ['Name', 'region'],
+    ['Name', 'Year'],
+    ['Year', 'Sport', 'Event'],
+    ['Year', 'Season'],
+    ['Sport'],
+    ['Medal'],
+], ids=lambda cols: '+'.join(cols))
+def test_dedup_matches_drop_duplicates(synthetic_frame, cols):
+    df = synthetic_frame
+    deduped = helper._dedup(df, cols)
+    assert list(deduped.columns) == list(df.columns)
+    assert deduped.index.equals(df.drop_duplicates(subset=cols).index)
+
+
+@pytest.mark.parametrize('name, cols', KEYS, ids=[name for name, _ in KEYS])
+def test_dedup_on_key_column(synthetic_frame, name, cols):
+    df = synthetic_frame
+    expected = df.drop_duplicates(subset=cols).index
+    assert helper._dedup(df, [name]).index.equals(expected)
+    # Without the key column _dedup computes it from the source columns
+    plain = df.drop(columns=list(preprocessor.SURROGATE_KEYS))
+    assert helper._dedup(plain, [name]).index.equals(expected)
@@ -0,0 +1,61 @@
+## test_warm_up.py - SHARED DERIVED TABLES AND BACKGROUND WARM-UP ACROSS THREADS
+
+import threading
+import time
+
+import pytest
+
+import helper
+import preprocessor
+import synthetic
+
+
+def _wait(warm, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while warm.progress()['running']:
+        assert time.perf_counter() < deadline, "warm-up did not finish"
+        time.sleep(0.05)
+
+
+def test_derived_is_built_once_for_concurrent_callers(synthetic_frame):
+    calls = []
+
+    def build(df):
+        calls.append(1)
+        time.sleep(0.05)
+        # Builders may depend on other derived tables
+        return len(helper.medal_events(df))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(helper._derived(synthetic_frame, 'probe', build)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    assert len(calls) == 1
+    assert results == [len(helper.medal_events(synthetic_frame))] * 8
+
+
+def test_failed_build_is_retried(synthetic_frame):
+    def fail(df):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        helper._derived(synthetic_frame, 'flaky', fail)
+    assert helper._derived(synthetic_frame, 'flaky', lambda df: 'ok') == 'ok'
+
+
+def test_new_dataset_version_stops_previous_warm_up(synthetic_frame):
+    other = preprocessor.optimize_schema(synthetic.generate(5_000, seed=1))
+    preprocessor.set_dataset_version(other, 'synthetic:5000:1')
+    first = helper.start_warm_up(synthetic_frame, workers=1)
+    try:
+        second = helper.start_warm_up(other, workers=1)
+        assert first.stopped and not second.stopped
+        assert helper.warm_up_status(synthetic_frame) is None
+        assert helper.start_warm_up(other) is second
+        _wait(second)
+    finally:
+        helper.stop_warm_ups()
+        _wait(first)